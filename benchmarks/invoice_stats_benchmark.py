@@ -0,0 +1,305 @@
+"""Benchmark suite for InvoiceStats.
+
+Runs every benchmark at several scales, reports wall time, CPU time and peak memory as JSON, and
+compares the results against a stored baseline:
+
+    python -m benchmarks.invoice_stats_benchmark --scales 1000 100000 --output results.json
+    python -m benchmarks.invoice_stats_benchmark --baseline results.json --time-threshold 0.2
+
+"""
+import argparse
+import json
+import logging
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.invoice_stats import InvoiceStats
+from src.utils.constants import INVOICE_LIMIT, MAX_INVOICE_VALUE, MIN_INVOICE_VALUE
+
+LOGGER = logging.getLogger(__name__)
+
+BENCHMARK_SCALES = [1000, 100000, 1000000, int(INVOICE_LIMIT)]
+BENCHMARK_COMPANY_COUNT = 1000
+SINGLE_INSERT_COUNT = 1000
+DEFAULT_TIME_THRESHOLD = 0.2
+DEFAULT_MEMORY_THRESHOLD = 0.2
+
+# A benchmark is set up for a list of invoices, and returns the instance and the operation to
+# measure together with the number of rows it processes
+BENCHMARK_SETUP_TYPE = Callable[[List[dict]], Tuple[InvoiceStats, Callable[[], None], int]]
+
+
+def create_invoices(scale: int, seed: int = 0) -> List[dict]:
+    """Function to create random invoices within the default invoice value limits.
+
+    Args:
+        scale (int): Number of invoices
+        seed (int): Seed of the random values
+
+    Returns (List[dict]): The invoices
+
+    """
+    random_state = np.random.RandomState(seed=seed)
+
+    names = random_state.randint(0, BENCHMARK_COMPANY_COUNT, size=scale)
+    values = np.round(
+        random_state.uniform(float(MIN_INVOICE_VALUE), float(MAX_INVOICE_VALUE), size=scale), 2
+    )
+
+    return [
+        {"invoice_name": f"company_{name}", "invoice_value": value}
+        for name, value in zip(names.tolist(), values.tolist())
+    ]
+
+
+def _filled_invoice_stats(
+    invoices: List[dict], validation_backend: str = "pandera"
+) -> InvoiceStats:
+    """Private function to create an InvoiceStats instance holding invoices, with metrics.
+
+    Args:
+        invoices (List[dict]): Given invoices
+        validation_backend (str): Validation backend of the instance, by default pandera
+
+    Returns (InvoiceStats): The instance
+
+    """
+    invoice_stats = InvoiceStats(metrics=True, validation_backend=validation_backend)
+    invoice_stats.add_invoices(invoices=invoices)
+
+    return invoice_stats
+
+
+def _setup_add_invoices(invoices: List[dict]) -> Tuple[InvoiceStats, Callable[[], None], int]:
+    invoice_stats = InvoiceStats(metrics=True)
+
+    return invoice_stats, lambda: invoice_stats.add_invoices(invoices=invoices), len(invoices)
+
+
+def _setup_add_invoices_numpy_validation(
+    invoices: List[dict],
+) -> Tuple[InvoiceStats, Callable[[], None], int]:
+    invoice_stats = InvoiceStats(metrics=True, validation_backend="numpy")
+
+    return invoice_stats, lambda: invoice_stats.add_invoices(invoices=invoices), len(invoices)
+
+
+def _setup_add_invoice(invoices: List[dict]) -> Tuple[InvoiceStats, Callable[[], None], int]:
+    # At most half of the invoices are added one by one, the rest fills the instance beforehand
+    single_insert_count = min(SINGLE_INSERT_COUNT, len(invoices) // 2)
+    invoice_stats = _filled_invoice_stats(invoices=invoices[:-single_insert_count])
+    single_invoices = invoices[-single_insert_count:]
+
+    def add_invoice() -> None:
+        for invoice in single_invoices:
+            invoice_stats.add_invoice(invoice=invoice)
+
+    return invoice_stats, add_invoice, len(single_invoices)
+
+
+def _setup_get_mean(invoices: List[dict]) -> Tuple[InvoiceStats, Callable[[], None], int]:
+    invoice_stats = _filled_invoice_stats(invoices=invoices)
+
+    return invoice_stats, invoice_stats.get_mean, len(invoices)
+
+
+def _setup_get_median(invoices: List[dict]) -> Tuple[InvoiceStats, Callable[[], None], int]:
+    invoice_stats = _filled_invoice_stats(invoices=invoices)
+
+    return invoice_stats, invoice_stats.get_median, len(invoices)
+
+
+def _setup_validate_all(invoices: List[dict]) -> Tuple[InvoiceStats, Callable[[], None], int]:
+    invoice_stats = _filled_invoice_stats(invoices=invoices)
+
+    return invoice_stats, invoice_stats.validate_all, len(invoices)
+
+
+def _setup_validate_all_numpy_validation(
+    invoices: List[dict],
+) -> Tuple[InvoiceStats, Callable[[], None], int]:
+    invoice_stats = _filled_invoice_stats(invoices=invoices, validation_backend="numpy")
+
+    return invoice_stats, invoice_stats.validate_all, len(invoices)
+
+
+def _setup_clear(invoices: List[dict]) -> Tuple[InvoiceStats, Callable[[], None], int]:
+    invoice_stats = _filled_invoice_stats(invoices=invoices)
+    invoice_stats.get_mean()
+
+    return invoice_stats, invoice_stats.clear, len(invoices)
+
+
+BENCHMARKS: Dict[str, BENCHMARK_SETUP_TYPE] = {
+    "add_invoices": _setup_add_invoices,
+    "add_invoices_numpy_validation": _setup_add_invoices_numpy_validation,
+    "add_invoice": _setup_add_invoice,
+    "get_mean": _setup_get_mean,
+    "get_median": _setup_get_median,
+    "validate_all": _setup_validate_all,
+    "validate_all_numpy_validation": _setup_validate_all_numpy_validation,
+    "clear": _setup_clear,
+}
+
+
+def measure(setup: BENCHMARK_SETUP_TYPE, invoices: List[dict]) -> Dict[str, float]:
+    """Function to measure a benchmark.
+
+    Args:
+        setup (BENCHMARK_SETUP_TYPE): Given benchmark setup
+        invoices (List[dict]): Invoices to set the benchmark up with
+
+    Returns (Dict[str, float]): Wall time and CPU time in seconds, peak memory in bytes allocated
+        by the operation, and the time per InvoiceStats phase as reported by its metrics
+
+    Notes:
+        tracemalloc slows down the operation, so the memory is measured in a second run on a new
+        setup, and the times are measured without tracing.
+
+    """
+    invoice_stats, operation, row_count = setup(invoices)
+    invoice_stats.metrics(reset=True)
+
+    wall_time_start, cpu_time_start = time.perf_counter(), time.process_time()
+    operation()
+    wall_time, cpu_time = (
+        time.perf_counter() - wall_time_start,
+        time.process_time() - cpu_time_start,
+    )
+
+    phases = invoice_stats.metrics()["timings"]
+
+    _, operation, _ = setup(invoices)
+
+    tracemalloc.start()
+    try:
+        operation()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "rows": row_count,
+        "wall_time": wall_time,
+        "cpu_time": cpu_time,
+        "peak_memory": peak_memory,
+        "phases": phases,
+    }
+
+
+def run_benchmarks(scales: List[int], benchmark_names: List[str]) -> List[Dict]:
+    """Function to run benchmarks at several scales.
+
+    Args:
+        scales (List[int]): Number of invoices to run every benchmark with
+        benchmark_names (List[str]): Names of the benchmarks to run
+
+    Returns (List[Dict]): One result per benchmark and scale
+
+    """
+    results = []
+
+    for scale in scales:
+        invoices = create_invoices(scale=scale)
+
+        for benchmark_name in benchmark_names:
+            result = {
+                "benchmark": benchmark_name,
+                "scale": scale,
+                **measure(setup=BENCHMARKS[benchmark_name], invoices=invoices),
+            }
+            LOGGER.info(json.dumps(result))
+            results.append(result)
+
+    return results
+
+
+def compare_to_baseline(
+    results: List[Dict],
+    baseline: List[Dict],
+    time_threshold: float = DEFAULT_TIME_THRESHOLD,
+    memory_threshold: float = DEFAULT_MEMORY_THRESHOLD,
+) -> List[str]:
+    """Function to compare benchmark results against a baseline.
+
+    Args:
+        results (List[Dict]): Given results
+        baseline (List[Dict]): Results of a baseline run, benchmarks missing in the baseline are
+            not compared
+        time_threshold (float): Allowed relative increase of the wall time, 0.2 -> 20%
+        memory_threshold (float): Allowed relative increase of the peak memory, 0.2 -> 20%
+
+    Returns (List[str]): One message per regression, empty if there is none
+
+    """
+    baseline_results = {(result["benchmark"], result["scale"]): result for result in baseline}
+    regressions = []
+
+    for result in results:
+        baseline_result = baseline_results.get((result["benchmark"], result["scale"]))
+
+        if baseline_result is None:
+            continue
+
+        for metric, threshold in [("wall_time", time_threshold), ("peak_memory", memory_threshold)]:
+            if result[metric] > baseline_result[metric] * (1 + threshold):
+                regressions.append(
+                    f"{result['benchmark']} at scale {result['scale']}: {metric} "
+                    f"{result[metric]:.6g} > {baseline_result[metric]:.6g} * (1 + {threshold})"
+                )
+
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Function to run the benchmark suite from the command line.
+
+    Args:
+        argv (Optional[List[str]]): Command line arguments, by default sys.argv
+
+    Returns (int): Exit code, 1 if a regression against the baseline was found
+
+    """
+    parser = argparse.ArgumentParser(description="InvoiceStats benchmark suite")
+    parser.add_argument("--scales", type=int, nargs="+", default=BENCHMARK_SCALES)
+    parser.add_argument(
+        "--benchmarks", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS)
+    )
+    parser.add_argument("--output", help="Path to write the results to, as JSON")
+    parser.add_argument("--baseline", help="Path to baseline results to compare against")
+    parser.add_argument("--time-threshold", type=float, default=DEFAULT_TIME_THRESHOLD)
+    parser.add_argument("--memory-threshold", type=float, default=DEFAULT_MEMORY_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(scales=args.scales, benchmark_names=args.benchmarks)
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = compare_to_baseline(
+                results=results,
+                baseline=json.load(baseline_file),
+                time_threshold=args.time_threshold,
+                memory_threshold=args.memory_threshold,
+            )
+
+        for regression in regressions:
+            LOGGER.error(f"Regression: {regression}")
+
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""Startup benchmark for InvoiceStats.
+
+Measures the time to import src.invoice_stats in a new interpreter, the time of the first
+InvoiceStats construction, which loads pandas and pandera, and the mean time per construction
+after that, as JSON:
+
+    python -m benchmarks.startup_benchmark --import-runs 5 --constructions 1000
+
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+from src.utils.constants import VALIDATION_BACKENDS
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_IMPORT_RUNS = 5
+DEFAULT_CONSTRUCTIONS = 1000
+STARTUP_MODULE = "src.invoice_stats"
+REPOSITORY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Run in a new interpreter, so no module is imported yet, prints the timings as JSON
+_STARTUP_SCRIPT = """
+import json
+import time
+
+start = time.perf_counter()
+from {module} import InvoiceStats
+imported = time.perf_counter()
+InvoiceStats(validation_backend="{validation_backend}")
+constructed = time.perf_counter()
+
+print(
+    json.dumps(
+        {{"import_time": imported - start, "first_construction_time": constructed - imported}}
+    )
+)
+"""
+
+
+def measure_import(module: str, validation_backend: str = "pandera") -> Dict[str, float]:
+    """Function to measure the import of a module, and the first InvoiceStats construction, in a
+    new interpreter.
+
+    Args:
+        module (str): Module holding InvoiceStats, e.g. src.invoice_stats
+        validation_backend (str): Validation backend of the first instance, by default pandera
+
+    Returns (Dict[str, float]): Import time and first construction time in seconds
+
+    Raises:
+        subprocess.CalledProcessError: If the interpreter fails
+
+    """
+    completed_process = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            _STARTUP_SCRIPT.format(module=module, validation_backend=validation_backend),
+        ],
+        cwd=REPOSITORY_DIR,
+        check=True,
+        stdout=subprocess.PIPE,
+    )
+
+    return json.loads(completed_process.stdout)
+
+
+def measure_construction(constructions: int, validation_backend: str = "pandera") -> float:
+    """Function to measure the mean time per InvoiceStats construction, once the modules are
+    loaded.
+
+    Args:
+        constructions (int): Number of instances to construct
+        validation_backend (str): Validation backend of the instances, by default pandera
+
+    Returns (float): Mean time per construction in seconds
+
+    """
+    from src.invoice_stats import InvoiceStats
+
+    # The first construction loads pandas and pandera, it is measured by measure_import
+    InvoiceStats(validation_backend=validation_backend)
+
+    start = time.perf_counter()
+    for _ in range(constructions):
+        InvoiceStats(validation_backend=validation_backend)
+
+    return (time.perf_counter() - start) / constructions
+
+
+def run_startup_benchmarks(
+    import_runs: int, constructions: int, validation_backends: List[str]
+) -> List[Dict]:
+    """Function to run the startup benchmarks.
+
+    Args:
+        import_runs (int): Number of new interpreters the import is measured in, the median is
+            reported
+        constructions (int): Number of instances the construction time is measured with
+        validation_backends (List[str]): Validation backends to measure the construction with
+
+    Returns (List[Dict]): One result per validation backend
+
+    """
+    results = []
+
+    for validation_backend in validation_backends:
+        import_results = [
+            measure_import(module=STARTUP_MODULE, validation_backend=validation_backend)
+            for _ in range(import_runs)
+        ]
+
+        result = {
+            "validation_backend": validation_backend,
+            "import_time": statistics.median(
+                import_result["import_time"] for import_result in import_results
+            ),
+            "first_construction_time": statistics.median(
+                import_result["first_construction_time"] for import_result in import_results
+            ),
+            "construction_time": measure_construction(
+                constructions=constructions, validation_backend=validation_backend
+            ),
+        }
+        LOGGER.info(json.dumps(result))
+        results.append(result)
+
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Function to run the startup benchmark from the command line.
+
+    Args:
+        argv (Optional[List[str]]): Command line arguments, by default sys.argv
+
+    Returns (int): Exit code
+
+    """
+    parser = argparse.ArgumentParser(description="InvoiceStats startup benchmark")
+    parser.add_argument("--import-runs", type=int, default=DEFAULT_IMPORT_RUNS)
+    parser.add_argument("--constructions", type=int, default=DEFAULT_CONSTRUCTIONS)
+    parser.add_argument(
+        "--validation-backends",
+        nargs="+",
+        choices=list(VALIDATION_BACKENDS),
+        default=list(VALIDATION_BACKENDS),
+    )
+    parser.add_argument("--output", help="Path to write the results to, as JSON")
+    args = parser.parse_args(argv)
+
+    results = run_startup_benchmarks(
+        import_runs=args.import_runs,
+        constructions=args.constructions,
+        validation_backends=args.validation_backends,
+    )
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
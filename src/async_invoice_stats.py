@@ -0,0 +1,279 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple, TypeVar
+
+from src.invoice_stats import InvoiceStats
+from src.utils.constants import (
+    ASYNC_MAX_BATCH_SIZE,
+    ASYNC_MAX_LATENCY,
+    ASYNC_MAX_QUEUE_SIZE,
+    INVOICE_ROW_DATA_INPUT_TYPE,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class AsyncInvoiceStats:
+    """Asyncio front-end of an InvoiceStats instance, that micro-batches single invoices.
+
+    Submitted invoices are queued, and a background task adds them to the InvoiceStats instance
+    as one batch, validated at once, when the batch is full or when its first invoice has waited
+    max_latency seconds. The batches and the aggregations run on a single worker thread, so the
+    event loop is not blocked and the InvoiceStats instance is only used by one thread at a time.
+
+    A rejected batch is split in halves, which are added again, until every invalid invoice is
+    found, so the valid invoices of a batch are still added. Every submitted invoice gets a future
+    that is resolved once it is added, or with its own error if it is rejected.
+
+    Examples:
+
+        async with AsyncInvoiceStats() as async_invoice_stats:
+            invoice = {"invoice_name": "company_a", "invoice_value": 10}
+            added = await async_invoice_stats.submit(invoice=invoice)
+            await added  # raises the error of the invoice if it is rejected
+            median = await async_invoice_stats.get_median()
+
+    """
+
+    def __init__(
+        self,
+        invoice_stats: Optional[InvoiceStats] = None,
+        max_batch_size: int = ASYNC_MAX_BATCH_SIZE,
+        max_latency: float = ASYNC_MAX_LATENCY,
+        max_queue_size: int = ASYNC_MAX_QUEUE_SIZE,
+    ) -> None:
+        """AsyncInvoiceStats constructor.
+
+        Args:
+            invoice_stats (Optional[InvoiceStats]): Instance the invoices are added to, by default
+                a new InvoiceStats instance
+            max_batch_size (int): Number of invoices a batch is added with at most, by default
+                10000
+            max_latency (float): Seconds the first invoice of a batch waits for more invoices at
+                most, by default 0.05
+            max_queue_size (int): Number of queued invoices submit waits on, by default 100000
+
+        """
+        self.invoice_stats = invoice_stats if invoice_stats is not None else InvoiceStats()
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self.max_queue_size = max_queue_size
+
+        # Created on the first submit, in the running event loop
+        self._queue: Optional[asyncio.Queue] = None
+        self._batch_task: Optional[asyncio.Task] = None
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._closed = False
+
+    async def __aenter__(self) -> "AsyncInvoiceStats":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def submit(self, invoice: INVOICE_ROW_DATA_INPUT_TYPE) -> asyncio.Future:
+        """Method to queue an invoice, it is added with the next batch.
+
+        Args:
+            invoice (INVOICE_ROW_DATA_INPUT_TYPE): Given invoice
+
+        Returns (asyncio.Future): Future resolved once the invoice is added, awaiting it raises
+            the error of the invoice if it is rejected
+
+        Raises:
+            RuntimeError: If the instance is closed
+
+        Notes:
+            Waits while max_queue_size invoices are queued (backpressure). An invoice that fails
+            validation only rejects itself, the other invoices of its batch are still added.
+
+        """
+        self._raise_if_closed()
+
+        loop = asyncio.get_running_loop()
+
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._batch_task = loop.create_task(self._add_batches(queue=self._queue))
+
+        added = loop.create_future()
+        await self._queue.put((invoice, added))
+
+        return added
+
+    async def flush(self) -> None:
+        """Method to wait until every queued invoice has been added, or rejected.
+
+        Raises:
+            RuntimeError: If the instance is closed
+
+        """
+        self._raise_if_closed()
+
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def get_mean(self, row: int = 0) -> float:
+        """Method to get the mean of the invoice values, once the queued invoices are added.
+
+        Args:
+            row (int): Given row of the invoice stats
+
+        Returns (float): The mean, as assigned to the invoice stats
+
+        """
+        await self.flush()
+
+        return await self._run(
+            self._get_agg_value, self.invoice_stats.get_mean, self.invoice_stats.mean_col_name, row
+        )
+
+    async def get_median(self, row: int = 0) -> float:
+        """Method to get the median of the invoice values, once the queued invoices are added.
+
+        Args:
+            row (int): Given row of the invoice stats
+
+        Returns (float): The median, as assigned to the invoice stats
+
+        """
+        await self.flush()
+
+        return await self._run(
+            self._get_agg_value,
+            self.invoice_stats.get_median,
+            self.invoice_stats.median_col_name,
+            row,
+        )
+
+    async def close(self) -> None:
+        """Method to add the queued invoices, and stop the background task and worker thread, the
+        instance cannot be used afterwards"""
+        if self._closed:
+            return
+
+        try:
+            await self.flush()
+
+        finally:
+            if self._batch_task is not None:
+                self._batch_task.cancel()
+                await asyncio.gather(self._batch_task, return_exceptions=True)
+
+            self._queue = None
+            self._batch_task = None
+            self._executor.shutdown(wait=True)
+            self._closed = True
+
+    async def _add_batches(self, queue: asyncio.Queue) -> None:
+        """Private method, run as a background task, to add the queued invoices batch by batch.
+
+        Args:
+            queue (asyncio.Queue): Queue of the submitted invoices, and their futures
+
+        """
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.max_latency
+
+            while len(batch) < self.max_batch_size:
+                # Invoices that are already queued are taken without waiting
+                if not queue.empty():
+                    batch.append(queue.get_nowait())
+                    continue
+
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout=timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                await self._add_batch(batch=batch)
+
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def _add_batch(
+        self, batch: List[Tuple[INVOICE_ROW_DATA_INPUT_TYPE, asyncio.Future]]
+    ) -> None:
+        """Private method to add a batch of invoices, and resolve their futures.
+
+        Args:
+            batch (List[Tuple[INVOICE_ROW_DATA_INPUT_TYPE, asyncio.Future]]): Invoices, and the
+                futures returned by submit
+
+        Notes:
+            A rejected batch is split in halves that are added again, so only the invalid
+            invoices are rejected, with their own error, in O(r log n) batches for r invalid
+            invoices.
+
+        """
+        try:
+            await self._run(self.invoice_stats.add_invoices, [invoice for invoice, _ in batch])
+
+        except Exception as batch_error:
+            if len(batch) > 1:
+                middle = len(batch) // 2
+                await self._add_batch(batch=batch[:middle])
+                await self._add_batch(batch=batch[middle:])
+
+                return
+
+            LOGGER.warning(f"An invoice was rejected: {batch_error}")
+            _, added = batch[0]
+
+            if not added.done():
+                added.set_exception(batch_error)
+
+            return
+
+        for _, added in batch:
+            if not added.done():
+                added.set_result(None)
+
+    async def _run(self, function: Callable[..., T], *args) -> T:
+        """Private method to run a function on the worker thread.
+
+        Args:
+            function (Callable[..., T]): Given function
+            *args: Positional arguments of the function
+
+        Returns (T): The result of the function
+
+        """
+        return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+    def _get_agg_value(self, get_agg: Callable[..., None], column: str, row: int) -> float:
+        """Private method to compute an aggregate, and read it from the invoice stats.
+
+        Args:
+            get_agg (Callable[..., None]): get_mean or get_median of the InvoiceStats instance
+            column (str): Invoice stats column get_agg assigns the aggregate to
+            row (int): Given row of the invoice stats
+
+        Returns (float): The aggregate
+
+        """
+        get_agg(row=row)
+
+        return self.invoice_stats.invoice_stats.at[row, column]
+
+    def _raise_if_closed(self) -> None:
+        """Private method to raise an error if the instance is closed.
+
+        Raises:
+            RuntimeError: If close has been called
+
+        """
+        if self._closed:
+            raise RuntimeError("AsyncInvoiceStats is closed, create a new instance")
@@ -0,0 +1,347 @@
+from __future__ import annotations
+
+import itertools
+import logging
+import os
+import threading
+from contextlib import ExitStack
+from decimal import Decimal
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from src.utils.constants import (
+    CENTS_PER_UNIT,
+    INVOICE_COLUMN_NAMES,
+    INVOICE_ROW_DATA_INPUT_TYPE,
+    INVOICE_STATS_COLUMN_NAMES,
+    INVOICE_SUMMARY_COLUMN_NAMES,
+)
+from src.utils.invoice_buffer import InvoiceBuffer
+from src.utils.invoice_valid_limits import (
+    valid_invoice_limit,
+    valid_max_invoice_val,
+    valid_min_invoice_val,
+)
+from src.utils.invoice_validator import InvoiceValidator
+from src.utils.lazy_import import lazy_import
+from src.utils.running_sum import RunningSum
+from src.utils.selection import parallel_exact_median
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_import("pandas")
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ConcurrentInvoiceStats:
+    """Thread-safe invoice stats for many concurrent writers, with the invoices split in shards.
+
+    Every writer thread is assigned a shard, round robin, with its own lock, invoice buffer and
+    running sum, so writers only contend when there are more writer threads than shards. The
+    invoice limit is enforced across all shards by reserving rows on a global counter, which is
+    only locked for the check and increment. Rows stay pending until they are appended, so clear
+    keeps the reservations of the inserts that are still in progress.
+
+    Readers lock all shards at once to take a snapshot, O(number of shards): the running sums are
+    merged, and the invoice buffers are append-only, so views of their values up to the snapshot
+    stay unchanged while writers go on appending. The median is then selected from the snapshot
+    without holding any lock.
+
+    """
+
+    def __init__(
+        self,
+        max_invoice_value: Optional[Union[Decimal, float]] = None,
+        min_invoice_value: Optional[Union[Decimal, float]] = None,
+        invoice_limit: Optional[Union[Decimal, int]] = None,
+        fixed_point: bool = False,
+        shard_count: Optional[int] = None,
+        median_workers: Optional[int] = None,
+        validation_backend: str = "pandera",
+        validation_workers: int = 1,
+    ) -> None:
+        """ConcurrentInvoiceStats constructor.
+
+        Args:
+            max_invoice_value (Optional[Union[Decimal, float]]): max value for an invoice, by
+                default 200000000.00
+            min_invoice_value (Optional[Union[Decimal, float]]): min value for an invoice, by
+                default 1
+            invoice_limit (Optional[Union[Decimal, int]]): number of invoices limit across all
+                shards, by default 20000000
+            fixed_point (bool): If True the invoice values are stored as int64 minor units
+                (cents), by default False
+            shard_count (Optional[int]): Number of shards, by default the number of CPUs
+            median_workers (Optional[int]): Number of threads the median is selected with, by
+                default the number of CPUs
+            validation_backend (str): pandera, or numpy to validate the invoices with NumPy checks
+                compiled from the same schema, see NumpyValidator, by default pandera
+            validation_workers (int): If above 1 large batches are split into chunks that are
+                validated by this many worker processes, kept until close is called, by default 1
+
+        Raises:
+            ValueError: If the validation backend is unknown
+
+        """
+        self.min_invoice_value = valid_min_invoice_val(min_invoice_value=min_invoice_value)
+        self.max_invoice_value = valid_max_invoice_val(max_invoice_value=max_invoice_value)
+        self.invoice_limit = valid_invoice_limit(invoice_limit=invoice_limit)
+
+        self.fixed_point = fixed_point
+        self._value_scale = CENTS_PER_UNIT if self.fixed_point else 1
+        value_dtype = np.int64 if self.fixed_point else np.float64
+
+        # Conversion and validation of the incoming invoices, the same as InvoiceStats
+        self._validator = InvoiceValidator(
+            max_invoice_value=self.max_invoice_value,
+            min_invoice_value=self.min_invoice_value,
+            fixed_point=self.fixed_point,
+            validation_backend=validation_backend,
+            validation_workers=validation_workers,
+        )
+        self.invoice_schema = self._validator.invoice_schema
+        self.validation_backend = validation_backend
+        self.validation_workers = validation_workers
+
+        self.shard_count = shard_count if shard_count is not None else os.cpu_count() or 1
+        self.median_workers = median_workers if median_workers is not None else os.cpu_count() or 1
+
+        # Every shard can hold up to the invoice limit, the limit is enforced by the reservations
+        self._shard_locks = [threading.Lock() for _ in range(self.shard_count)]
+        self._shard_buffers = [
+            InvoiceBuffer(capacity_limit=int(self.invoice_limit), value_dtype=value_dtype)
+            for _ in range(self.shard_count)
+        ]
+        self._shard_sums = [RunningSum() for _ in range(self.shard_count)]
+
+        # Rows reserved against the invoice limit, by inserts that are done or in progress, and
+        # the rows of the inserts in progress, that are not appended yet
+        self._limit_lock = threading.Lock()
+        self._reserved_row_count = 0
+        self._pending_row_count = 0
+
+        # Shard of every writer thread
+        self._thread_shards = threading.local()
+        self._next_shard = itertools.count()
+
+    @property
+    def invoice_count(self) -> int:
+        """Number of invoices held by all shards, at a consistent snapshot"""
+        running_sum, _ = self._snapshot(with_values=False)
+
+        return running_sum.count
+
+    def add_invoices(self, invoices: List[INVOICE_ROW_DATA_INPUT_TYPE]) -> int:
+        """Method to add invoices, thread-safe.
+
+        Args:
+            invoices (List[INVOICE_ROW_DATA_INPUT_TYPE]): A list of invoices
+
+        Returns (int): Number of invoices that were added
+
+        """
+        return self.add_invoice(
+            invoice=pd.DataFrame(invoices, columns=list(INVOICE_COLUMN_NAMES.values()))
+        )
+
+    def add_invoice(self, invoice: Union[INVOICE_ROW_DATA_INPUT_TYPE, pd.DataFrame]) -> int:
+        """Method to add a single invoice(s) to the shard of the calling thread, thread-safe.
+
+        Args:
+            invoice (Union[INVOICE_ROW_DATA_INPUT_TYPE, pd.DataFrame]): Data to insert
+
+        Returns (int): Number of invoices that were added
+
+        Notes:
+            Rows are reserved against the invoice limit first, if the invoices do not fit only
+            the first invoices up to the limit are added. The invoices are validated without
+            holding a lock, and appended under the lock of the shard only. If the validation
+            fails the reserved rows are released and the error is raised.
+
+            With validation_workers the calling thread waits for the process pool, so writer
+            threads share it, a batch at a time.
+
+        """
+        if isinstance(invoice, Dict):
+            invoice = pd.DataFrame([invoice], columns=list(INVOICE_COLUMN_NAMES.values()))
+
+        reserved_row_count = self._reserve(row_count=invoice.shape[0])
+
+        if reserved_row_count == 0:
+            LOGGER.warning("Maximal limit of invoices reached, please clear invoices and try again")
+            return 0
+
+        if reserved_row_count < invoice.shape[0]:
+            LOGGER.warning(
+                f"Maximal limit of invoices reached, only {reserved_row_count} of "
+                f"{invoice.shape[0]} invoices are added"
+            )
+            invoice = invoice.iloc[:reserved_row_count]
+
+        try:
+            invoice = self._validator.validate(invoices=self._validator.convert(invoices=invoice))
+
+        except Exception as insert_error:
+            self._release(row_count=reserved_row_count)
+            raise insert_error
+
+        shard = self._get_shard()
+        names = invoice[INVOICE_COLUMN_NAMES["invoice_name"]].to_numpy(dtype=object)
+        values = invoice[INVOICE_COLUMN_NAMES["invoice_value"]].to_numpy(
+            dtype=self._shard_buffers[shard].value_dtype
+        )
+
+        with self._shard_locks[shard]:
+            self._shard_buffers[shard].append(names=names, values=values)
+            self._shard_sums[shard].extend(values=values)
+
+            # Still under the shard lock, so a clear either drops the rows or keeps them pending
+            with self._limit_lock:
+                self._pending_row_count -= reserved_row_count
+
+        return reserved_row_count
+
+    def get_stats(self) -> Dict[str, float]:
+        """Method to get the count, mean and median of the invoice values, at one consistent
+        snapshot of all shards.
+
+        Returns (Dict[str, float]): The invoice_count, invoice_mean and invoice_median, the mean
+            and median are not rounded, NaN if there are no invoices
+
+        """
+        running_sum, values = self._snapshot(with_values=True)
+
+        return {
+            INVOICE_SUMMARY_COLUMN_NAMES["invoice_count"]: running_sum.count,
+            INVOICE_STATS_COLUMN_NAMES["invoice_mean"]: running_sum.mean(scale=self._value_scale),
+            INVOICE_STATS_COLUMN_NAMES["invoice_median"]: self._median(values=values),
+        }
+
+    def get_mean(self) -> float:
+        """Method to get the mean of the invoice values, O(number of shards).
+
+        Returns (float): The mean, not rounded, NaN if there are no invoices
+
+        """
+        running_sum, _ = self._snapshot(with_values=False)
+
+        return running_sum.mean(scale=self._value_scale)
+
+    def get_median(self) -> float:
+        """Method to get the median of the invoice values, O(n) without holding a lock.
+
+        Returns (float): The median, not rounded, NaN if there are no invoices
+
+        """
+        _, values = self._snapshot(with_values=True)
+
+        return self._median(values=values)
+
+    def clear(self) -> None:
+        """Method to drop the invoices of all shards.
+
+        Notes:
+            Inserts that are still validating keep their reserved rows, they are appended after
+            the clear, so the invoice limit holds for the invoices added afterwards too.
+
+        """
+        with ExitStack() as stack:
+            for lock in self._shard_locks:
+                stack.enter_context(lock)
+
+            with self._limit_lock:
+                for buffer, running_sum in zip(self._shard_buffers, self._shard_sums):
+                    buffer.clear()
+                    running_sum.clear()
+
+                self._reserved_row_count = self._pending_row_count
+
+    def close(self) -> None:
+        """Method to shut down the worker processes of the parallel validation, a later insert
+        starts them again."""
+        self._validator.close()
+
+    def _get_shard(self) -> int:
+        """Private method to get the shard of the calling thread, assigned round robin on its
+        first insert.
+
+        Returns (int): Index of the shard
+
+        """
+        shard = getattr(self._thread_shards, "shard", None)
+
+        if shard is None:
+            shard = next(self._next_shard) % self.shard_count
+            self._thread_shards.shard = shard
+
+        return shard
+
+    def _reserve(self, row_count: int) -> int:
+        """Private method to reserve rows against the invoice limit.
+
+        Args:
+            row_count (int): Number of rows to add
+
+        Returns (int): Number of rows that were reserved, at most row_count
+
+        """
+        with self._limit_lock:
+            free_row_count = max(int(self.invoice_limit) - self._reserved_row_count, 0)
+            reserved_row_count = min(row_count, free_row_count)
+            self._reserved_row_count += reserved_row_count
+            self._pending_row_count += reserved_row_count
+
+        return reserved_row_count
+
+    def _release(self, row_count: int) -> None:
+        """Private method to release rows reserved by an insert that failed.
+
+        Args:
+            row_count (int): Number of reserved rows
+
+        """
+        with self._limit_lock:
+            self._reserved_row_count -= row_count
+            self._pending_row_count -= row_count
+
+    def _snapshot(self, with_values: bool) -> Tuple[RunningSum, List[np.ndarray]]:
+        """Private method to take a consistent snapshot of all shards, with all shard locks held.
+
+        Args:
+            with_values (bool): If True views of the invoice values are part of the snapshot
+
+        Returns (Tuple[RunningSum, List[np.ndarray]]): The running sum of all shards, and a view
+            of the invoice values of every shard
+
+        """
+        running_sum = RunningSum()
+        values = []
+
+        with ExitStack() as stack:
+            # The locks are always taken in the same order, so readers do not deadlock
+            for lock in self._shard_locks:
+                stack.enter_context(lock)
+
+            for buffer, shard_sum in zip(self._shard_buffers, self._shard_sums):
+                running_sum.merge(other=shard_sum)
+
+                if with_values:
+                    values.append(buffer.values)
+
+        return running_sum, values
+
+    def _median(self, values: List[np.ndarray]) -> float:
+        """Private method to select the median of a snapshot.
+
+        Args:
+            values (List[np.ndarray]): Views of the invoice values of every shard
+
+        Returns (float): The median
+
+        """
+        return parallel_exact_median(
+            values=np.concatenate(values), scale=self._value_scale, workers=self.median_workers
+        )
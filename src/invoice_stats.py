@@ -1,22 +1,53 @@
+from __future__ import annotations
+
 import logging
-import math
+import os
 from decimal import Decimal
-from typing import Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
-import pandas as pd
 
 from src.utils.constants import (
+    CENTS_PER_UNIT,
+    DEFAULT_INVOICE_QUANTILES,
     INVOICE_COLUMN_NAMES,
+    INVOICE_FILE_CHUNKSIZE,
     INVOICE_ROW_DATA_INPUT_TYPE,
     INVOICE_STATS_COLUMN_NAMES,
+    INVOICE_SUMMARY_COLUMN_NAMES,
+    QUANTILE_SKETCH_K,
 )
+from src.utils.group_stats import GroupStats
+from src.utils.invoice_buffer import InvoiceBuffer
+from src.utils.invoice_file import read_invoice_file
 from src.utils.invoice_valid_limits import (
     valid_invoice_limit,
     valid_max_invoice_val,
     valid_min_invoice_val,
 )
-from src.utils.schemas.invoice import create_invoice_schema, create_invoice_stats_schema
+from src.utils.invoice_validator import InvoiceValidator
+from src.utils.invoice_window import InvoiceWindow
+from src.utils.lazy_import import lazy_import
+from src.utils.memory_mapped_buffer import MemoryMappedInvoiceBuffer
+from src.utils.metrics import InvoiceMetrics, MetricsSink
+from src.utils.partial_aggregate import PartialAggregate
+from src.utils.quantile_sketch import QuantileSketch
+from src.utils.running_median import RunningMedian
+from src.utils.running_sum import RunningSum
+from src.utils.schemas.invoice import (
+    create_invoice_stats_schema,
+    invoice_stats_optional_columns,
+    quantile_column_name,
+)
+from src.utils.selection import exact_quantiles, parallel_exact_median
+from src.utils.snapshot import read_snapshot, write_snapshot
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pandera as pa
+else:
+    pd = lazy_import("pandas")
+    pa = lazy_import("pandera")
 
 LOGGER = logging.getLogger(__name__)
 
@@ -29,6 +60,16 @@ class InvoiceStats:
         max_invoice_value: Optional[Union[Decimal, float]] = None,
         min_invoice_value: Optional[Union[Decimal, float]] = None,
         invoice_limit: Optional[Union[Decimal, int]] = None,
+        fixed_point: bool = False,
+        storage_dir: Optional[str] = None,
+        metrics: bool = False,
+        metrics_sink: Optional[MetricsSink] = None,
+        validation_workers: int = 1,
+        median_workers: Optional[int] = None,
+        sketch_k: Optional[int] = None,
+        group_stats: bool = False,
+        window_size: Optional[int] = None,
+        validation_backend: str = "pandera",
     ) -> None:
         """InvoiceStats constructor.
 
@@ -42,13 +83,53 @@ class InvoiceStats:
                 default 1
             invoice_limit (Optional[Union[Decimal, int]]): number of invoices limit, by
                 default 20000000
+            fixed_point (bool): If True the invoice values are stored as int64 minor units
+                (cents), and the mean and median are computed on integers, by default False
+            storage_dir (Optional[str]): If given the invoices are stored in memory-mapped files
+                in this directory, an existing store is opened again, by default None
+            metrics (bool): If True per-phase timers and counters are recorded, see the metrics
+                method, by default False
+            metrics_sink (Optional[MetricsSink]): Sink that receives every metric as it is
+                recorded, a sink enables the metrics, by default None
+            validation_workers (int): If above 1 large batches are split into chunks that are
+                validated by this many worker processes, kept until close is called, by default 1
+            median_workers (Optional[int]): Number of threads the median is selected with, when
+                it is not held in a running median, by default the number of CPUs
+            sketch_k (Optional[int]): If given the invoices are not stored, the median and
+                quantiles are approximated by a quantile sketch with this accuracy parameter,
+                see QuantileSketch, by default None
+            group_stats (bool): If True the count, mean and median are also kept per invoice name,
+                see get_group_stats, by default False
+            window_size (Optional[int]): If given the invoices are not stored, the stats are
+                computed over the most recent window_size invoices only, by default None
+            validation_backend (str): pandera, or numpy to validate the invoices with NumPy checks
+                compiled from the same schema, see NumpyValidator, by default pandera
+
+        Raises:
+            ValueError: If both storage_dir and sketch_k are given, if window_size is combined
+                with storage_dir, sketch_k or group_stats, or if the validation backend is unknown
+
+        Notes:
+            With storage_dir the median is computed by selection over the mapped invoice values
+            on every get_median, instead of being held in a running median in process memory.
+
+            With sketch_k the memory stays constant however many invoices are added, and the
+            invoice limit is not enforced, the mean stays exact.
+
+            With window_size the values of the most recent invoices are kept in a ring buffer, and
+            the invoices that are evicted from it are removed from the running sum and running
+            median, O(log window_size) per invoice. get_mean and get_median stay O(1), the memory
+            is bounded by window_size and the invoice limit is not enforced.
+
+            Both validation backends reject the same invoices with a pandera SchemaError, the
+            numpy backend skips pandera's generic machinery on every insert.
 
         """
         # Set column names
-        self.invoices = pd.DataFrame(columns=list(INVOICE_COLUMN_NAMES.values()))
+        self.invoice_column_names = list(INVOICE_COLUMN_NAMES.values())
         self.invoice_stats = pd.DataFrame(columns=list(INVOICE_STATS_COLUMN_NAMES.values()))
-        self.median_col_name = INVOICE_STATS_COLUMN_NAMES.get("invoice_median")
-        self.mean_col_name = INVOICE_STATS_COLUMN_NAMES.get("invoice_mean")
+        self.median_col_name = INVOICE_STATS_COLUMN_NAMES["invoice_median"]
+        self.mean_col_name = INVOICE_STATS_COLUMN_NAMES["invoice_mean"]
 
         # Set the limits for min, max invoice value and total number of accepted invoices,
         # to be used for checking each invoice(s) that gets added to the invoice_holder list
@@ -56,10 +137,112 @@ class InvoiceStats:
         self.max_invoice_value = valid_max_invoice_val(max_invoice_value=max_invoice_value)
         self.invoice_limit = valid_invoice_limit(invoice_limit=invoice_limit)
 
-        self.invoice_schema = create_invoice_schema(
-            max_invoice_value=self.max_invoice_value, min_invoice_value=self.min_invoice_value,
+        # Invoice values are either stored as float64 units, or as int64 cents
+        self.fixed_point = fixed_point
+        self._value_scale = CENTS_PER_UNIT if self.fixed_point else 1
+        value_dtype = np.int64 if self.fixed_point else np.float64
+
+        # Columnar storage of the invoices, capped by the invoice limit
+        self.storage_dir = storage_dir
+        self.sketch_k = sketch_k
+
+        self.window_size = window_size
+
+        # Conversion and validation of the incoming invoices, against the invoice schema
+        self._validator = InvoiceValidator(
+            max_invoice_value=self.max_invoice_value,
+            min_invoice_value=self.min_invoice_value,
+            fixed_point=self.fixed_point,
+            validation_backend=validation_backend,
+            validation_workers=validation_workers,
+        )
+        self.invoice_schema = self._validator.invoice_schema
+        self.invoice_validator = self._validator.validator
+        self.validation_backend = validation_backend
+        self.validation_workers = validation_workers
+
+        if self.storage_dir is not None and self.sketch_k is not None:
+            raise ValueError(
+                f"storage_dir={self.storage_dir} cannot be combined with sketch_k={self.sketch_k}"
+            )
+
+        if self.window_size is not None and (
+            self.storage_dir is not None or self.sketch_k is not None or group_stats
+        ):
+            raise ValueError(
+                f"window_size={self.window_size} cannot be combined with storage_dir="
+                f"{self.storage_dir}, sketch_k={self.sketch_k} or group_stats={group_stats}"
+            )
+
+        self._invoice_buffer: Union[InvoiceBuffer, MemoryMappedInvoiceBuffer]
+
+        if self.storage_dir is not None:
+            self._invoice_buffer = MemoryMappedInvoiceBuffer(
+                directory=self.storage_dir,
+                capacity_limit=int(self.invoice_limit),
+                value_dtype=value_dtype,
+            )
+        else:
+            # A sketch or a window does not store the invoices, the buffer stays empty
+            self._invoice_buffer = InvoiceBuffer(
+                capacity_limit=int(self.invoice_limit) if self._bounded else 0,
+                value_dtype=value_dtype,
+            )
+
+        # Values of the most recent invoices, the stats are computed over them
+        self._invoice_window = (
+            InvoiceWindow(size=self.window_size, value_dtype=value_dtype)
+            if self.window_size is not None
+            else None
+        )
+
+        # Running aggregates, updated on every insert
+        self._running_median = (
+            RunningMedian() if self.storage_dir is None and self.sketch_k is None else None
         )
+        self._quantile_sketch = (
+            QuantileSketch(k=self.sketch_k, value_dtype=value_dtype)
+            if self.sketch_k is not None
+            else None
+        )
+        self._running_sum = RunningSum()
+
+        # Aggregates per invoice name, kept up to date on every insert
+        self._group_stats = GroupStats(value_dtype=value_dtype) if group_stats else None
+
+        if len(self._invoice_buffer) > 0:
+            self._running_sum.extend(values=self._invoice_buffer.values)
+
+            if self._group_stats is not None:
+                self._group_stats.extend(
+                    names=self._invoice_buffer.names, values=self._invoice_buffer.values
+                )
+
         self.invoice_stats_schema = create_invoice_stats_schema()
+        self.median_workers = median_workers if median_workers is not None else os.cpu_count() or 1
+
+        # Instrumentation of the insert and aggregation phases, a no-op unless enabled
+        self._metrics = InvoiceMetrics(enabled=metrics, sink=metrics_sink)
+
+        # Version of the invoices, bumped on every change, the aggregates computed for a version
+        # are cached, and so are the invoice stats cells assigned for it, per (row, column)
+        self._version = 0
+        self._aggregates_version = 0
+        self._aggregates: Dict[str, float] = {}
+        self._assigned_versions: Dict[Tuple[int, str], int] = {}
+
+    @property
+    def invoices(self) -> pd.DataFrame:
+        """The stored invoices, as a pd.DataFrame view on top of the invoice buffer, the invoice
+        values are in cents when fixed_point is set"""
+        return self._invoice_buffer.to_frame()
+
+    @property
+    def invoice_count(self) -> int:
+        """Number of invoices the stats are computed over, including invoices restored from a
+        snapshot, which are not held in the invoice buffer, with window_size the number of
+        invoices in the window"""
+        return len(self._running_sum)
 
     def add_invoices(self, invoices: List[INVOICE_ROW_DATA_INPUT_TYPE]) -> None:
         """Method to add invoices, due to the size limit up to 20000000.
@@ -68,38 +251,73 @@ class InvoiceStats:
             invoices (List[INVOICE_ROW_DATA_INPUT_TYPE]): A list of invoices
 
         """
-        self.add_invoice(invoice=pd.DataFrame(invoices, columns=self.invoices.columns))
+        with self._metrics.timer(name="frame_construction"):
+            invoice = pd.DataFrame(invoices, columns=self.invoice_column_names)
+
+        self.add_invoice(invoice=invoice)
 
     def add_invoice(
         self,
         invoice: Union[INVOICE_ROW_DATA_INPUT_TYPE, pd.DataFrame],
         ignore_index_flag: bool = True,
     ) -> None:
-        """Method to add a single invoice(s) to the invoice pd.DataFrame.
+        """Method to add a single invoice(s) to the invoice buffer.
 
         Args:
             invoice (INVOICE_ROW_DATA_INPUT_TYPE): Data to insert
-            ignore_index_flag (bool): If the index_flag should be ignored or not, dataframe creation
+            ignore_index_flag (bool): Kept for backwards compatibility, the invoices are always
+                appended to the invoice buffer and get a new index
 
         Notes:
-            If add_invoices invokes this method, it means that a list of invoices will perform
-            UNION on the existing pd.DataFrame.
+            If add_invoices invokes this method, it means that a list of invoices will be
+            appended to the invoice buffer, an amortized O(1) operation per invoice.
+
+            Only the given invoice(s) are validated against the invoice schema, so the cost of an
+            insert depends on the batch size and not on the number of stored invoices. Use
+            validate_all to validate the whole invoice table. With validation_workers, large
+            batches are validated in chunks by a process pool, and raise the same errors.
+
+            If the invoices do not fit within the invoice limit, only the first invoices up to
+            the limit are added.
+
+            When fixed_point is set the invoice values are converted to cents, vectorized, before
+            they are validated.
 
         """
+        # Rows of the batch that are not accepted, they are counted as rejected
+        pending_row_count = 1 if isinstance(invoice, Dict) else invoice.shape[0]
+
         try:
-            invoice_row_count = self.invoices.shape[0]
+            invoice_row_count = self.invoice_count
+            bounded = self._bounded
 
-            if invoice_row_count < self.invoice_limit:
+            if not bounded or invoice_row_count < self.invoice_limit:
 
                 if isinstance(invoice, Dict):
-                    self.invoices.loc[len(self.invoices)] = invoice
+                    invoice = pd.DataFrame([invoice], columns=self.invoice_column_names)
+
+                free_row_count = int(self.invoice_limit) - invoice_row_count
 
-                else:
-                    self.invoices = pd.concat(
-                        [invoice, self.invoices], ignore_index=ignore_index_flag,
+                if bounded and invoice.shape[0] > free_row_count:
+                    LOGGER.warning(
+                        f"Maximal limit of invoices reached, only {free_row_count} of "
+                        f"{invoice.shape[0]} invoices are added"
                     )
+                    invoice = invoice.iloc[:free_row_count]
+
+                if self.fixed_point:
+                    with self._metrics.timer(name="conversion"):
+                        invoice = self._validator.convert(invoices=invoice)
+
+                with self._metrics.timer(name="validation"):
+                    invoice = self._validator.validate(invoices=invoice)
+
+                with self._metrics.timer(name="append"):
+                    self._append_invoices(invoices=invoice)
+
+                self._metrics.increment(name="rows_accepted", value=invoice.shape[0])
+                pending_row_count -= invoice.shape[0]
 
-                self.invoice_schema.validate(self.invoices)
             else:
                 LOGGER.warning(
                     f"Maximal limit of invoices reached, please clear invoices and try again\n"
@@ -109,6 +327,70 @@ class InvoiceStats:
         except Exception as insert_error:
             raise insert_error
 
+        finally:
+            if self._metrics.enabled and pending_row_count > 0:
+                self._metrics.increment(name="rows_rejected", value=pending_row_count)
+
+    def add_invoices_from_file(
+        self, path: str, chunksize: int = INVOICE_FILE_CHUNKSIZE, file_format: Optional[str] = None
+    ) -> int:
+        """Method to stream invoices from a CSV or Parquet file into the invoice buffer.
+
+        Args:
+            path (str): Path to the file, with the invoice_name and invoice_value columns
+            chunksize (int): Number of invoices read, validated and inserted at a time, by
+                default 100000
+            file_format (Optional[str]): "csv" or "parquet", by default inferred from the file
+                extension
+
+        Returns (int): Number of invoices that were accepted
+
+        Notes:
+            Only one chunk of the file is held in memory at a time, on top of the invoice buffer.
+            The file is read until the invoice limit is reached. If a chunk fails validation the
+            error is raised, the chunks before it have already been accepted.
+
+            Reading Parquet files requires pyarrow.
+
+        """
+        invoice_row_count = self.invoice_count
+        # Without the invoice limit every row is accepted, but a window does not keep them all
+        unbounded_row_count = 0
+
+        try:
+            for invoices in read_invoice_file(
+                path=path, chunksize=chunksize, file_format=file_format
+            ):
+                self.add_invoice(invoice=invoices)
+
+                if not self._bounded:
+                    unbounded_row_count += invoices.shape[0]
+
+                elif self.invoice_count >= self.invoice_limit:
+                    break
+
+        except Exception as file_error:
+            raise file_error
+
+        if not self._bounded:
+            return unbounded_row_count
+
+        return self.invoice_count - invoice_row_count
+
+    def validate_all(self) -> None:
+        """Method to validate every stored invoice against the invoice schema.
+
+        Notes:
+            This is a full pass over the invoice table, add_invoice only validates the incoming
+            invoice(s).
+
+        """
+        try:
+            self._validator.validate(invoices=self.invoices)
+
+        except Exception as validation_error:
+            raise validation_error
+
     def clear(self, inplace: bool = True) -> None:
         """Method to drop all rows in tables related to invoice data
 
@@ -116,15 +398,316 @@ class InvoiceStats:
             inplace (bool): Determine if it should delete one or more columns in-place
 
         """
-        invoices_row_count = self.invoices.shape[0]
+        invoices_row_count = self.invoice_count
         invoice_stats_row_count = self.invoice_stats.shape[0]
 
         if invoices_row_count > 0 and invoice_stats_row_count > 0:
-            self.invoices.drop(self.invoices.index, inplace=inplace)
+            self._invoice_buffer.clear()
+            self._running_sum.clear()
+
+            if self._running_median is not None:
+                self._running_median.clear()
+
+            if self._quantile_sketch is not None:
+                self._quantile_sketch.clear()
+
+            if self._invoice_window is not None:
+                self._invoice_window.clear()
+
+            if self._group_stats is not None:
+                self._group_stats.clear()
+
             self.invoice_stats.drop(self.invoice_stats.index, inplace=inplace)
+            self._assigned_versions.clear()
+            self._mark_changed()
+            self._set_storage_gauges()
         else:
             LOGGER.warning(f"Warning! There is no data to delete!")
 
+    def close(self) -> None:
+        """Method to shut down the worker processes of the parallel validation, a later insert
+        starts them again."""
+        self._validator.close()
+
+    def remove_invoice(self, invoice_id: int) -> None:
+        """Method to remove a single invoice, e.g. when it is retracted by a credit note.
+
+        Args:
+            invoice_id (int): Id of the invoice, its index in invoices
+
+        Raises:
+            KeyError: If there is no stored invoice with the id
+
+        """
+        self.remove_invoices(invoice_ids=[invoice_id])
+
+    def remove_invoices(
+        self, invoice_ids: Optional[Sequence[int]] = None, names: Optional[Sequence[str]] = None,
+    ) -> int:
+        """Method to remove invoices by id and/or by invoice name, and update the stats.
+
+        Args:
+            invoice_ids (Optional[Sequence[int]]): Ids of the invoices, their index in invoices
+            names (Optional[Sequence[str]]): Every stored invoice with one of these names is
+                removed
+
+        Returns (int): Number of invoices that were removed
+
+        Raises:
+            ValueError: If neither invoice_ids nor names are given, or if the invoices are not held
+                in memory (storage_dir, sketch_k or window_size)
+            KeyError: If an id is not a stored invoice, nothing is removed then
+
+        Notes:
+            The ids are stable, an invoice keeps its id when invoices before it are removed. A
+            removed invoice is looked up in O(1) (O(log n) once the buffer has been compacted),
+            and removed from the running sum, running median and group stats in O(log n), so
+            the invoices DataFrame is not rebuilt and the invoice table is not scanned, except
+            to find the invoices of the names.
+
+        """
+        if (
+            not isinstance(self._invoice_buffer, InvoiceBuffer)
+            or self._running_median is None
+            or self._invoice_window is not None
+        ):
+            raise ValueError(
+                f"Invoices can only be removed when they are held in memory, got storage_dir="
+                f"{self.storage_dir}, sketch_k={self.sketch_k} and window_size={self.window_size}"
+            )
+
+        if invoice_ids is None and names is None:
+            raise ValueError("Either invoice_ids or names must be given")
+
+        try:
+            with self._metrics.timer(name="removal"):
+                ids = np.asarray([] if invoice_ids is None else invoice_ids, dtype=np.int64)
+
+                if names is not None:
+                    ids = np.union1d(ids, self._invoice_buffer.find(names=names))
+
+                removed_names, removed_values = self._invoice_buffer.delete(ids=ids)
+
+                self._running_sum.remove(values=removed_values)
+                self._running_median.remove(values=removed_values)
+
+                if self._group_stats is not None:
+                    self._group_stats.remove(names=removed_names, values=removed_values)
+
+        except Exception as remove_error:
+            raise remove_error
+
+        self._metrics.increment(name="rows_removed", value=removed_values.shape[0])
+        self._mark_changed()
+        self._set_storage_gauges()
+
+        return removed_values.shape[0]
+
+    def metrics(self, reset: bool = False) -> Dict[str, Dict]:
+        """Method to get a snapshot of the recorded metrics.
+
+        Args:
+            reset (bool): If True the counters and timings are reset after the snapshot, by
+                default False
+
+        Returns (Dict[str, Dict]): counters (rows_accepted, rows_rejected, rows_removed), timings
+            as count and total seconds per phase (frame_construction, conversion, validation,
+            append, removal, aggregation), and gauges (rows_held, bytes_held)
+
+        Notes:
+            The counters and timings are only recorded when the instance is created with metrics
+            or a metrics_sink, the gauges are always up to date. bytes_held is the memory held by
+            the invoice buffer columns.
+
+        """
+        metrics = self._metrics.snapshot()
+        metrics["gauges"].update({"rows_held": self.invoice_count, "bytes_held": self._nbytes})
+
+        if reset:
+            self._metrics.clear()
+
+        return metrics
+
+    def save_snapshot(self, path: str) -> None:
+        """Method to save the configured limits and the running aggregates to a snapshot file.
+
+        Args:
+            path (str): Path of the snapshot file
+
+        Raises:
+            ValueError: If the invoices are stored in memory-mapped files, the store is already
+                persisted and is opened again with storage_dir, or with window_size, the window is
+                not saved
+
+        Notes:
+            The invoices themselves are not part of the snapshot, see load_snapshot. With
+            sketch_k the quantile sketch is saved instead of the running median. Group stats are
+            not saved.
+
+        """
+        running_aggregate = (
+            self._quantile_sketch if self._quantile_sketch is not None else self._running_median
+        )
+
+        if running_aggregate is None:
+            raise ValueError(
+                f"Snapshots are not supported with storage_dir={self.storage_dir}, open the "
+                f"invoice store again instead"
+            )
+
+        if self._invoice_window is not None:
+            raise ValueError(f"Snapshots are not supported with window_size={self.window_size}")
+
+        try:
+            write_snapshot(
+                path=path,
+                header={
+                    "max_invoice_value": str(self.max_invoice_value),
+                    "min_invoice_value": str(self.min_invoice_value),
+                    "invoice_limit": str(self.invoice_limit),
+                    "fixed_point": self.fixed_point,
+                    "sketch_k": self.sketch_k,
+                    "running_sum": self._running_sum.get_state(),
+                },
+                arrays=running_aggregate.get_state(),
+            )
+
+        except Exception as snapshot_error:
+            raise snapshot_error
+
+    @classmethod
+    def load_snapshot(cls, path: str) -> "InvoiceStats":
+        """Method to restore an InvoiceStats instance from a snapshot file.
+
+        Args:
+            path (str): Path of the snapshot file, written by save_snapshot
+
+        Returns (InvoiceStats): Instance with the limits and running aggregates of the snapshot,
+            get_mean and get_median are answered without reading any invoices, and new invoices
+            can be added on top of the restored ones.
+
+        Notes:
+            The restored invoices are counted against the invoice limit, but they are not held in
+            the invoice buffer, so invoices and validate_all only cover invoices added after the
+            restore.
+
+        """
+        try:
+            header, arrays = read_snapshot(path=path)
+
+            invoice_stats = cls(
+                max_invoice_value=Decimal(header["max_invoice_value"]),
+                min_invoice_value=Decimal(header["min_invoice_value"]),
+                invoice_limit=Decimal(header["invoice_limit"]),
+                fixed_point=header["fixed_point"],
+                sketch_k=header.get("sketch_k"),
+            )
+            invoice_stats._running_sum.set_state(state=header["running_sum"])
+
+            if invoice_stats._quantile_sketch is not None:
+                invoice_stats._quantile_sketch.set_state(state=arrays)
+            elif invoice_stats._running_median is not None:
+                invoice_stats._running_median.set_state(state=arrays)
+
+            invoice_stats._mark_changed()
+
+        except Exception as snapshot_error:
+            raise snapshot_error
+
+        return invoice_stats
+
+    def to_partial_aggregate(
+        self, exact: bool = False, sketch_k: int = QUANTILE_SKETCH_K
+    ) -> PartialAggregate:
+        """Method to get the partial aggregate of the invoices, to be merged with the partial
+        aggregates of other instances, e.g. in other processes.
+
+        Args:
+            exact (bool): If True the invoice values are part of the partial aggregate, so the
+                merged median is exact, by default False
+            sketch_k (int): Accuracy parameter of the quantile sketch of the invoice values, by
+                default 200, with sketch_k the sketch of the instance is used
+
+        Returns (PartialAggregate): The exact count and sum, and a sketch of the invoice values
+
+        Raises:
+            ValueError: If exact is set with sketch_k, or if invoices were restored from a
+                snapshot, their values are not held in the invoice buffer
+
+        """
+        try:
+            running_sum = RunningSum()
+            running_sum.set_state(state=self._running_sum.get_state())
+
+            if self._quantile_sketch is not None:
+                if exact:
+                    raise ValueError(
+                        f"An exact partial aggregate needs the invoice values, they are not "
+                        f"stored with sketch_k={self.sketch_k}"
+                    )
+
+                quantile_sketch = QuantileSketch(
+                    k=self._quantile_sketch.k, value_dtype=self._quantile_sketch.value_dtype
+                )
+                quantile_sketch.merge(other=self._quantile_sketch)
+
+                return PartialAggregate(
+                    fixed_point=self.fixed_point,
+                    running_sum=running_sum,
+                    quantile_sketch=quantile_sketch,
+                )
+
+            values = self._stored_invoice_values()
+            quantile_sketch = QuantileSketch(k=sketch_k, value_dtype=values.dtype.type)
+            quantile_sketch.extend(values=values)
+
+            return PartialAggregate(
+                fixed_point=self.fixed_point,
+                running_sum=running_sum,
+                quantile_sketch=quantile_sketch,
+                values=values.copy() if exact else None,
+            )
+
+        except Exception as partial_aggregate_error:
+            raise partial_aggregate_error
+
+    @classmethod
+    def from_partial_aggregate(cls, partial_aggregate: PartialAggregate) -> "InvoiceStats":
+        """Method to create an InvoiceStats instance from a (merged) partial aggregate.
+
+        Args:
+            partial_aggregate (PartialAggregate): Given partial aggregate, see
+                merge_partial_aggregates
+
+        Returns (InvoiceStats): Instance whose get_mean and get_median are those of the partial
+            aggregate, get_mean is exact, get_median is exact if the partial aggregate is exact,
+            else it is approximated by its quantile sketch (the instance then has sketch_k set)
+
+        Notes:
+            Like an instance restored from a snapshot, the invoices are not held in the invoice
+            buffer. The count of the partial aggregate may exceed the invoice limit.
+
+        """
+        try:
+            invoice_stats = cls(
+                fixed_point=partial_aggregate.fixed_point,
+                sketch_k=None if partial_aggregate.exact else partial_aggregate.quantile_sketch.k,
+            )
+            invoice_stats._running_sum.set_state(state=partial_aggregate.running_sum.get_state())
+
+            # An exact partial aggregate gives a running median, otherwise a quantile sketch
+            if invoice_stats._running_median is not None:
+                invoice_stats._running_median.rebuild(values=partial_aggregate.values)
+            elif invoice_stats._quantile_sketch is not None:
+                invoice_stats._quantile_sketch.merge(other=partial_aggregate.quantile_sketch)
+
+            invoice_stats._mark_changed()
+
+        except Exception as partial_aggregate_error:
+            raise partial_aggregate_error
+
+        return invoice_stats
+
     def get_median(self, row: int = 0) -> None:
         """Method to get the median value from the invoice values, and assign it to the median
         invoice stats column.
@@ -132,22 +715,121 @@ class InvoiceStats:
         Args:
             row (int): Given row to fetch
 
+        Notes:
+            The median is only computed, rounded and validated again once the invoices have
+            changed since it was last assigned to the row.
+
         """
         try:
             if self.median_col_name is not None:
-
-                self._set_agg_value_invoice_values(
-                    row=row, column=self.median_col_name, agg_type="median",
-                )
-
-                self._round_down(column=self.median_col_name)
-                self.invoice_stats_schema.validate(self.invoice_stats)
+                self._get_stats(columns=[self.median_col_name], row=row)
             else:
                 LOGGER.warning(f"Warning, self.median_col_name={self.median_col_name}")
 
         except Exception as get_median_error:
             raise get_median_error
 
+    def get_quantile(self, q: float) -> float:
+        """Method to get a quantile of the invoice values, e.g. 0.95 for the p95.
+
+        Args:
+            q (float): Given quantile, 0 <= q <= 1
+
+        Returns (float): With sketch_k an approximate quantile, see QuantileSketch for its error
+            bound, else the exact quantile of the stored invoices, linearly interpolated (same as
+            pd.Series.quantile), NaN if there are no invoices
+
+        Raises:
+            ValueError: If q is not within 0 and 1, or if invoices were restored from a snapshot,
+                their values are not held in the invoice buffer
+
+        """
+        try:
+            if self._quantile_sketch is not None:
+                return self._quantile_sketch.quantile(q=q) / self._value_scale
+
+            return exact_quantiles(
+                values=self._stored_invoice_values(), quantiles=[q], scale=self._value_scale
+            )[0]
+
+        except Exception as get_quantile_error:
+            raise get_quantile_error
+
+    def get_quantiles(
+        self, quantiles: Sequence[float] = DEFAULT_INVOICE_QUANTILES, row: int = 0
+    ) -> None:
+        """Method to get quantiles of the invoice values, together with their count, min, max and
+        standard deviation, and assign them to invoice stats columns.
+
+        Args:
+            quantiles (Sequence[float]): Given quantiles, 0 <= q <= 1, by default 0.25, 0.5, 0.75,
+                0.95 and 0.99
+            row (int): Given row to fetch
+
+        Raises:
+            ValueError: If a quantile is not within 0 and 1, or if invoices were restored from a
+                snapshot, their values are not held in the invoice buffer
+
+        Notes:
+            The columns invoice_count, invoice_min, invoice_max and invoice_std, and a column per
+            quantile named after its percentile (e.g. invoice_q95) are added to invoice_stats.
+            Except for the count, they are rounded like the mean and median.
+
+            The min, max and quantiles are selected by one partition of the invoice values, and
+            the sample standard deviation (same as pd.Series.std) takes one more pass. With
+            sketch_k they are read from the quantile sketch, the quantiles are approximate and the
+            min, max and standard deviation are exact. They are cached until the invoices change.
+
+        """
+        try:
+            self._get_stats(
+                columns=[
+                    *INVOICE_SUMMARY_COLUMN_NAMES.values(),
+                    *[quantile_column_name(quantile=quantile) for quantile in quantiles],
+                ],
+                row=row,
+                quantiles=quantiles,
+            )
+
+        except Exception as get_quantiles_error:
+            raise get_quantiles_error
+
+    def get_group_stats(self, name: str) -> Dict[str, float]:
+        """Method to get the stats of the invoices with an invoice name, O(1).
+
+        Args:
+            name (str): Given invoice name
+
+        Returns (Dict[str, float]): The invoice_count, invoice_mean and invoice_median of the
+            invoices with the name, the mean and median are not rounded
+
+        Raises:
+            ValueError: If the instance was created without group_stats
+            KeyError: If there are no invoices with the name
+
+        """
+        try:
+            return self._get_group_stats().get(name=name, scale=self._value_scale)
+
+        except Exception as group_stats_error:
+            raise group_stats_error
+
+    def get_all_group_stats(self) -> pd.DataFrame:
+        """Method to get the stats of the invoices per invoice name.
+
+        Returns (pd.DataFrame): One row per invoice name, indexed by invoice_name, with the
+            invoice_count, invoice_mean and invoice_median columns, O(number of names)
+
+        Raises:
+            ValueError: If the instance was created without group_stats
+
+        """
+        try:
+            return self._get_group_stats().to_frame(scale=self._value_scale)
+
+        except Exception as group_stats_error:
+            raise group_stats_error
+
     def get_mean(self, row: int = 0) -> None:
         """Method to get the mean value from the invoice values, and assign it to the mean
         invoice stats column.
@@ -155,16 +837,14 @@ class InvoiceStats:
         Args:
             row (int): Given row to fetch
 
+        Notes:
+            The mean is only computed, rounded and validated again once the invoices have changed
+            since it was last assigned to the row.
+
         """
         try:
             if self.mean_col_name is not None:
-
-                self._set_agg_value_invoice_values(
-                    row=row, column=self.mean_col_name, agg_type="mean",
-                )
-
-                self._round_down(column=self.mean_col_name)
-                self.invoice_stats_schema.validate(self.invoice_stats)
+                self._get_stats(columns=[self.mean_col_name], row=row)
 
             else:
                 LOGGER.warning(f"Warning, self.mean_col_name={self.mean_col_name}")
@@ -172,6 +852,319 @@ class InvoiceStats:
         except Exception as get_mean_error:
             raise get_mean_error
 
+    def get_stats(self, quantiles: Sequence[float] = (), row: int = 0) -> None:
+        """Method to get the mean and median of the invoice values, and optionally the summary
+        stats and quantiles of get_quantiles, at once, and assign them to invoice stats columns.
+
+        Args:
+            quantiles (Sequence[float]): Given quantiles, 0 <= q <= 1, if any are given the
+                count, min, max and standard deviation are assigned too, by default none
+            row (int): Given row to fetch
+
+        Raises:
+            ValueError: If a quantile is not within 0 and 1, or if invoices were restored from a
+                snapshot, their values are not held in the invoice buffer
+
+        Notes:
+            The stats that are not cached are computed together, the median, min, max and
+            quantiles by one selection over the invoice values when they are not held in running
+            aggregates, and the invoice stats are rounded and validated once. Dashboards that
+            poll the stats only pay for a computation when the invoices have changed.
+
+        """
+        columns = [self.mean_col_name, self.median_col_name]
+
+        if len(quantiles) > 0:
+            columns += [
+                *INVOICE_SUMMARY_COLUMN_NAMES.values(),
+                *[quantile_column_name(quantile=quantile) for quantile in quantiles],
+            ]
+
+        try:
+            self._get_stats(columns=columns, row=row, quantiles=quantiles)
+
+        except Exception as get_stats_error:
+            raise get_stats_error
+
+    def _get_stats(self, columns: List[str], row: int, quantiles: Sequence[float] = ()) -> None:
+        """Private method to assign stats to invoice stats columns, round and validate them, unless
+        they were already assigned to the row for the current version of the invoices.
+
+        Args:
+            columns (List[str]): Invoice stats columns of the stats
+            row (int): Given row
+            quantiles (Sequence[float]): Quantiles of the quantile columns, by default none
+
+        Notes:
+            Changes made to invoice_stats directly are not tracked, a row that is dropped is
+            assigned again.
+
+        """
+        if row in self.invoice_stats.index:
+            columns = [
+                column
+                for column in columns
+                if self._assigned_versions.get((row, column)) != self._version
+            ]
+
+            if len(columns) == 0:
+                return
+
+        with self._metrics.timer(name="aggregation"):
+            aggregates = self._get_aggregates(columns=columns, quantiles=quantiles)
+
+        for column in columns:
+            self.invoice_stats.at[row, column] = aggregates[column]
+
+        for column in columns:
+            if column != INVOICE_SUMMARY_COLUMN_NAMES.get("invoice_count"):
+                self._round_down(column=column)
+
+        self._get_invoice_stats_schema().validate(self.invoice_stats)
+
+        for column in columns:
+            self._assigned_versions[(row, column)] = self._version
+
+    def _get_aggregates(
+        self, columns: List[str], quantiles: Sequence[float] = ()
+    ) -> Dict[str, float]:
+        """Private method to get aggregates of the invoice values, from the cache when the
+        invoices have not changed since they were computed.
+
+        Args:
+            columns (List[str]): Invoice stats columns of the aggregates
+            quantiles (Sequence[float]): Quantiles of the quantile columns, by default none
+
+        Returns (Dict[str, float]): Aggregate per invoice stats column name, not rounded
+
+        """
+        if self._aggregates_version != self._version:
+            self._aggregates = {}
+            self._aggregates_version = self._version
+
+        missing_columns = [column for column in columns if column not in self._aggregates]
+
+        if len(missing_columns) > 0:
+            self._aggregates.update(
+                self._compute_aggregates(columns=missing_columns, quantiles=quantiles)
+            )
+
+        return {column: self._aggregates[column] for column in columns}
+
+    def _compute_aggregates(
+        self, columns: List[str], quantiles: Sequence[float] = ()
+    ) -> Dict[str, float]:
+        """Private method to compute aggregates of the invoice values, fused.
+
+        Args:
+            columns (List[str]): Invoice stats columns of the aggregates
+            quantiles (Sequence[float]): Quantiles of the quantile columns, by default none
+
+        Returns (Dict[str, float]): Aggregate per invoice stats column name, not rounded
+
+        Notes:
+            The count and mean are read from the running sum, and the median from the running
+            median or quantile sketch when there is one. The other order statistics, min, max,
+            quantiles and else the median, are selected together by one partition of the invoice
+            values, or read from the quantile sketch at once. A median on its own is selected
+            over chunks on median_workers threads.
+
+        """
+        count_col_name = INVOICE_SUMMARY_COLUMN_NAMES.get("invoice_count")
+        min_col_name = INVOICE_SUMMARY_COLUMN_NAMES.get("invoice_min")
+        max_col_name = INVOICE_SUMMARY_COLUMN_NAMES.get("invoice_max")
+        std_col_name = INVOICE_SUMMARY_COLUMN_NAMES.get("invoice_std")
+
+        aggregates = {}
+
+        if count_col_name in columns:
+            aggregates[count_col_name] = float(self.invoice_count)
+
+        if self.mean_col_name in columns:
+            aggregates[self.mean_col_name] = self._running_sum.mean(scale=self._value_scale)
+
+        # Order statistics that are selected from the invoice values, per column
+        selected_quantiles = {
+            column: quantile
+            for column, quantile in [
+                (min_col_name, 0.0),
+                *[(quantile_column_name(quantile=quantile), quantile) for quantile in quantiles],
+                (max_col_name, 1.0),
+            ]
+            if column in columns
+        }
+
+        if self.median_col_name in columns:
+            if self._quantile_sketch is not None:
+                aggregates[self.median_col_name] = self._quantile_sketch.median(
+                    scale=self._value_scale
+                )
+
+            elif self._running_median is not None:
+                aggregates[self.median_col_name] = self._running_median.median(
+                    scale=self._value_scale
+                )
+
+            elif len(selected_quantiles) == 0:
+                aggregates[self.median_col_name] = parallel_exact_median(
+                    values=self._invoice_buffer.values,
+                    scale=self._value_scale,
+                    workers=self.median_workers,
+                )
+
+            else:
+                selected_quantiles[self.median_col_name] = 0.5
+
+        if len(selected_quantiles) == 0 and std_col_name not in columns:
+            return aggregates
+
+        if self._quantile_sketch is not None:
+            selected_values = [
+                value / self._value_scale
+                for value in self._quantile_sketch.quantiles(qs=list(selected_quantiles.values()))
+            ]
+
+            if std_col_name in columns:
+                aggregates[std_col_name] = self._quantile_sketch.std(scale=self._value_scale)
+
+        else:
+            values = self._stored_invoice_values()
+            selected_values = (
+                exact_quantiles(
+                    values=values,
+                    quantiles=list(selected_quantiles.values()),
+                    scale=self._value_scale,
+                )
+                if len(selected_quantiles) > 0
+                else []
+            )
+
+            if std_col_name in columns:
+                aggregates[std_col_name] = (
+                    np.std(values, ddof=1).item() / self._value_scale
+                    if self.invoice_count > 1
+                    else float("nan")
+                )
+
+        aggregates.update(zip(selected_quantiles, selected_values))
+
+        return aggregates
+
+    def _get_invoice_stats_schema(self) -> pa.DataFrameSchema:
+        """Private method to get the schema of the invoice stats, with the summary and quantile
+        columns they hold.
+
+        Returns (pa.DataFrameSchema): The invoice stats schema, extended by the optional columns
+            once get_quantiles has assigned them
+
+        """
+        optional_columns = invoice_stats_optional_columns(columns=self.invoice_stats.columns)
+
+        if len(optional_columns) == 0:
+            return self.invoice_stats_schema
+
+        return create_invoice_stats_schema(optional_columns=optional_columns)
+
+    def _get_group_stats(self) -> GroupStats:
+        """Private method to get the group stats.
+
+        Returns (GroupStats): The aggregates per invoice name
+
+        Raises:
+            ValueError: If the instance was created without group_stats
+
+        """
+        if self._group_stats is None:
+            raise ValueError("Group stats are not kept, create InvoiceStats with group_stats=True")
+
+        return self._group_stats
+
+    def _stored_invoice_values(self) -> np.ndarray:
+        """Private method to get the invoice values the stats are computed over.
+
+        Returns (np.ndarray): View of the invoice values in the invoice buffer, with window_size a
+            copy of the values in the window
+
+        Raises:
+            ValueError: If invoices were restored from a snapshot, their values are not held in the
+                invoice buffer
+
+        """
+        if self._invoice_window is not None:
+            return self._invoice_window.values
+
+        if self.invoice_count != len(self._invoice_buffer):
+            raise ValueError(
+                f"Only {len(self._invoice_buffer)} of {self.invoice_count} invoice values are held "
+                f"in the invoice buffer, invoices restored from a snapshot are not"
+            )
+
+        return self._invoice_buffer.values
+
+    @property
+    def _bounded(self) -> bool:
+        """If the invoices are bound by the invoice limit, a sketch or a window does not store
+        them"""
+        return self.sketch_k is None and self.window_size is None
+
+    @property
+    def _nbytes(self) -> int:
+        """Number of bytes held by the invoice buffer, the quantile sketch and the window"""
+        nbytes = self._invoice_buffer.nbytes
+
+        if self._quantile_sketch is not None:
+            nbytes += self._quantile_sketch.nbytes
+
+        if self._invoice_window is not None:
+            nbytes += self._invoice_window.nbytes
+
+        return nbytes
+
+    def _append_invoices(self, invoices: pd.DataFrame) -> None:
+        """Private method to append validated invoices to the invoice buffer.
+
+        Args:
+            invoices (pd.DataFrame): Invoices that have been validated by the invoice schema
+
+        """
+        names = invoices[INVOICE_COLUMN_NAMES.get("invoice_name")].to_numpy(dtype=object)
+        values = invoices[INVOICE_COLUMN_NAMES.get("invoice_value")].to_numpy(
+            dtype=self._invoice_buffer.value_dtype
+        )
+
+        if self._quantile_sketch is not None:
+            self._quantile_sketch.extend(values=values)
+
+        elif self._invoice_window is not None:
+            # Only the most recent invoices of the batch fit in the window
+            values = values[-self._invoice_window.size :]
+            evicted_values = self._invoice_window.append(values=values)
+
+            self._running_sum.remove(values=evicted_values)
+
+            if self._running_median is not None:
+                self._running_median.remove(values=evicted_values)
+
+        else:
+            self._invoice_buffer.append(names=names, values=values)
+
+        self._running_sum.extend(values=values)
+
+        if self._group_stats is not None:
+            self._group_stats.extend(names=names, values=values)
+
+        if self._running_median is not None:
+            self._running_median.extend(values=values)
+
+        self._mark_changed()
+        self._set_storage_gauges()
+
+    def _set_storage_gauges(self) -> None:
+        """Private method to report the number of invoices and bytes held to the metrics"""
+        if self._metrics.enabled:
+            self._metrics.gauge(name="rows_held", value=self.invoice_count)
+            self._metrics.gauge(name="bytes_held", value=self._nbytes)
+
     def _round_down(self, column: str, round_up_limit: float = 0.5):
         """Method to round down column values based on np.floor
 
@@ -186,43 +1179,23 @@ class InvoiceStats:
             3.5     ->  3.0
             3.5     ->  3.0
             3.6     ->  4.0
+            NaN     ->  NaN
 
         Notes:
-            math.modf(x)[0] returns the fractional value -> 3.5 -> 0.5
-
-        """
-        self.invoice_stats[column] = self.invoice_stats[column].apply(
-            lambda x: np.ceil(x) if math.modf(x)[0] > round_up_limit else np.floor(x)
-        )
-
-    def _set_agg_value_invoice_values(self, row: int, column: str, agg_type: str) -> None:
-        """Simple private method to set the given agg_type column value from the invoice_values,
-        in memory.
-
-        Args:
-            row ():
-            column (str):
-            agg_type (str):
-
-        Notes:
-            Utilises pd.at[row_index, col_name] to access a single value for a row/column label
-            pair (https://pandas.pydata.org/pandas-docs/stable/reference/api/pandas.DataFrame.at.html)
+            np.modf(x)[0] returns the fractional values -> 3.5 -> 0.5, the whole column is rounded
+            with vectorized NumPy operations. For a fraction > 0 np.floor(x) + 1 == np.ceil(x),
+            and NaN stays NaN since NaN > round_up_limit is False.
 
         """
-        try:
+        values = self.invoice_stats[column].to_numpy(dtype=np.float64)
+        fractions, _ = np.modf(values)
 
-            if agg_type == "mean":
-                self.invoice_stats.at[row, column] = self.invoices[
-                    INVOICE_COLUMN_NAMES.get("invoice_value")
-                ].mean()
+        rounded = np.floor(values)
+        np.add(rounded, 1.0, out=rounded, where=fractions > round_up_limit)
 
-            elif agg_type == "median":
-                self.invoice_stats.at[row, column] = self.invoices[
-                    INVOICE_COLUMN_NAMES.get("invoice_value")
-                ].median()
-
-            else:
-                LOGGER.warning(f"Warning! agg_type not supported: {agg_type}")
+        self.invoice_stats[column] = rounded
 
-        except Exception as agg_warning:
-            raise agg_warning
+    def _mark_changed(self) -> None:
+        """Private method to bump the version of the invoices after a change, the cached
+        aggregates and assigned invoice stats are computed again when they are next fetched"""
+        self._version += 1
@@ -15,4 +15,54 @@ INVOICE_STATS_COLUMN_NAMES: Dict[str, str] = {
     "invoice_median": "invoice_median",
 }
 
+# Columns added to the invoice stats by get_quantiles, together with a column per quantile named
+# INVOICE_QUANTILE_COLUMN_PREFIX + percentile, e.g. invoice_q95
+INVOICE_SUMMARY_COLUMN_NAMES: Dict[str, str] = {
+    "invoice_count": "invoice_count",
+    "invoice_min": "invoice_min",
+    "invoice_max": "invoice_max",
+    "invoice_std": "invoice_std",
+}
+INVOICE_QUANTILE_COLUMN_PREFIX = "invoice_q"
+DEFAULT_INVOICE_QUANTILES = (0.25, 0.5, 0.75, 0.95, 0.99)
+
 INVOICE_ROW_DATA_INPUT_TYPE = Dict[str, Union[str, int, float, Decimal]]
+
+# Minor units (cents) per unit of an invoice value, used by the fixed-point storage mode
+CENTS_PER_UNIT = 100
+
+# Number of rows the invoice buffer is preallocated with, it then grows by doubling
+INVOICE_BUFFER_INITIAL_CAPACITY = 1024
+
+# A running median is rebuilt from all its values, instead of pushing value by value, when a batch
+# is at least 1 / RUNNING_MEDIAN_REBUILD_FACTOR of the values it already holds
+RUNNING_MEDIAN_REBUILD_FACTOR = 8
+
+# Number of rows read, validated and inserted at a time when invoices are read from a file
+INVOICE_FILE_CHUNKSIZE = 100000
+
+# Validation backends of InvoiceStats: pandera, the reference, or the NumPy checks compiled from
+# the same schema
+VALIDATION_BACKENDS = ("pandera", "numpy")
+
+# Batches with fewer rows are validated serially, even if validation workers are configured
+PARALLEL_VALIDATION_MIN_ROWS = 100000
+
+# Fewer values than this are selected on a single core, the median is not worth splitting up
+PARALLEL_MEDIAN_MIN_ROWS = 1000000
+
+# Number of values sampled to narrow down the median to a band of candidate values
+PARALLEL_MEDIAN_SAMPLE_SIZE = 65536
+
+# Accuracy parameter of the quantile sketch, its rank error is about 1.3% with probability 99%
+QUANTILE_SKETCH_K = 200
+
+# An AsyncInvoiceStats batch is added once it holds this many invoices, or once its first invoice
+# has waited this many seconds, submit waits while this many invoices are queued
+ASYNC_MAX_BATCH_SIZE = 10000
+ASYNC_MAX_LATENCY = 0.05
+ASYNC_MAX_QUEUE_SIZE = 100000
+
+# Number of schemas kept per schema function, one per combination of limits and flags, so new
+# InvoiceStats instances share their schemas instead of building them again
+SCHEMA_CACHE_SIZE = 128
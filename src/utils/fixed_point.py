@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from src.utils.constants import CENTS_PER_UNIT
+from src.utils.lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pandera as pa
+else:
+    pd = lazy_import("pandas")
+    pa = lazy_import("pandera")
+
+
+def to_cents(values: pd.Series, schema: pa.DataFrameSchema) -> np.ndarray:
+    """Function to convert invoice values to minor units (cents).
+
+    Args:
+        values (pd.Series): Given invoice values, as Decimal, float, int or str
+        schema (pa.DataFrameSchema): Invoice schema the values are validated against next, it is
+            part of the error raised for values that are not numbers
+
+    Returns (np.ndarray): int64 array of whole cents
+
+    Raises:
+        SchemaError: If a value is null or can not be parsed to a number
+
+    Notes:
+        Decimal, str and other object values are parsed to Decimal and rounded half up to whole
+        cents, so Decimal("1.005") becomes 101 cents. Numeric columns are converted vectorized,
+        float64 represents every amount up to 2^53 cents exactly, and they are rounded half to
+        even, a float holds no exact half cent anyway.
+
+    """
+    if pd.api.types.is_numeric_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype):
+        cents = np.rint(values.to_numpy(dtype=np.float64) * CENTS_PER_UNIT)
+    else:
+        cents = np.array([_parse_cents(value=value) for value in values.tolist()], dtype=np.float64)
+
+    failure_mask = ~np.isfinite(cents)
+
+    if failure_mask.any():
+        failures = values[failure_mask]
+        raise pa.errors.SchemaError(
+            schema=schema,
+            data=values.to_frame(),
+            message=(
+                f"series '{values.name}' holds values that can not be converted to cents, failure "
+                f"cases: {', '.join(map(str, failures))}"
+            ),
+            failure_cases=pd.DataFrame(
+                {"index": failures.index, "failure_case": failures.to_numpy()}
+            ),
+        )
+
+    return cents.astype(np.int64)
+
+
+def to_cents_limit(value: Decimal) -> int:
+    """Function to convert an invoice value limit to minor units (cents).
+
+    Args:
+        value (Decimal): Given invoice value limit
+
+    Returns (int): The limit in whole cents
+
+    """
+    return int(value * CENTS_PER_UNIT)
+
+
+def _parse_cents(value: object) -> float:
+    """Function to parse an invoice value to whole cents, rounded half up.
+
+    Args:
+        value (object): Given invoice value, e.g. a Decimal or str
+
+    Returns (float): The whole cents, NaN if the value is null or not a finite number
+
+    """
+    try:
+        amount = value if isinstance(value, Decimal) else Decimal(str(value).strip())
+    except (InvalidOperation, TypeError, ValueError):
+        return float("nan")
+
+    if not amount.is_finite():
+        return float("nan")
+
+    return float((amount * CENTS_PER_UNIT).quantize(Decimal(1), rounding=ROUND_HALF_UP))
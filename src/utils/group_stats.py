@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+import numpy as np
+
+from src.utils.constants import (
+    INVOICE_COLUMN_NAMES,
+    INVOICE_STATS_COLUMN_NAMES,
+    INVOICE_SUMMARY_COLUMN_NAMES,
+)
+from src.utils.invoice_name_index import InvoiceNameIndex
+from src.utils.lazy_import import lazy_import
+from src.utils.running_median import RunningMedian
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_import("pandas")
+
+
+class GroupStats:
+    """Count, sum and running median of the invoice values per invoice name.
+
+    The names are interned in an InvoiceNameIndex, a hash index from name to a group code. The
+    count and sum of every group are kept in NumPy arrays indexed by the code, and the median in a
+    RunningMedian per group, so the stats of a group are looked up in O(1).
+
+    """
+
+    def __init__(self, value_dtype: type = np.float64) -> None:
+        """GroupStats constructor.
+
+        Args:
+            value_dtype (type): dtype of the invoice values, np.int64 when they are cents, the sums
+                of integer values are exact
+
+        """
+        self.value_dtype = value_dtype
+        self.name_index = InvoiceNameIndex()
+
+        self._counts = np.zeros(0, dtype=np.int64)
+        self._sums = np.zeros(0, dtype=self.value_dtype)
+        self._medians: List[RunningMedian] = []
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self._counts))
+
+    def extend(self, names: np.ndarray, values: np.ndarray) -> None:
+        """Method to add a batch of invoices to their groups.
+
+        Args:
+            names (np.ndarray): Invoice names
+            values (np.ndarray): Invoice values, same length as names
+
+        Notes:
+            The batch is sorted by group code once, then the counts and sums of all its groups are
+            updated vectorized, and the running median of every group in the batch is extended
+            with the values of the group.
+
+        """
+        if values.shape[0] == 0:
+            return
+
+        codes = self.name_index.encode(names=names)
+        self._reserve(group_count=len(self.name_index))
+
+        batch_codes, starts, sorted_values = self._sort_by_group(codes=codes, values=values)
+
+        self._counts[batch_codes] += np.diff(np.r_[starts, sorted_values.shape[0]])
+        self._sums[batch_codes] += np.add.reduceat(sorted_values, starts)
+
+        for code, group_values in zip(batch_codes.tolist(), np.split(sorted_values, starts[1:])):
+            self._medians[code].extend(values=group_values)
+
+    def remove(self, names: np.ndarray, values: np.ndarray) -> None:
+        """Method to remove a batch of invoices from their groups.
+
+        Args:
+            names (np.ndarray): Invoice names
+            values (np.ndarray): Invoice values, same length as names, every invoice must have
+                been added before
+
+        Notes:
+            The counts and sums are updated vectorized like in extend, and every value is removed
+            from the running median of its group, O(log n) per invoice. A group without invoices
+            is kept, but it is not returned by get or to_frame.
+
+        """
+        if values.shape[0] == 0:
+            return
+
+        codes = self.name_index.encode(names=names)
+        self._reserve(group_count=len(self.name_index))
+
+        batch_codes, starts, sorted_values = self._sort_by_group(codes=codes, values=values)
+
+        self._counts[batch_codes] -= np.diff(np.r_[starts, sorted_values.shape[0]])
+        self._sums[batch_codes] -= np.add.reduceat(sorted_values, starts)
+
+        for code, group_values in zip(batch_codes.tolist(), np.split(sorted_values, starts[1:])):
+            self._medians[code].remove(values=group_values)
+
+    def get(self, name: str, scale: int = 1) -> Dict[str, float]:
+        """Method to get the stats of a group, O(1).
+
+        Args:
+            name (str): Invoice name of the group
+            scale (int): The mean and median are divided by scale, e.g. 100 to get units from cents
+
+        Returns (Dict[str, float]): The invoice_count, invoice_mean and invoice_median of the group
+
+        Raises:
+            KeyError: If there are no invoices with the name
+
+        """
+        code = self.name_index.get_code(name=name)
+
+        if code is None or self._counts[code] == 0:
+            raise KeyError(f"No invoices with invoice_name={name}")
+
+        return self._group(code=code, scale=scale)
+
+    def to_frame(self, scale: int = 1) -> pd.DataFrame:
+        """Method to get the stats of all groups.
+
+        Args:
+            scale (int): The mean and median are divided by scale, e.g. 100 to get units from cents
+
+        Returns (pd.DataFrame): One row per invoice name, with the invoice_count, invoice_mean
+            and invoice_median columns
+
+        """
+        codes = np.flatnonzero(self._counts).tolist()
+
+        return pd.DataFrame(
+            [self._group(code=code, scale=scale) for code in codes],
+            index=pd.Index(
+                [self.name_index.names[code] for code in codes],
+                name=INVOICE_COLUMN_NAMES.get("invoice_name"),
+            ),
+            columns=[
+                INVOICE_SUMMARY_COLUMN_NAMES.get("invoice_count"),
+                INVOICE_STATS_COLUMN_NAMES.get("invoice_mean"),
+                INVOICE_STATS_COLUMN_NAMES.get("invoice_median"),
+            ],
+        )
+
+    def clear(self) -> None:
+        """Method to drop all groups"""
+        self.name_index.clear()
+        self._counts = np.zeros(0, dtype=np.int64)
+        self._sums = np.zeros(0, dtype=self.value_dtype)
+        self._medians = []
+
+    def _group(self, code: int, scale: int) -> Dict[str, float]:
+        """Private method to get the stats of a group by its code.
+
+        Args:
+            code (int): Code of the group
+            scale (int): The mean and median are divided by scale
+
+        Returns (Dict[str, float]): The invoice_count, invoice_mean and invoice_median of the group
+
+        """
+        count = self._counts[code].item()
+        mean = self._sums[code].item() / (count * scale)
+
+        return {
+            INVOICE_SUMMARY_COLUMN_NAMES["invoice_count"]: count,
+            INVOICE_STATS_COLUMN_NAMES["invoice_mean"]: mean,
+            INVOICE_STATS_COLUMN_NAMES["invoice_median"]: self._medians[code].median(scale=scale),
+        }
+
+    def _sort_by_group(
+        self, codes: np.ndarray, values: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Private method to sort a batch of invoices by group code.
+
+        Args:
+            codes (np.ndarray): Group codes of the invoices
+            values (np.ndarray): Invoice values
+
+        Returns (Tuple[np.ndarray, np.ndarray, np.ndarray]): The codes of the groups in the batch,
+            the start of every group and the values sorted by group
+
+        """
+        order = np.argsort(codes, kind="stable")
+        sorted_codes = codes[order]
+        sorted_values = values[order].astype(self.value_dtype, copy=False)
+
+        starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+
+        return sorted_codes[starts], starts, sorted_values
+
+    def _reserve(self, group_count: int) -> None:
+        """Private method to make sure the aggregates can hold group_count groups.
+
+        Args:
+            group_count (int): Number of groups
+
+        """
+        new_group_count = group_count - self._counts.shape[0]
+
+        if new_group_count <= 0:
+            return
+
+        self._counts = np.concatenate([self._counts, np.zeros(new_group_count, dtype=np.int64)])
+        self._sums = np.concatenate([self._sums, np.zeros(new_group_count, dtype=self.value_dtype)])
+        self._medians.extend(RunningMedian() for _ in range(new_group_count))
@@ -0,0 +1,385 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.utils.constants import INVOICE_BUFFER_INITIAL_CAPACITY, INVOICE_COLUMN_NAMES
+from src.utils.invoice_name_index import InvoiceNameIndex
+from src.utils.lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_import("pandas")
+
+
+class InvoiceBuffer:
+    """Columnar, preallocated storage for invoices.
+
+    Every column is kept in its own NumPy array, which is grown by doubling its capacity, so
+    appending a batch of k rows is amortized O(k) instead of copying the whole table. Invoice
+    names are dictionary encoded, the column holds int32 codes into an InvoiceNameIndex.
+
+    Every invoice gets a stable id, its position in the order the invoices were appended.
+    Deleted invoices are only marked in a mask (tombstones), and they are compacted away once the
+    buffer would otherwise exceed its capacity_limit, the ids are kept in their own column from
+    then on.
+
+    """
+
+    def __init__(
+        self,
+        capacity_limit: int,
+        initial_capacity: int = INVOICE_BUFFER_INITIAL_CAPACITY,
+        value_dtype: type = np.float64,
+    ) -> None:
+        """InvoiceBuffer constructor.
+
+        Args:
+            capacity_limit (int): Maximal number of rows the buffer can hold
+            initial_capacity (int): Number of rows to preallocate, capped by capacity_limit
+            value_dtype (type): dtype of the invoice values, np.int64 when they are stored as
+                cents
+
+        """
+        self.capacity_limit = capacity_limit
+        self.initial_capacity = min(initial_capacity, capacity_limit)
+        self.value_dtype = value_dtype
+
+        self.name_index = InvoiceNameIndex()
+
+        self._name_codes = np.empty(self.initial_capacity, dtype=np.int32)
+        self._values = np.empty(self.initial_capacity, dtype=self.value_dtype)
+        self._size = 0
+        self._frame: Optional[pd.DataFrame] = None
+
+        # Deletion state, the columns are only allocated on the first delete and compaction
+        self._deleted: Optional[np.ndarray] = None
+        self._deleted_count = 0
+        self._ids: Optional[np.ndarray] = None
+        self._next_id = 0
+
+        # Ids of the invoices per name code, built by find for the rows appended since its last
+        # call, they can hold ids of deleted invoices until the next compaction
+        self._name_ids: Dict[int, List[np.ndarray]] = {}
+        self._name_ids_size = 0
+
+    def __len__(self) -> int:
+        return self._size - self._deleted_count
+
+    @property
+    def capacity(self) -> int:
+        """Number of rows that can be held before the columns need to grow"""
+        return self._values.shape[0]
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes held by the columns, including the capacity that is not used yet"""
+        nbytes = self._name_codes.nbytes + self._values.nbytes
+
+        for column in (self._deleted, self._ids):
+            if column is not None:
+                nbytes += column.nbytes
+
+        return nbytes
+
+    @property
+    def ids(self) -> np.ndarray:
+        """The ids of the stored invoices"""
+        if self._ids is None:
+            return self._held(column=np.arange(self._size, dtype=np.int64))
+
+        return self._held(column=self._ids[: self._size])
+
+    @property
+    def names(self) -> np.ndarray:
+        """The stored invoice names, decoded from the name index"""
+        return self.name_index.decode(codes=self.name_codes)
+
+    @property
+    def name_codes(self) -> np.ndarray:
+        """View of the stored invoice name codes, a copy if invoices have been deleted"""
+        return self._held(column=self._name_codes[: self._size])
+
+    @property
+    def values(self) -> np.ndarray:
+        """View of the stored invoice values, a copy if invoices have been deleted"""
+        return self._held(column=self._values[: self._size])
+
+    def append(self, names: np.ndarray, values: np.ndarray) -> None:
+        """Method to append a batch of invoices at the end of the buffer.
+
+        Args:
+            names (np.ndarray): Invoice names
+            values (np.ndarray): Invoice values, same length as names
+
+        Raises:
+            ValueError: If the batch would exceed the capacity_limit
+
+        """
+        row_count = values.shape[0]
+
+        if self._size + row_count > self.capacity_limit and self._deleted_count > 0:
+            self._compact()
+
+        new_size = self._size + row_count
+
+        if new_size > self.capacity_limit:
+            raise ValueError(
+                f"Cannot append {row_count} invoices, buffer holds {len(self)} of "
+                f"{self.capacity_limit} invoices"
+            )
+
+        codes = self.name_index.encode(names=names)
+
+        self._reserve(size=new_size)
+        self._name_codes[self._size : new_size] = codes
+        self._values[self._size : new_size] = values
+
+        if self._ids is not None:
+            self._ids[self._size : new_size] = np.arange(
+                self._next_id, self._next_id + row_count, dtype=np.int64
+            )
+
+        self._size = new_size
+        self._next_id += row_count
+        self._frame = None
+
+    def delete(self, ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Method to delete invoices by id, O(k) or O(k log n) once the buffer has been compacted.
+
+        Args:
+            ids (np.ndarray): Ids of the invoices, see the ids property
+
+        Returns (Tuple[np.ndarray, np.ndarray]): The names and values of the deleted invoices
+
+        Raises:
+            KeyError: If an id is not a stored invoice, nothing is deleted then
+            ValueError: If an id is given more than once
+
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+
+        if np.unique(ids).shape[0] != ids.shape[0]:
+            raise ValueError(f"Invoice ids are given more than once: {ids.tolist()}")
+
+        positions, found = self._find_positions(ids=ids)
+
+        if not found.all():
+            raise KeyError(f"No invoices with invoice ids {ids[~found].tolist()}")
+
+        if self._deleted is None:
+            self._deleted = np.zeros(self.capacity, dtype=bool)
+
+        names = self.name_index.decode(codes=self._name_codes[positions])
+        values = self._values[positions]
+
+        self._deleted[positions] = True
+        self._deleted_count += positions.shape[0]
+        self._frame = None
+
+        return names, values
+
+    def find(self, names: Sequence[str]) -> np.ndarray:
+        """Method to get the ids of the stored invoices with any of the given names, O(k log k)
+        for k invoices with the names.
+
+        Args:
+            names (Sequence[str]): Given invoice names
+
+        Returns (np.ndarray): Ids of the invoices, in the order they were appended
+
+        Notes:
+            The names are looked up in the name index, and the ids of their codes are read from
+            the ids per name code. The rows appended since the previous find are added to them
+            first, so a find costs O(m) for the m rows appended since.
+
+        """
+        self._index_name_ids()
+
+        ids_per_code = []
+        for name in names:
+            code = self.name_index.get_code(name=name)
+
+            if code is not None and code in self._name_ids:
+                code_ids = self._name_ids[code]
+
+                if len(code_ids) > 1:
+                    code_ids[:] = [np.concatenate(code_ids)]
+
+                ids_per_code.append(code_ids[0])
+
+        if len(ids_per_code) == 0:
+            return np.empty(0, dtype=np.int64)
+
+        ids = np.unique(np.concatenate(ids_per_code))
+        _, found = self._find_positions(ids=ids)
+
+        return ids[found]
+
+    def clear(self) -> None:
+        """Method to drop all rows, and release the memory held by the columns"""
+        self.name_index.clear()
+        self._name_codes = np.empty(self.initial_capacity, dtype=np.int32)
+        self._values = np.empty(self.initial_capacity, dtype=self.value_dtype)
+        self._size = 0
+        self._frame = None
+        self._deleted = None
+        self._deleted_count = 0
+        self._ids = None
+        self._next_id = 0
+        self._name_ids = {}
+        self._name_ids_size = 0
+
+    def to_frame(self) -> pd.DataFrame:
+        """Method to get the stored invoices as a pd.DataFrame.
+
+        Returns (pd.DataFrame): DataFrame built on top of a view of the invoice values, with the
+            invoice names decoded to an object column, so it follows the invoice schema, e.g. for
+            validate_all. It is cached until the buffer is changed. Once invoices have been
+            deleted, the index holds the invoice ids.
+
+        """
+        if self._frame is None:
+            index = self.ids if self._deleted_count > 0 or self._ids is not None else None
+            self._frame = pd.DataFrame(
+                {
+                    INVOICE_COLUMN_NAMES.get("invoice_name"): pd.Series(
+                        self.names, index=index, dtype=object
+                    ),
+                    INVOICE_COLUMN_NAMES.get("invoice_value"): self.values,
+                },
+                index=index,
+                copy=False,
+            )
+
+        return self._frame
+
+    def _reserve(self, size: int) -> None:
+        """Method to make sure the columns can hold size rows, the capacity is doubled until it
+        fits (amortized O(1) per row), but never beyond the capacity_limit.
+
+        Args:
+            size (int): Number of rows the columns need to hold
+
+        """
+        capacity = self.capacity
+
+        if size <= capacity:
+            return
+
+        capacity = max(capacity, 1)
+        while capacity < size:
+            capacity *= 2
+
+        capacity = min(capacity, self.capacity_limit)
+
+        name_codes = np.empty(capacity, dtype=np.int32)
+        name_codes[: self._size] = self._name_codes[: self._size]
+        values = np.empty(capacity, dtype=self.value_dtype)
+        values[: self._size] = self._values[: self._size]
+
+        self._name_codes = name_codes
+        self._values = values
+
+        if self._deleted is not None:
+            deleted = np.zeros(capacity, dtype=bool)
+            deleted[: self._size] = self._deleted[: self._size]
+            self._deleted = deleted
+
+        if self._ids is not None:
+            ids = np.empty(capacity, dtype=np.int64)
+            ids[: self._size] = self._ids[: self._size]
+            self._ids = ids
+
+    def _held(self, column: np.ndarray) -> np.ndarray:
+        """Private method to drop the deleted invoices from a column.
+
+        Args:
+            column (np.ndarray): The first size rows of a column
+
+        Returns (np.ndarray): The column itself if no invoices are deleted, else a copy of the
+            rows that are held
+
+        """
+        if self._deleted is None or self._deleted_count == 0:
+            return column
+
+        return column[~self._deleted[: self._size]]
+
+    def _find_positions(self, ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Private method to get the positions of invoice ids in the columns.
+
+        Args:
+            ids (np.ndarray): Given ids
+
+        Returns (Tuple[np.ndarray, np.ndarray]): The position of every id, and a mask of the ids
+            that are stored invoices, positions outside the mask are not meaningful
+
+        Notes:
+            Until the first compaction the id of an invoice is its position. After it the ids
+            column is sorted, since ids are increasing, and the ids are binary searched.
+
+        """
+        if self._ids is None:
+            positions = ids
+        else:
+            positions = np.searchsorted(self._ids[: self._size], ids)
+
+        found = (positions >= 0) & (positions < self._size)
+        positions = np.where(found, positions, 0)
+
+        if self._ids is not None:
+            found &= self._ids[positions] == ids
+
+        if self._deleted is not None:
+            found &= ~self._deleted[positions]
+
+        return positions, found
+
+    def _compact(self) -> None:
+        """Private method to drop the deleted invoices from the columns, O(n), the held invoices
+        keep their ids."""
+        ids = self.ids
+        held_count = ids.shape[0]
+
+        self._name_codes[:held_count] = self.name_codes
+        self._values[:held_count] = self.values
+
+        if self._ids is None:
+            self._ids = np.empty(self.capacity, dtype=np.int64)
+
+        self._ids[:held_count] = ids
+
+        if self._deleted is not None:
+            self._deleted[:] = False
+
+        self._deleted_count = 0
+        self._size = held_count
+        self._frame = None
+
+        # The ids per name code are built again from the held invoices by the next find
+        self._name_ids = {}
+        self._name_ids_size = 0
+
+    def _index_name_ids(self) -> None:
+        """Private method to add the rows appended since the previous call to the ids per name
+        code, O(m log m) for m rows."""
+        if self._name_ids_size == self._size:
+            return
+
+        codes = self._name_codes[self._name_ids_size : self._size]
+        ids = (
+            np.arange(self._name_ids_size, self._size, dtype=np.int64)
+            if self._ids is None
+            else self._ids[self._name_ids_size : self._size]
+        )
+
+        order = np.argsort(codes, kind="stable")
+        unique_codes, starts = np.unique(codes[order], return_index=True)
+
+        for code, code_ids in zip(unique_codes.tolist(), np.split(ids[order], starts[1:])):
+            self._name_ids.setdefault(code, []).append(code_ids)
+
+        self._name_ids_size = self._size
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING, Iterator, Optional
+
+from src.utils.constants import INVOICE_COLUMN_NAMES
+from src.utils.lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_import("pandas")
+
+INVOICE_FILE_FORMATS = {".csv": "csv", ".parquet": "parquet", ".pq": "parquet"}
+
+
+def read_invoice_file(
+    path: str, chunksize: int, file_format: Optional[str] = None
+) -> Iterator[pd.DataFrame]:
+    """Function to read invoices from a CSV or Parquet file, chunksize rows at a time.
+
+    Args:
+        path (str): Path to the file
+        chunksize (int): Number of rows per chunk
+        file_format (Optional[str]): "csv" or "parquet", by default inferred from the file
+            extension
+
+    Returns (Iterator[pd.DataFrame]): The invoices, chunk by chunk, only the invoice columns are
+        read so a chunk can be validated directly against the invoice schema
+
+    Raises:
+        ValueError: If the file format is not supported
+        ImportError: If a Parquet file is read without pyarrow installed
+
+    """
+    if file_format is None:
+        file_format = INVOICE_FILE_FORMATS.get(os.path.splitext(path)[1].lower())
+
+    columns = list(INVOICE_COLUMN_NAMES.values())
+
+    if file_format == "csv":
+        yield from pd.read_csv(
+            path,
+            chunksize=chunksize,
+            usecols=columns,
+            dtype={INVOICE_COLUMN_NAMES.get("invoice_name"): str},
+        )
+
+    elif file_format == "parquet":
+        try:
+            import pyarrow.parquet as pq
+
+        except ImportError as import_error:
+            raise ImportError(
+                "pyarrow is required to read invoices from Parquet files"
+            ) from import_error
+
+        for record_batch in pq.ParquetFile(path).iter_batches(
+            batch_size=chunksize, columns=columns
+        ):
+            yield record_batch.to_pandas()
+
+    else:
+        raise ValueError(f"File format not supported: {file_format}, path: {path}")
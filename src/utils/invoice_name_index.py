@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+import numpy as np
+
+from src.utils.lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_import("pandas")
+
+
+class InvoiceNameIndex:
+    """Interning table of invoice names, every distinct name gets a stable int32 code.
+
+    Columns then only store the codes, and a name is held once however many invoices share it.
+    Codes are assigned in order of first appearance and never change, so existing codes are reused
+    on insert and the stored codes never need to be re-encoded.
+
+    """
+
+    def __init__(self, names: Optional[List[str]] = None) -> None:
+        """InvoiceNameIndex constructor.
+
+        Args:
+            names (Optional[List[str]]): Names to start with, the position of a name is its code
+
+        """
+        self.names: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+        for name in names or []:
+            self._add(name=name)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def encode(self, names: np.ndarray) -> np.ndarray:
+        """Method to get the codes of names, new names are added to the index.
+
+        Args:
+            names (np.ndarray): Invoice names
+
+        Returns (np.ndarray): int32 codes of the names
+
+        Notes:
+            pd.factorize hashes the names once, so only the distinct names of the batch are looked
+            up in the index.
+
+        """
+        batch_codes, batch_names = pd.factorize(names)
+
+        unique_codes = np.array(
+            [
+                self._codes[name] if name in self._codes else self._add(name=name)
+                for name in batch_names.tolist()
+            ],
+            dtype=np.int32,
+        )
+
+        return unique_codes[batch_codes]
+
+    def get_code(self, name: str) -> Optional[int]:
+        """Method to get the code of a name, O(1).
+
+        Args:
+            name (str): Given name
+
+        Returns (Optional[int]): The code, None if the name is not in the index
+
+        """
+        return self._codes.get(name)
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """Method to get the names of codes.
+
+        Args:
+            codes (np.ndarray): Given codes
+
+        Returns (np.ndarray): object array of the names
+
+        """
+        return np.asarray(self.names, dtype=object)[codes]
+
+    def clear(self) -> None:
+        """Method to drop all names"""
+        self.names = []
+        self._codes = {}
+
+    def _add(self, name: str) -> int:
+        """Private method to add a name to the index.
+
+        Args:
+            name (str): Given name
+
+        Returns (int): The code of the name
+
+        """
+        code = len(self.names)
+
+        self._codes[name] = code
+        self.names.append(name)
+
+        return code
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import TYPE_CHECKING, Dict, Optional, Union
+
+from src.utils.constants import INVOICE_COLUMN_NAMES, VALIDATION_BACKENDS
+from src.utils.fixed_point import to_cents
+from src.utils.lazy_import import lazy_import
+from src.utils.parallel_validation import ParallelValidator
+from src.utils.schemas.invoice import create_invoice_cents_schema, create_invoice_schema
+from src.utils.schemas.numpy_validator import NumpyValidator
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pandera as pa
+else:
+    pd = lazy_import("pandas")
+    pa = lazy_import("pandera")
+
+
+class InvoiceValidator:
+    """InvoiceValidator class, converts and validates incoming invoices against the invoice
+    schema, the same way for InvoiceStats and ConcurrentInvoiceStats."""
+
+    def __init__(
+        self,
+        max_invoice_value: Decimal,
+        min_invoice_value: Decimal,
+        fixed_point: bool = False,
+        validation_backend: str = "pandera",
+        validation_workers: int = 1,
+    ) -> None:
+        """InvoiceValidator constructor.
+
+        Args:
+            max_invoice_value (Decimal): Given max invoice value
+            min_invoice_value (Decimal): Given min invoice value
+            fixed_point (bool): If True the invoice values are converted to int64 cents, and
+                validated against the cents schema, by default False
+            validation_backend (str): pandera, or numpy to validate the invoices with NumPy checks
+                compiled from the same schema, see NumpyValidator, by default pandera
+            validation_workers (int): If above 1 large batches are split into chunks that are
+                validated by this many worker processes, kept until close is called, by default 1
+
+        Raises:
+            ValueError: If the validation backend is unknown
+
+        """
+        if validation_backend not in VALIDATION_BACKENDS:
+            raise ValueError(
+                f"validation_backend={validation_backend} is not one of {VALIDATION_BACKENDS}"
+            )
+
+        self.fixed_point = fixed_point
+        self.validation_backend = validation_backend
+        self.validation_workers = validation_workers
+
+        schema_factory = create_invoice_cents_schema if self.fixed_point else create_invoice_schema
+        schema_arguments: Dict[str, object] = {
+            "max_invoice_value": max_invoice_value,
+            "min_invoice_value": min_invoice_value,
+        }
+        self.invoice_schema = schema_factory(**schema_arguments)
+        self.validator: Union[pa.DataFrameSchema, NumpyValidator] = (
+            NumpyValidator(schema=self.invoice_schema)
+            if self.validation_backend == "numpy"
+            else self.invoice_schema
+        )
+
+        # Pool of worker processes validating large batches, kept until close is called
+        self._parallel_validator: Optional[ParallelValidator] = (
+            ParallelValidator(
+                schema_factory=schema_factory,
+                schema_arguments=schema_arguments,
+                validation_backend=self.validation_backend,
+                workers=self.validation_workers,
+            )
+            if self.validation_workers > 1
+            else None
+        )
+
+    def convert(self, invoices: pd.DataFrame) -> pd.DataFrame:
+        """Method to convert the invoice values to cents, when fixed_point is set.
+
+        Args:
+            invoices (pd.DataFrame): Given invoices
+
+        Returns (pd.DataFrame): The invoices, with int64 cents values when fixed_point is set
+
+        Raises:
+            SchemaError: If an invoice value cannot be converted to cents
+
+        """
+        if not self.fixed_point:
+            return invoices
+
+        value_column = INVOICE_COLUMN_NAMES["invoice_value"]
+
+        return invoices.assign(
+            **{value_column: to_cents(values=invoices[value_column], schema=self.invoice_schema)}
+        )
+
+    def validate(self, invoices: pd.DataFrame) -> pd.DataFrame:
+        """Method to validate invoices against the invoice schema, with the validation backend,
+        in parallel when validation workers are configured.
+
+        Args:
+            invoices (pd.DataFrame): Given invoices, converted
+
+        Returns (pd.DataFrame): The validated invoices
+
+        """
+        if self._parallel_validator is not None:
+            return self._parallel_validator.validate(invoices=invoices)
+
+        return self.validator.validate(invoices)
+
+    def close(self) -> None:
+        """Method to shut down the worker processes of the parallel validation, a later
+        validation starts them again."""
+        if self._parallel_validator is not None:
+            self._parallel_validator.close()
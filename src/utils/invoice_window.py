@@ -0,0 +1,101 @@
+import numpy as np
+
+
+class InvoiceWindow:
+    """Ring buffer of the most recent invoice values.
+
+    The values are kept in a preallocated NumPy array of the window size, new values are written
+    over the oldest ones once it is full, so the memory is bounded by the window size however many
+    invoices are appended. Appending returns the evicted values, so running aggregates can be
+    updated with them.
+
+    """
+
+    def __init__(self, size: int, value_dtype: type = np.float64) -> None:
+        """InvoiceWindow constructor.
+
+        Args:
+            size (int): Number of most recent values the window holds
+            value_dtype (type): dtype of the invoice values, np.int64 when they are cents
+
+        Raises:
+            ValueError: If size is below 1
+
+        """
+        if size < 1:
+            raise ValueError(f"The window size must be at least 1, got {size}")
+
+        self.size = size
+        self.value_dtype = value_dtype
+
+        self._values = np.empty(self.size, dtype=self.value_dtype)
+        # Position of the oldest value, and number of values held
+        self._start = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes held by the ring buffer"""
+        return self._values.nbytes
+
+    @property
+    def values(self) -> np.ndarray:
+        """The held values, from the oldest to the most recent"""
+        return self._take(start=self._start, count=self._count)
+
+    def append(self, values: np.ndarray) -> np.ndarray:
+        """Method to append a batch of values, O(k).
+
+        Args:
+            values (np.ndarray): Given values, at most size values
+
+        Returns (np.ndarray): The oldest values that were evicted to make room for the batch
+
+        Raises:
+            ValueError: If the batch holds more values than the window
+
+        """
+        row_count = values.shape[0]
+
+        if row_count > self.size:
+            raise ValueError(f"Cannot append {row_count} values to a window of size {self.size}")
+
+        evicted_count = max(self._count + row_count - self.size, 0)
+        evicted_values = self._take(start=self._start, count=evicted_count)
+
+        # The batch is written after the most recent value, wrapping around the end of the array
+        end = (self._start + self._count) % self.size
+        head_count = min(row_count, self.size - end)
+
+        self._values[end : end + head_count] = values[:head_count]
+        self._values[: row_count - head_count] = values[head_count:]
+
+        self._start = (self._start + evicted_count) % self.size
+        self._count = min(self._count + row_count, self.size)
+
+        return evicted_values
+
+    def clear(self) -> None:
+        """Method to drop all values"""
+        self._start = 0
+        self._count = 0
+
+    def _take(self, start: int, count: int) -> np.ndarray:
+        """Private method to copy values out of the ring buffer.
+
+        Args:
+            start (int): Position of the first value
+            count (int): Number of values, at most size
+
+        Returns (np.ndarray): Copy of the values, in order
+
+        """
+        end = start + count
+
+        if end <= self.size:
+            return self._values[start:end].copy()
+
+        return np.concatenate([self._values[start:], self._values[: end - self.size]])
@@ -0,0 +1,70 @@
+import importlib
+import importlib.util
+import sys
+import threading
+from types import ModuleType
+from typing import Any, Optional
+
+
+class _LazyModule(ModuleType):
+    """_LazyModule class, stands in for a module that is only imported on the first access of one
+    of its attributes."""
+
+    def __init__(self, name: str) -> None:
+        """Constructor of _LazyModule.
+
+        Args:
+            name (str): Name of the module, e.g. pandas
+
+        """
+        super().__init__(name)
+        self._lazy_lock = threading.Lock()
+        self._lazy_module: Optional[ModuleType] = None
+
+    def _load(self) -> ModuleType:
+        """Method to import the module, once, also when several threads access it at once.
+
+        Returns (ModuleType): The imported module
+
+        """
+        if self._lazy_module is None:
+            with self._lazy_lock:
+                if self._lazy_module is None:
+                    self._lazy_module = importlib.import_module(self.__name__)
+
+        return self._lazy_module
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self._load(), attribute)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Function to import a module lazily, it is only loaded on the first access of one of its
+    attributes.
+
+    Args:
+        name (str): Name of the module, e.g. pandas
+
+    Returns (ModuleType): The module, it is returned as is if it has already been imported
+
+    Raises:
+        ModuleNotFoundError: If the module is not installed
+
+    Notes:
+        pandas and pandera take hundreds of milliseconds to import, so they are only loaded once
+        they are used, e.g. when the first InvoiceStats instance is created, and not by importing
+        src.invoice_stats. The proxy is not registered in sys.modules, the module is imported
+        with importlib.import_module under a lock, so it is loaded once, by the regular import
+        system, even when several threads use it at the same time.
+
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    if importlib.util.find_spec(name) is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+
+    return _LazyModule(name)
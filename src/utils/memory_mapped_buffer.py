@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+import json
+import os
+from typing import TYPE_CHECKING, List, Optional
+
+import numpy as np
+
+from src.utils.constants import INVOICE_BUFFER_INITIAL_CAPACITY, INVOICE_COLUMN_NAMES
+from src.utils.invoice_name_index import InvoiceNameIndex
+from src.utils.lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_import("pandas")
+
+MEMORY_MAPPED_STORE_VERSION = 1
+INVOICE_VALUE_FILE_NAME = "invoice_value.bin"
+INVOICE_NAME_CODE_FILE_NAME = "invoice_name.bin"
+INVOICE_NAME_INDEX_FILE_NAME = "invoice_name_index.jsonl"
+METADATA_FILE_NAME = "metadata.json"
+
+
+class MemoryMappedInvoiceBuffer:
+    """Columnar invoice storage backed by memory-mapped files in a directory.
+
+    The invoice values, and the invoice names as int32 codes into a name index, are kept in
+    memory-mapped files that grow by doubling their capacity. Appends are written straight to
+    the mapped files and flushed to disk, and opening an existing directory maps the files again
+    without parsing the invoices.
+
+    Files:
+        invoice_value.bin: Invoice values, float64 or int64 cents
+        invoice_name.bin: Invoice name codes, int32
+        invoice_name_index.jsonl: One JSON encoded invoice name per line, line number is its code
+        metadata.json: Store version, value dtype and number of invoices
+
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        capacity_limit: int,
+        initial_capacity: int = INVOICE_BUFFER_INITIAL_CAPACITY,
+        value_dtype: type = np.float64,
+    ) -> None:
+        """MemoryMappedInvoiceBuffer constructor, opens the store in directory or creates it.
+
+        Args:
+            directory (str): Directory of the store
+            capacity_limit (int): Maximal number of rows the buffer can hold
+            initial_capacity (int): Number of rows to preallocate, capped by capacity_limit
+            value_dtype (type): dtype of the invoice values, np.int64 when they are stored as
+                cents
+
+        Raises:
+            ValueError: If the store in directory has another version or value dtype, or more
+                rows than capacity_limit
+
+        """
+        self.directory = directory
+        self.capacity_limit = capacity_limit
+        self.initial_capacity = max(min(initial_capacity, capacity_limit), 1)
+        self.value_dtype = value_dtype
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        metadata = self._read_metadata()
+        self._size = 0 if metadata is None else metadata["size"]
+
+        if metadata is not None and (
+            metadata["version"] != MEMORY_MAPPED_STORE_VERSION
+            or metadata["value_dtype"] != np.dtype(self.value_dtype).name
+            or self._size > self.capacity_limit
+        ):
+            raise ValueError(
+                f"Invoice store {self.directory} can not be opened with version "
+                f"{MEMORY_MAPPED_STORE_VERSION}, value_dtype {np.dtype(self.value_dtype).name} "
+                f"and capacity_limit {self.capacity_limit}, metadata: {metadata}"
+            )
+
+        self.name_index = InvoiceNameIndex(names=self._read_name_index())
+        self._frame: Optional[pd.DataFrame] = None
+
+        self._map(capacity=max(self._size, self.initial_capacity))
+
+        if metadata is None:
+            self._write_metadata()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        """Number of rows that can be held before the files need to grow"""
+        return self._values.shape[0]
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes held by the columns, including the capacity that is not used yet"""
+        return self._name_codes_map.nbytes + self._values.nbytes
+
+    @property
+    def names(self) -> np.ndarray:
+        """The stored invoice names, decoded from the name index"""
+        return self.name_index.decode(codes=self.name_codes)
+
+    @property
+    def name_codes(self) -> np.ndarray:
+        """Memory-mapped view of the stored invoice name codes"""
+        return self._name_codes_map[: self._size]
+
+    @property
+    def values(self) -> np.ndarray:
+        """Memory-mapped view of the stored invoice values"""
+        return self._values[: self._size]
+
+    def append(self, names: np.ndarray, values: np.ndarray) -> None:
+        """Method to append a batch of invoices at the end of the mapped files.
+
+        Args:
+            names (np.ndarray): Invoice names
+            values (np.ndarray): Invoice values, same length as names
+
+        Raises:
+            ValueError: If the batch would exceed the capacity_limit
+
+        """
+        row_count = values.shape[0]
+        new_size = self._size + row_count
+
+        if new_size > self.capacity_limit:
+            raise ValueError(
+                f"Cannot append {row_count} invoices, buffer holds {self._size} of "
+                f"{self.capacity_limit} invoices"
+            )
+
+        codes = self._encode_names(names=names)
+
+        self._reserve(size=new_size)
+        self._name_codes_map[self._size : new_size] = codes
+        self._values[self._size : new_size] = values
+        self._size = new_size
+        self._frame = None
+
+        # The rows are flushed to disk before the size is written, so a store is never opened
+        # with rows that were not written, also after a crash
+        self.flush()
+        self._write_metadata()
+
+    def flush(self) -> None:
+        """Method to write the mapped files to disk, they are flushed on every append"""
+        self._values.flush()
+        self._name_codes_map.flush()
+
+    def clear(self) -> None:
+        """Method to drop all rows, and shrink the files to the initial capacity"""
+        self._size = 0
+        self.name_index.clear()
+        self._frame = None
+
+        open(self._path(INVOICE_NAME_INDEX_FILE_NAME), "w").close()
+        self._map(capacity=self.initial_capacity, truncate=True)
+        self._write_metadata()
+
+    def to_frame(self) -> pd.DataFrame:
+        """Method to get the stored invoices as a pd.DataFrame.
+
+        Returns (pd.DataFrame): DataFrame with the invoice values on top of the mapped file, and
+            the invoice names decoded to an object column, so it follows the invoice schema. It is
+            cached until the buffer is changed.
+
+        """
+        if self._frame is None:
+            self._frame = pd.DataFrame(
+                {
+                    INVOICE_COLUMN_NAMES.get("invoice_name"): pd.Series(self.names, dtype=object),
+                    INVOICE_COLUMN_NAMES.get("invoice_value"): self.values,
+                },
+                copy=False,
+            )
+
+        return self._frame
+
+    def _encode_names(self, names: np.ndarray) -> np.ndarray:
+        """Private method to get the codes of names, new names are appended to the name index
+        file.
+
+        Args:
+            names (np.ndarray): Invoice names
+
+        Returns (np.ndarray): int32 codes of the names
+
+        """
+        name_count = len(self.name_index)
+        codes = self.name_index.encode(names=names)
+
+        if len(self.name_index) > name_count:
+            with open(self._path(INVOICE_NAME_INDEX_FILE_NAME), "a") as name_index_file:
+                name_index_file.writelines(
+                    f"{json.dumps(name)}\n" for name in self.name_index.names[name_count:]
+                )
+                name_index_file.flush()
+                os.fsync(name_index_file.fileno())
+
+        return codes
+
+    def _reserve(self, size: int) -> None:
+        """Private method to make sure the files can hold size rows, the capacity is doubled until
+        it fits (amortized O(1) per row), but never beyond the capacity_limit.
+
+        Args:
+            size (int): Number of rows the files need to hold
+
+        """
+        capacity = self.capacity
+
+        if size <= capacity:
+            return
+
+        while capacity < size:
+            capacity *= 2
+
+        self._map(capacity=min(capacity, self.capacity_limit))
+
+    def _map(self, capacity: int, truncate: bool = False) -> None:
+        """Private method to (re)map the files with the given capacity.
+
+        Args:
+            capacity (int): Number of rows to map
+            truncate (bool): If the files should be truncated to capacity rows, instead of only
+                being extended
+
+        """
+        self._values = self._map_file(
+            file_name=INVOICE_VALUE_FILE_NAME,
+            dtype=self.value_dtype,
+            capacity=capacity,
+            truncate=truncate,
+        )
+        self._name_codes_map = self._map_file(
+            file_name=INVOICE_NAME_CODE_FILE_NAME,
+            dtype=np.int32,
+            capacity=capacity,
+            truncate=truncate,
+        )
+
+    def _map_file(self, file_name: str, dtype: type, capacity: int, truncate: bool) -> np.memmap:
+        """Private method to memory-map a column file.
+
+        Args:
+            file_name (str): Name of the file in the store directory
+            dtype (type): dtype of the column
+            capacity (int): Number of rows to map
+            truncate (bool): If the file should be truncated to capacity rows
+
+        Returns (np.memmap): The mapped column
+
+        """
+        path = self._path(file_name)
+        byte_count = capacity * np.dtype(dtype).itemsize
+
+        with open(path, "ab") as column_file:
+            if truncate or column_file.tell() < byte_count:
+                column_file.truncate(byte_count)
+
+        return np.memmap(path, dtype=dtype, mode="r+", shape=(capacity,))
+
+    def _read_name_index(self) -> List[str]:
+        """Private method to read the name index file.
+
+        Returns (List[str]): The invoice names, the position of a name is its code
+
+        """
+        path = self._path(INVOICE_NAME_INDEX_FILE_NAME)
+
+        if not os.path.exists(path):
+            return []
+
+        with open(path) as name_index_file:
+            return [json.loads(line) for line in name_index_file]
+
+    def _read_metadata(self) -> Optional[dict]:
+        """Private method to read the metadata file.
+
+        Returns (Optional[dict]): The metadata, None if the store is new
+
+        """
+        path = self._path(METADATA_FILE_NAME)
+
+        if not os.path.exists(path):
+            return None
+
+        with open(path) as metadata_file:
+            return json.load(metadata_file)
+
+    def _write_metadata(self) -> None:
+        """Private method to write the metadata file, atomically and flushed to disk"""
+        path = self._path(METADATA_FILE_NAME)
+
+        with open(f"{path}.tmp", "w") as metadata_file:
+            json.dump(
+                {
+                    "version": MEMORY_MAPPED_STORE_VERSION,
+                    "value_dtype": np.dtype(self.value_dtype).name,
+                    "size": self._size,
+                },
+                metadata_file,
+            )
+            metadata_file.flush()
+            os.fsync(metadata_file.fileno())
+
+        os.replace(f"{path}.tmp", path)
+
+    def _path(self, file_name: str) -> str:
+        """Private method to get the path of a file in the store directory.
+
+        Args:
+            file_name (str): Given file name
+
+        Returns (str): Path of the file
+
+        """
+        return os.path.join(self.directory, file_name)
@@ -0,0 +1,159 @@
+import time
+from contextlib import contextmanager, nullcontext
+from typing import ContextManager, Dict, Iterator, Optional
+
+# Shared by every disabled timer, so a disabled phase does not allocate anything
+_NULL_TIMER = nullcontext()
+
+
+class MetricsSink:
+    """Interface to receive the metrics of an InvoiceStats instance as they are recorded.
+
+    Subclass it and override the methods to feed the metrics into a monitoring system, every method
+    is a no-op by default.
+
+    """
+
+    def record_timing(self, name: str, seconds: float) -> None:
+        """Method called every time a phase has been timed.
+
+        Args:
+            name (str): Name of the phase, e.g. "validation"
+            seconds (float): Wall time of the phase
+
+        """
+
+    def increment(self, name: str, value: int) -> None:
+        """Method called every time a counter is incremented.
+
+        Args:
+            name (str): Name of the counter, e.g. "rows_accepted"
+            value (int): Increment
+
+        """
+
+    def gauge(self, name: str, value: int) -> None:
+        """Method called every time a gauge is set.
+
+        Args:
+            name (str): Name of the gauge, e.g. "bytes_held"
+            value (int): New value
+
+        """
+
+
+class InvoiceMetrics:
+    """Per-phase timers, counters and gauges.
+
+    When disabled, timer returns a shared no-op context manager and the other methods return
+    right away, so instrumented code costs a method call per phase.
+
+    """
+
+    def __init__(self, enabled: bool = False, sink: Optional[MetricsSink] = None) -> None:
+        """InvoiceMetrics constructor.
+
+        Args:
+            enabled (bool): If True the metrics are recorded, by default False
+            sink (Optional[MetricsSink]): Sink that receives every metric as it is recorded, a
+                sink enables the metrics
+
+        """
+        self.enabled = enabled or sink is not None
+        self.sink = sink
+
+        self._counters: Dict[str, int] = {}
+        self._timings: Dict[str, Dict[str, float]] = {}
+        self._gauges: Dict[str, int] = {}
+
+    def timer(self, name: str) -> ContextManager:
+        """Method to time a phase.
+
+        Args:
+            name (str): Name of the phase
+
+        Returns (ContextManager): Context manager that records the wall time of its block
+
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+
+        return self._timer(name=name)
+
+    def record_timing(self, name: str, seconds: float) -> None:
+        """Method to record the wall time of a phase.
+
+        Args:
+            name (str): Name of the phase
+            seconds (float): Wall time of the phase
+
+        """
+        if not self.enabled:
+            return
+
+        timing = self._timings.setdefault(name, {"count": 0, "seconds": 0.0})
+        timing["count"] += 1
+        timing["seconds"] += seconds
+
+        if self.sink is not None:
+            self.sink.record_timing(name=name, seconds=seconds)
+
+    def increment(self, name: str, value: int = 1) -> None:
+        """Method to increment a counter.
+
+        Args:
+            name (str): Name of the counter
+            value (int): Increment, by default 1
+
+        """
+        if not self.enabled:
+            return
+
+        self._counters[name] = self._counters.get(name, 0) + value
+
+        if self.sink is not None:
+            self.sink.increment(name=name, value=value)
+
+    def gauge(self, name: str, value: int) -> None:
+        """Method to set a gauge.
+
+        Args:
+            name (str): Name of the gauge
+            value (int): New value
+
+        """
+        if not self.enabled:
+            return
+
+        self._gauges[name] = value
+
+        if self.sink is not None:
+            self.sink.gauge(name=name, value=value)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Method to get a copy of the recorded metrics.
+
+        Returns (Dict[str, Dict]): The counters, the timings as count and total seconds per phase,
+            and the gauges
+
+        """
+        return {
+            "counters": dict(self._counters),
+            "timings": {name: dict(timing) for name, timing in self._timings.items()},
+            "gauges": dict(self._gauges),
+        }
+
+    def clear(self) -> None:
+        """Method to reset all recorded metrics"""
+        self._counters = {}
+        self._timings = {}
+        self._gauges = {}
+
+    @contextmanager
+    def _timer(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self.record_timing(name=name, seconds=time.perf_counter() - start)
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import logging
+import math
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Tuple, Union
+
+from src.utils.constants import PARALLEL_VALIDATION_MIN_ROWS, SCHEMA_CACHE_SIZE
+from src.utils.lazy_import import lazy_import
+from src.utils.schemas.numpy_validator import NumpyValidator
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pandera as pa
+else:
+    pd = lazy_import("pandas")
+    pa = lazy_import("pandera")
+
+LOGGER = logging.getLogger(__name__)
+
+# Errors of the pool itself, the invoices are then validated serially
+POOL_ERRORS = (BrokenProcessPool, OSError, pickle.PicklingError)
+
+
+class ParallelValidator:
+    """ParallelValidator class, validates large batches of invoices in chunks on a pool of worker
+    processes, kept for the lifetime of the validator."""
+
+    def __init__(
+        self,
+        schema_factory: Callable[..., pa.DataFrameSchema],
+        schema_arguments: Dict[str, object],
+        validation_backend: str,
+        workers: int,
+        min_row_count: int = PARALLEL_VALIDATION_MIN_ROWS,
+    ) -> None:
+        """Constructor of ParallelValidator.
+
+        Args:
+            schema_factory (Callable[..., pa.DataFrameSchema]): Module level function creating the
+                invoice schema, e.g. create_invoice_schema
+            schema_arguments (Dict[str, object]): Keyword arguments of the schema factory
+            validation_backend (str): pandera, or numpy to validate with a NumpyValidator compiled
+                from the schema
+            workers (int): Number of worker processes, the invoices are split into one chunk per
+                worker
+            min_row_count (int): Invoices with fewer rows are validated serially, the cost of
+                sending the chunks to the workers would outweigh the gain, by default 100000
+
+        Notes:
+            A pandera schema holds its checks as closures, which cannot be pickled by every
+            pandera version, so the workers are sent the schema factory and its arguments, and
+            build (and cache) the same validator themselves.
+
+        """
+        self.schema_factory = schema_factory
+        self.schema_arguments = tuple(sorted(schema_arguments.items()))
+        self.validation_backend = validation_backend
+        self.workers = workers
+        self.min_row_count = min_row_count
+        self.validator = _get_validator(
+            schema_factory=self.schema_factory,
+            schema_arguments=self.schema_arguments,
+            validation_backend=self.validation_backend,
+        )
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def validate(self, invoices: pd.DataFrame) -> pd.DataFrame:
+        """Method to validate invoices, split into chunks validated by the worker processes.
+
+        Args:
+            invoices (pd.DataFrame): Invoices to validate
+
+        Returns (pd.DataFrame): The validated (coerced) invoices, with the index of the given
+            invoices
+
+        Notes:
+            The schema checks (dtype coercion and the value bounds) are row by row, so validating
+            the chunks one by one is equivalent to validating the whole batch. The error of the
+            first invalid chunk is raised, by validating that chunk again in this process, as the
+            errors of the pinned pandera version cannot be pickled. If the pool itself fails,
+            it is logged and the invoices are validated serially.
+
+        """
+        row_count = invoices.shape[0]
+
+        if self.workers <= 1 or row_count < self.min_row_count:
+            return self.validator.validate(invoices)
+
+        chunksize = math.ceil(row_count / self.workers)
+        chunks = [
+            invoices.iloc[start : start + chunksize] for start in range(0, row_count, chunksize)
+        ]
+
+        try:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+
+            futures = [
+                self._executor.submit(
+                    _validate_chunk,
+                    self.schema_factory,
+                    self.schema_arguments,
+                    self.validation_backend,
+                    chunk,
+                )
+                for chunk in chunks
+            ]
+            validated_chunks = [future.result() for future in futures]
+
+        except POOL_ERRORS as pool_error:
+            LOGGER.warning(
+                f"The validation pool failed ({pool_error!r}), the {row_count} invoices are "
+                f"validated serially"
+            )
+            self.close()
+
+            return self.validator.validate(invoices)
+
+        for chunk_number, chunk in enumerate(chunks):
+            if validated_chunks[chunk_number] is None:
+                validated_chunks[chunk_number] = self.validator.validate(chunk)
+
+        return pd.concat(validated_chunks)
+
+    def close(self) -> None:
+        """Method to shut down the worker processes, they are started again by the next parallel
+        validation."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+@lru_cache(maxsize=SCHEMA_CACHE_SIZE)
+def _get_validator(
+    schema_factory: Callable[..., pa.DataFrameSchema],
+    schema_arguments: Tuple[Tuple[str, object], ...],
+    validation_backend: str,
+) -> Union[pa.DataFrameSchema, NumpyValidator]:
+    """Function to build the validator of an invoice schema, cached per process.
+
+    Args:
+        schema_factory (Callable[..., pa.DataFrameSchema]): Function creating the invoice schema
+        schema_arguments (Tuple[Tuple[str, object], ...]): Keyword arguments of the schema
+            factory, as sorted (name, value) pairs
+        validation_backend (str): pandera, or numpy
+
+    Returns (Union[pa.DataFrameSchema, NumpyValidator]): The schema, or a NumPy validator
+        compiled from it
+
+    """
+    schema = schema_factory(**dict(schema_arguments))
+
+    return NumpyValidator(schema=schema) if validation_backend == "numpy" else schema
+
+
+def _validate_chunk(
+    schema_factory: Callable[..., pa.DataFrameSchema],
+    schema_arguments: Tuple[Tuple[str, object], ...],
+    validation_backend: str,
+    chunk: pd.DataFrame,
+) -> Optional[pd.DataFrame]:
+    """Function to validate a chunk of invoices in a worker process.
+
+    Args:
+        schema_factory (Callable[..., pa.DataFrameSchema]): Function creating the invoice schema
+        schema_arguments (Tuple[Tuple[str, object], ...]): Keyword arguments of the schema
+            factory, as sorted (name, value) pairs
+        validation_backend (str): pandera, or numpy
+        chunk (pd.DataFrame): Invoices to validate
+
+    Returns (Optional[pd.DataFrame]): The validated chunk, or None if it is invalid
+
+    """
+    validator = _get_validator(
+        schema_factory=schema_factory,
+        schema_arguments=schema_arguments,
+        validation_backend=validation_backend,
+    )
+
+    try:
+        return validator.validate(chunk)
+
+    except (pa.errors.SchemaError, pa.errors.SchemaErrors, TypeError, ValueError):
+        return None
@@ -0,0 +1,223 @@
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.utils.constants import CENTS_PER_UNIT
+from src.utils.quantile_sketch import QuantileSketch
+from src.utils.running_sum import RunningSum
+from src.utils.selection import exact_median
+from src.utils.snapshot import read_snapshot, write_snapshot
+
+
+class PartialAggregate:
+    """Mergeable aggregates of a part of the invoices, e.g. the invoices of one worker process.
+
+    A partial aggregate holds the exact count and sum of the invoice values in a RunningSum, and a
+    QuantileSketch, which tracks the exact minimum, maximum and standard deviation, and
+    approximates the median and quantiles. An exact partial aggregate also holds the invoice
+    values themselves.
+
+    Partial aggregates are merged by a coordinator, see merge_partial_aggregates, the merged mean
+    is exact. The merged median is exact if every merged partial aggregate is exact, else it is
+    approximated by the merged sketch, within the error bound of QuantileSketch.
+
+    Partial aggregates can be pickled, e.g. returned from a process pool, or saved to a snapshot
+    file.
+
+    """
+
+    def __init__(
+        self,
+        fixed_point: bool,
+        running_sum: RunningSum,
+        quantile_sketch: QuantileSketch,
+        values: Optional[np.ndarray] = None,
+    ) -> None:
+        """PartialAggregate constructor.
+
+        Args:
+            fixed_point (bool): If True the values are int64 minor units (cents)
+            running_sum (RunningSum): Count and sum of the values
+            quantile_sketch (QuantileSketch): Sketch of the values
+            values (Optional[np.ndarray]): The values, only for an exact partial aggregate, by
+                default None
+
+        """
+        self.fixed_point = fixed_point
+        self.running_sum = running_sum
+        self.quantile_sketch = quantile_sketch
+        self.values = values
+
+        self._value_scale = CENTS_PER_UNIT if self.fixed_point else 1
+
+    def __len__(self) -> int:
+        return self.running_sum.count
+
+    @property
+    def exact(self) -> bool:
+        """If the median is exact, the values are held"""
+        return self.values is not None
+
+    @property
+    def min_value(self) -> float:
+        """The exact minimum value, NaN if there are no values"""
+        return self.quantile_sketch.quantile(q=0.0) / self._value_scale
+
+    @property
+    def max_value(self) -> float:
+        """The exact maximum value, NaN if there are no values"""
+        return self.quantile_sketch.quantile(q=1.0) / self._value_scale
+
+    def total(self) -> float:
+        """Method to get the exact sum of the values.
+
+        Returns (float): The sum
+
+        """
+        return self.running_sum.total(scale=self._value_scale)
+
+    def mean(self) -> float:
+        """Method to get the exact mean of the values.
+
+        Returns (float): The mean, NaN if there are no values
+
+        """
+        return self.running_sum.mean(scale=self._value_scale)
+
+    def median(self) -> float:
+        """Method to get the median of the values.
+
+        Returns (float): The exact median if the partial aggregate is exact, else the approximate
+            median of the sketch, NaN if there are no values
+
+        """
+        if self.exact:
+            return exact_median(values=self.values, scale=self._value_scale)
+
+        return self.quantile_sketch.median(scale=self._value_scale)
+
+    def merge(self, other: "PartialAggregate") -> None:
+        """Method to merge another partial aggregate into this one.
+
+        Args:
+            other (PartialAggregate): Partial aggregate with the same fixed_point and sketch k
+
+        Raises:
+            ValueError: If the partial aggregates have another fixed_point or sketch k
+
+        Notes:
+            The merged partial aggregate is only exact if both are exact.
+
+        """
+        if other.fixed_point != self.fixed_point:
+            raise ValueError(
+                f"Cannot merge a partial aggregate with fixed_point={other.fixed_point} into one "
+                f"with fixed_point={self.fixed_point}"
+            )
+
+        self.quantile_sketch.merge(other=other.quantile_sketch)
+        self.running_sum.merge(other=other.running_sum)
+
+        self.values = (
+            np.concatenate([self.values, other.values]) if self.exact and other.exact else None
+        )
+
+    def get_state(self) -> Tuple[Dict, Dict[str, np.ndarray]]:
+        """Method to get the state, e.g. to persist it.
+
+        Returns (Tuple[Dict, Dict[str, np.ndarray]]): JSON serialisable header, and the arrays of
+            the sketch, and of the values for an exact partial aggregate
+
+        """
+        header = {
+            "fixed_point": self.fixed_point,
+            "sketch_k": self.quantile_sketch.k,
+            "running_sum": self.running_sum.get_state(),
+            "exact": self.exact,
+        }
+        arrays = self.quantile_sketch.get_state()
+
+        if self.exact:
+            arrays["values"] = self.values
+
+        return header, arrays
+
+    @classmethod
+    def from_state(cls, header: Dict, arrays: Dict[str, np.ndarray]) -> "PartialAggregate":
+        """Method to restore a partial aggregate from get_state.
+
+        Args:
+            header (Dict): Header of the state
+            arrays (Dict[str, np.ndarray]): Arrays of the state
+
+        Returns (PartialAggregate): The restored partial aggregate
+
+        """
+        value_dtype = np.int64 if header["fixed_point"] else np.float64
+
+        running_sum = RunningSum()
+        running_sum.set_state(state=header["running_sum"])
+
+        quantile_sketch = QuantileSketch(k=header["sketch_k"], value_dtype=value_dtype)
+        quantile_sketch.set_state(
+            state={name: array for name, array in arrays.items() if name != "values"}
+        )
+
+        return cls(
+            fixed_point=header["fixed_point"],
+            running_sum=running_sum,
+            quantile_sketch=quantile_sketch,
+            values=arrays["values"].astype(value_dtype) if header["exact"] else None,
+        )
+
+    def save(self, path: str) -> None:
+        """Method to save the partial aggregate to a snapshot file.
+
+        Args:
+            path (str): Path of the snapshot file
+
+        """
+        header, arrays = self.get_state()
+
+        write_snapshot(path=path, header=header, arrays=arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "PartialAggregate":
+        """Method to load a partial aggregate from a snapshot file written by save.
+
+        Args:
+            path (str): Path of the snapshot file
+
+        Returns (PartialAggregate): The loaded partial aggregate
+
+        """
+        header, arrays = read_snapshot(path=path)
+
+        return cls.from_state(header=header, arrays=arrays)
+
+
+def merge_partial_aggregates(partial_aggregates: Sequence[PartialAggregate]) -> PartialAggregate:
+    """Function to merge partial aggregates, e.g. on a coordinator.
+
+    Args:
+        partial_aggregates (Sequence[PartialAggregate]): Given partial aggregates, at least one
+
+    Returns (PartialAggregate): A new partial aggregate of all values, the given ones are not
+        changed
+
+    Raises:
+        ValueError: If there are no partial aggregates, or they can not be merged
+
+    """
+    if len(partial_aggregates) == 0:
+        raise ValueError("At least one partial aggregate must be given")
+
+    first = partial_aggregates[0]
+
+    # The first partial aggregate is copied, so none of the given ones is changed by the merge
+    merged = PartialAggregate.from_state(*first.get_state())
+
+    for partial_aggregate in partial_aggregates[1:]:
+        merged.merge(other=partial_aggregate)
+
+    return merged
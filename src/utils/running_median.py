@@ -0,0 +1,238 @@
+import heapq
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.utils.constants import RUNNING_MEDIAN_REBUILD_FACTOR
+
+
+class RunningMedian:
+    """Exact median of a stream of values, maintained with two heaps.
+
+    The lower half of the values is kept in a max-heap (stored negated) and the upper half in a
+    min-heap, the lower half holds at most one value more than the upper half. Adding or removing
+    a value is O(log n) and getting the median is O(1).
+
+    """
+
+    def __init__(self) -> None:
+        """RunningMedian constructor"""
+        self._lower: List[float] = []
+        self._upper: List[float] = []
+        # Number of values held by each heap, not counting removed values that are still in it
+        self._lower_size = 0
+        self._upper_size = 0
+        # Removed values that have not been popped from their heap yet, value -> count
+        self._removed: Dict[float, int] = {}
+
+    def __len__(self) -> int:
+        return self._lower_size + self._upper_size
+
+    def push(self, value: float) -> None:
+        """Method to add a single value, O(log n).
+
+        Args:
+            value (float): Given value
+
+        """
+        if self._lower_size == 0 or value <= -self._lower[0]:
+            heapq.heappush(self._lower, -value)
+            self._lower_size += 1
+        else:
+            heapq.heappush(self._upper, value)
+            self._upper_size += 1
+
+        self._rebalance()
+
+    def discard(self, value: float) -> None:
+        """Method to remove a single value, O(log n) amortized.
+
+        Args:
+            value (float): Given value, it must be one of the held values
+
+        Notes:
+            The value is only marked as removed, it is popped once it reaches the top of its heap
+            (lazy deletion), so the median stays O(1). When the heaps hold more removed values
+            than values, they are rebuilt from the held values.
+
+        """
+        if value <= -self._lower[0]:
+            self._lower_size -= 1
+        else:
+            self._upper_size -= 1
+
+        self._removed[value] = self._removed.get(value, 0) + 1
+
+        self._prune(heap=self._lower, sign=-1)
+        self._prune(heap=self._upper, sign=1)
+        self._rebalance()
+
+        if len(self._lower) + len(self._upper) > 2 * len(self):
+            self.rebuild(values=self._held_values())
+
+    def remove(self, values: np.ndarray) -> None:
+        """Method to remove a batch of values, O(k log n) amortized.
+
+        Args:
+            values (np.ndarray): Given values, they must be held
+
+        """
+        for value in values.tolist():
+            self.discard(value)
+
+    def extend(self, values: np.ndarray) -> None:
+        """Method to add a batch of values.
+
+        Args:
+            values (np.ndarray): Given values
+
+        Notes:
+            Small batches are pushed value by value, O(k log n). A batch that is large compared
+            to the values already held rebuilds both heaps from all values instead, O(n + k),
+            which is what happens on bulk loads.
+
+        """
+        if values.shape[0] * RUNNING_MEDIAN_REBUILD_FACTOR >= len(self):
+            self.rebuild(values=np.concatenate([self._held_values(dtype=values.dtype), values]))
+        else:
+            for value in values.tolist():
+                self.push(value)
+
+    def rebuild(self, values: np.ndarray) -> None:
+        """Method to replace all held values, O(n).
+
+        Args:
+            values (np.ndarray): Given values
+
+        """
+        value_count = values.shape[0]
+
+        if value_count == 0:
+            self.clear()
+            return
+
+        lower_count = (value_count + 1) // 2
+
+        # After the partition every value before lower_count is <= every value after it
+        values = np.partition(values, lower_count - 1)
+
+        self._lower = (-values[:lower_count]).tolist()
+        self._upper = values[lower_count:].tolist()
+        heapq.heapify(self._lower)
+        heapq.heapify(self._upper)
+        self._lower_size = len(self._lower)
+        self._upper_size = len(self._upper)
+        self._removed = {}
+
+    def median(self, scale: int = 1) -> float:
+        """Method to get the median, O(1).
+
+        Args:
+            scale (int): The median is divided by scale, e.g. 100 to get units from cents
+
+        Returns (float): The median value, the mean of the two middle values if the number of
+            values is even, NaN if there are no values
+
+        Notes:
+            Integer values (e.g. cents) stay Python ints in the heaps, so the median is a single
+            correctly rounded int / int division.
+
+        """
+        if self._lower_size == 0:
+            return float("nan")
+
+        if self._lower_size > self._upper_size:
+            return -self._lower[0] / scale
+
+        return (-self._lower[0] + self._upper[0]) / (2 * scale)
+
+    def get_state(self) -> Dict[str, np.ndarray]:
+        """Method to get both heaps, e.g. to persist them.
+
+        Returns (Dict[str, np.ndarray]): The lower (negated) and upper heap, in heap order
+
+        """
+        # Removed values are dropped first, so the state only holds the held values
+        if self._removed:
+            self.rebuild(values=self._held_values())
+
+        return {"lower": np.asarray(self._lower), "upper": np.asarray(self._upper)}
+
+    def set_state(self, state: Dict[str, np.ndarray]) -> None:
+        """Method to replace both heaps with the ones from get_state, the heaps are already in heap
+        order so they are not heapified again.
+
+        Args:
+            state (Dict[str, np.ndarray]): Given state
+
+        """
+        self._lower = state["lower"].tolist()
+        self._upper = state["upper"].tolist()
+        self._lower_size = len(self._lower)
+        self._upper_size = len(self._upper)
+        self._removed = {}
+
+    def clear(self) -> None:
+        """Method to drop all values"""
+        self._lower = []
+        self._upper = []
+        self._lower_size = 0
+        self._upper_size = 0
+        self._removed = {}
+
+    def _rebalance(self) -> None:
+        """Private method to keep the lower heap equal to, or one value larger than, the upper
+        heap."""
+        if self._lower_size > self._upper_size + 1:
+            heapq.heappush(self._upper, -heapq.heappop(self._lower))
+            self._lower_size -= 1
+            self._upper_size += 1
+            self._prune(heap=self._lower, sign=-1)
+
+        elif self._upper_size > self._lower_size:
+            heapq.heappush(self._lower, -heapq.heappop(self._upper))
+            self._upper_size -= 1
+            self._lower_size += 1
+            self._prune(heap=self._upper, sign=1)
+
+    def _prune(self, heap: List[float], sign: int) -> None:
+        """Private method to pop removed values from the top of a heap, so the top of both heaps
+        is always a held value.
+
+        Args:
+            heap (List[float]): The lower or upper heap
+            sign (int): -1 for the lower heap, its values are stored negated, else 1
+
+        """
+        while heap and self._removed.get(sign * heap[0], 0) > 0:
+            value = sign * heapq.heappop(heap)
+
+            self._removed[value] -= 1
+            if self._removed[value] == 0:
+                del self._removed[value]
+
+    def _held_values(self, dtype: Optional[type] = None) -> np.ndarray:
+        """Private method to get the held values, without the removed values.
+
+        Args:
+            dtype (Optional[type]): dtype of the values, by default inferred from the heaps
+
+        Returns (np.ndarray): The held values, in no particular order
+
+        """
+        values = np.concatenate(
+            [-np.asarray(self._lower, dtype=dtype), np.asarray(self._upper, dtype=dtype)]
+        )
+
+        if not self._removed:
+            return values
+
+        # Every removed value drops that many equal values, from the start of their sorted run
+        values = np.sort(values)
+        starts = np.searchsorted(values, list(self._removed.keys()), side="left")
+        held = np.ones(values.shape[0], dtype=bool)
+
+        for start, count in zip(starts.tolist(), self._removed.values()):
+            held[start : start + count] = False
+
+        return values[held]
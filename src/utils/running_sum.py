@@ -0,0 +1,156 @@
+from typing import Dict, Union
+
+import numpy as np
+
+
+class RunningSum:
+    """Running count and sum of a stream of values, that does not drift with the number of
+    values.
+
+    Every value is split into its nearest integer and the remaining fraction. The integer parts are
+    summed exactly as a Python int, and the fractions (|fraction| <= 0.5) are summed with Neumaier
+    compensated summation, so the mean stays exact to float64 precision however many values are
+    added.
+
+    """
+
+    def __init__(self) -> None:
+        """RunningSum constructor"""
+        self.count = 0
+        self._integer_total = 0
+        self._fraction_total = 0.0
+        self._fraction_compensation = 0.0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def extend(self, values: np.ndarray) -> None:
+        """Method to add a batch of values, O(k) vectorized.
+
+        Args:
+            values (np.ndarray): Given values, integer values (e.g. cents) are summed exactly
+
+        """
+        if np.issubdtype(values.dtype, np.integer):
+            self._integer_total += int(values.sum())
+
+        else:
+            integers = np.rint(values)
+
+            self._integer_total += int(integers.astype(np.int64).sum())
+            self._add_fraction(value=float(np.sum(values - integers)))
+
+        self.count += values.shape[0]
+
+    def remove(self, values: np.ndarray) -> None:
+        """Method to remove a batch of values that were added before, O(k) vectorized.
+
+        Args:
+            values (np.ndarray): Given values, integer values (e.g. cents) are subtracted exactly
+
+        """
+        if np.issubdtype(values.dtype, np.integer):
+            self._integer_total -= int(values.sum())
+
+        else:
+            integers = np.rint(values)
+
+            self._integer_total -= int(integers.astype(np.int64).sum())
+            self._add_fraction(value=-float(np.sum(values - integers)))
+
+        self.count -= values.shape[0]
+
+    def merge(self, other: "RunningSum") -> None:
+        """Method to add the values of another running sum, O(1).
+
+        Args:
+            other (RunningSum): Given running sum
+
+        """
+        self._integer_total += other._integer_total
+        self._add_fraction(value=other._fraction_total)
+        self._add_fraction(value=other._fraction_compensation)
+        self.count += other.count
+
+    def total(self, scale: int = 1) -> float:
+        """Method to get the sum of all values.
+
+        Args:
+            scale (int): The sum is divided by scale, e.g. 100 to get units from cents
+
+        Returns (float): The sum of all values
+
+        """
+        return (
+            self._integer_total / scale
+            + (self._fraction_total + self._fraction_compensation) / scale
+        )
+
+    def mean(self, scale: int = 1) -> float:
+        """Method to get the mean of all values, O(1).
+
+        Args:
+            scale (int): The mean is divided by scale, e.g. 100 to get units from cents
+
+        Returns (float): The mean value, NaN if there are no values
+
+        """
+        if self.count == 0:
+            return float("nan")
+
+        divisor = self.count * scale
+
+        # int / int is correctly rounded, so the integer part does not lose precision
+        return (
+            self._integer_total / divisor
+            + (self._fraction_total + self._fraction_compensation) / divisor
+        )
+
+    def get_state(self) -> Dict[str, Union[int, float]]:
+        """Method to get the accumulators, e.g. to persist them.
+
+        Returns (Dict[str, Union[int, float]]): The count, integer total, fraction total and
+            fraction compensation
+
+        """
+        return {
+            "count": self.count,
+            "integer_total": self._integer_total,
+            "fraction_total": self._fraction_total,
+            "fraction_compensation": self._fraction_compensation,
+        }
+
+    def set_state(self, state: Dict[str, Union[int, float]]) -> None:
+        """Method to replace the accumulators with the ones from get_state.
+
+        Args:
+            state (Dict[str, Union[int, float]]): Given state
+
+        """
+        self.count = int(state["count"])
+        self._integer_total = int(state["integer_total"])
+        self._fraction_total = float(state["fraction_total"])
+        self._fraction_compensation = float(state["fraction_compensation"])
+
+    def clear(self) -> None:
+        """Method to drop all values"""
+        self.count = 0
+        self._integer_total = 0
+        self._fraction_total = 0.0
+        self._fraction_compensation = 0.0
+
+    def _add_fraction(self, value: float) -> None:
+        """Private method to add value to the fraction total, with Neumaier compensation.
+
+        Args:
+            value (float): Given value
+
+        """
+        total = self._fraction_total + value
+
+        if abs(self._fraction_total) >= abs(value):
+            self._fraction_compensation += (self._fraction_total - total) + value
+        else:
+            self._fraction_compensation += (value - total) + self._fraction_total
+
+        self._fraction_total = total
@@ -1,10 +1,29 @@
+from __future__ import annotations
+
+import re
 from decimal import Decimal
+from functools import lru_cache
+from typing import TYPE_CHECKING, Iterable, Tuple
+
+from src.utils.constants import (
+    INVOICE_COLUMN_NAMES,
+    INVOICE_QUANTILE_COLUMN_PREFIX,
+    INVOICE_STATS_COLUMN_NAMES,
+    INVOICE_SUMMARY_COLUMN_NAMES,
+    SCHEMA_CACHE_SIZE,
+)
+from src.utils.fixed_point import to_cents_limit
+from src.utils.lazy_import import lazy_import
 
-import pandera as pa
+if TYPE_CHECKING:
+    import pandera as pa
+else:
+    pa = lazy_import("pandera")
 
-from src.utils.constants import INVOICE_COLUMN_NAMES, INVOICE_STATS_COLUMN_NAMES
+INVOICE_QUANTILE_COLUMN_PATTERN = re.compile(rf"{INVOICE_QUANTILE_COLUMN_PREFIX}\d+(\.\d+)?")
 
 
+@lru_cache(maxsize=SCHEMA_CACHE_SIZE)
 def create_invoice_schema(
     max_invoice_value: Decimal,
     min_invoice_value: Decimal,
@@ -30,6 +49,10 @@ def create_invoice_schema(
 
     An error will be thrown in runtime.
 
+    Notes:
+        The schema is cached by its arguments, so the same schema is returned to every caller
+        with the same limits and flags. It is shared, and must not be changed in place.
+
     """
     return pa.DataFrameSchema(
         {
@@ -49,29 +72,115 @@ def create_invoice_schema(
     )
 
 
-def create_invoice_stats_schema(coerce: bool = True, strict: bool = True, nullable: bool = True):
-    """Function to validate that invoice stats schema is correct, it also does value checks in
-    runtime (really nice stuff, right here).
+@lru_cache(maxsize=SCHEMA_CACHE_SIZE)
+def create_invoice_cents_schema(
+    max_invoice_value: Decimal,
+    min_invoice_value: Decimal,
+    coerce: bool = True,
+    strict: bool = True,
+    nullable: bool = False,
+):
+    """Function to validate that the invoice schema is correct, when the invoice values are stored
+    as int64 minor units (cents).
 
     Args:
+        max_invoice_value (Decimal): Given max invoice value, in units
+        min_invoice_value (Decimal): Given min invoice value, in units
         coerce (bool): Flag given to determine whether to coerce series to specified type
         strict (bool): Flag given to determine whether or not to accept columns in the
             dataframe that are not in the DataFrame
         nullable (bool): If columns should be nullable or not
 
-    Returns: A pandas DataFrame schema that validates that the types are correct
+    Returns: A pandas DataFrame schema, same as create_invoice_schema but the bounds are checked
+    in cents:
+
+    0 < invoice_value < 20000000000
+
+    Notes:
+        The schema is cached by its arguments, as by create_invoice_schema.
 
     """
     return pa.DataFrameSchema(
         {
-            INVOICE_STATS_COLUMN_NAMES.get("invoice_median"): pa.Column(
-                pa.Float64, nullable=nullable
-            ),
-            INVOICE_STATS_COLUMN_NAMES.get("invoice_mean"): pa.Column(
-                pa.Float64, nullable=nullable
+            INVOICE_COLUMN_NAMES.get("invoice_name"): pa.Column(pa.String, nullable=nullable),
+            INVOICE_COLUMN_NAMES.get("invoice_value"): pa.Column(
+                pa.Int64,
+                checks=[
+                    pa.Check.less_than_or_equal_to(to_cents_limit(value=max_invoice_value)),
+                    pa.Check.greater_than_or_equal_to(to_cents_limit(value=min_invoice_value)),
+                ],
+                nullable=nullable,
             ),
         },
         index=pa.Index(pa.Int),
         strict=strict,
         coerce=coerce,
     )
+
+
+@lru_cache(maxsize=SCHEMA_CACHE_SIZE)
+def create_invoice_stats_schema(
+    optional_columns: Tuple[str, ...] = (),
+    coerce: bool = True,
+    strict: bool = True,
+    nullable: bool = True,
+):
+    """Function to validate that invoice stats schema is correct, it also does value checks in
+    runtime (really nice stuff, right here).
+
+    Args:
+        optional_columns (Tuple[str, ...]): Summary and quantile columns of get_quantiles that the
+            invoice stats hold, see invoice_stats_optional_columns, by default none
+        coerce (bool): Flag given to determine whether to coerce series to specified type
+        strict (bool): Flag given to determine whether or not to accept columns in the
+            dataframe that are not in the DataFrame
+        nullable (bool): If columns should be nullable or not
+
+    Returns: A pandas DataFrame schema that validates that the types are correct, of the median
+    and mean columns and of the given optional columns.
+
+    Notes:
+        The schema is cached by its arguments, as by create_invoice_schema. The optional columns
+        are part of the schema only when they are held, pandera 0.4 has no optional columns.
+
+    """
+    columns = {
+        INVOICE_STATS_COLUMN_NAMES.get("invoice_median"): pa.Column(pa.Float64, nullable=nullable),
+        INVOICE_STATS_COLUMN_NAMES.get("invoice_mean"): pa.Column(pa.Float64, nullable=nullable),
+    }
+    columns.update(
+        {column_name: pa.Column(pa.Float64, nullable=nullable) for column_name in optional_columns}
+    )
+
+    return pa.DataFrameSchema(columns, index=pa.Index(pa.Int), strict=strict, coerce=coerce)
+
+
+def invoice_stats_optional_columns(columns: Iterable[str]) -> Tuple[str, ...]:
+    """Function to get the summary and quantile columns of get_quantiles among columns.
+
+    Args:
+        columns (Iterable[str]): Given columns, e.g. of the invoice stats
+
+    Returns (Tuple[str, ...]): The summary columns, and the quantile columns, e.g. invoice_q95 or
+        invoice_q99.9, in the given order. Other columns are left out, so they are rejected by a
+        strict invoice stats schema.
+
+    """
+    return tuple(
+        column
+        for column in columns
+        if column in INVOICE_SUMMARY_COLUMN_NAMES.values()
+        or INVOICE_QUANTILE_COLUMN_PATTERN.fullmatch(column) is not None
+    )
+
+
+def quantile_column_name(quantile: float) -> str:
+    """Function to get the name of the invoice stats column of a quantile.
+
+    Args:
+        quantile (float): Given quantile, e.g. 0.95
+
+    Returns (str): The prefix and the percentile, e.g. invoice_q95
+
+    """
+    return f"{INVOICE_QUANTILE_COLUMN_PREFIX}{quantile * 100:g}"
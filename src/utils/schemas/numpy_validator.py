@@ -0,0 +1,392 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from src.utils.lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pandera as pa
+else:
+    pd = lazy_import("pandas")
+    pa = lazy_import("pandera")
+
+# Element-wise checks that can be compiled, by check name: the statistic that holds the bound,
+# and the comparison every valid value passes
+NUMPY_CHECKS: Dict[str, Tuple[str, Callable[[np.ndarray, object], np.ndarray]]] = {
+    "less_than_or_equal_to": ("max_value", np.less_equal),
+    "greater_than_or_equal_to": ("min_value", np.greater_equal),
+    "less_than": ("max_value", np.less),
+    "greater_than": ("min_value", np.greater),
+}
+
+
+class NumpyValidator:
+    """Validator of invoices with vectorised NumPy checks, compiled from a pandera schema.
+
+    The column dtypes, nullability, value bounds, index dtype, strictness and coercion are read
+    from the given pa.DataFrameSchema once, so the same schema definition drives both backends.
+    Validation then runs one NumPy comparison per check over the column arrays, instead of
+    pandera's generic machinery.
+
+    Invalid invoices raise pandera's SchemaError, for the same column, check and rows as pandera:
+    the error holds the column schema, the check (or its name, e.g. not_nullable) and the index and
+    value of every failure case. Values that cannot be coerced raise a SchemaError as well, older
+    pandera versions raise the error of pandas instead. pandera stays the reference backend, e.g.
+    to debug invalid invoices.
+
+    """
+
+    def __init__(self, schema: pa.DataFrameSchema) -> None:
+        """NumpyValidator constructor.
+
+        Args:
+            schema (pa.DataFrameSchema): Given schema, e.g. from create_invoice_schema
+
+        Raises:
+            ValueError: If the schema has a check that cannot be compiled
+
+        """
+        self.schema = schema
+        self.strict = schema.strict
+        self.coerce = schema.coerce
+
+        self._index_dtype = np.dtype(str(schema.index.dtype)) if schema.index is not None else None
+        self._columns = [
+            self._compile_column(name=name, column=column)
+            for name, column in schema.columns.items()
+        ]
+
+    def validate(self, invoices: pd.DataFrame) -> pd.DataFrame:
+        """Method to validate invoices.
+
+        Args:
+            invoices (pd.DataFrame): Given invoices
+
+        Returns (pd.DataFrame): The validated invoices, coerced to the dtypes of the schema
+
+        Raises:
+            SchemaError: If the invoices do not follow the schema
+
+        Notes:
+            The errors are raised in the order of pandera: columns that are not in the schema,
+            columns that are missing, dtype coercion (of the index and every column at once), and
+            then the null values and checks column by column.
+
+        """
+        if self.strict:
+            for column_name in invoices.columns:
+                if column_name not in self.schema.columns:
+                    self._raise(
+                        invoices=invoices,
+                        message=(
+                            f"column '{column_name}' not in DataFrameSchema {self.schema.columns}"
+                        ),
+                        failure_cases=pd.DataFrame(
+                            {"index": [None], "failure_case": [column_name]}
+                        ),
+                        check="column_in_schema",
+                    )
+
+        for name, *_ in self._columns:
+            if name not in invoices.columns:
+                self._raise(
+                    invoices=invoices,
+                    message=(
+                        f"column '{name}' not in dataframe. Columns in dataframe: "
+                        f"{invoices.columns.tolist()}"
+                    ),
+                    failure_cases=name,
+                    check="column_in_dataframe",
+                )
+
+        index, columns = self._coerce(invoices=invoices)
+
+        for name, dtype, nullable, checks in self._columns:
+            values, null_mask = columns[name]
+
+            if not nullable and null_mask.any():
+                nulls = pd.Series(values, index=index, name=name)[null_mask]
+                self._raise(
+                    invoices=invoices,
+                    message=f"non-nullable series '{name}' contains null values:\n{nulls}",
+                    failure_cases=pd.DataFrame(
+                        {"index": nulls.index, "failure_case": nulls.to_numpy()}
+                    ),
+                    schema=self.schema.columns[name],
+                    check="not_nullable",
+                )
+
+            for check_number, (check, compare, bound) in enumerate(checks):
+                # Null values are not checked, as by pandera
+                failure_mask = ~compare(values, bound) & ~null_mask
+
+                if failure_mask.any():
+                    failures = values[failure_mask]
+                    self._raise(
+                        invoices=invoices,
+                        message=(
+                            f"Column '{name}' failed element-wise validator number {check_number}: "
+                            f"{check.error or check.name} failure cases: "
+                            f"{', '.join(map(str, failures))}"
+                        ),
+                        failure_cases=pd.DataFrame(
+                            {"index": index[failure_mask], "failure_case": failures}
+                        ),
+                        schema=self.schema.columns[name],
+                        check=check,
+                        check_index=check_number,
+                    )
+
+        return pd.DataFrame(
+            {
+                column_name: columns[column_name][0]
+                if column_name in columns
+                else invoices[column_name].to_numpy()
+                for column_name in invoices.columns
+            },
+            index=index,
+        )
+
+    def _compile_column(
+        self, name: str, column: pa.Column
+    ) -> Tuple[str, Optional[np.dtype], bool, List[Tuple[pa.Check, Callable, object]]]:
+        """Private method to compile the dtype and checks of a schema column.
+
+        Args:
+            name (str): Name of the column
+            column (pa.Column): Column of the schema
+
+        Returns (Tuple[str, Optional[np.dtype], bool, List[Tuple[pa.Check, Callable, object]]]):
+            The name, the NumPy dtype or None for a string column, if the column is nullable, and
+            the check, comparison and bound of every check
+
+        Raises:
+            ValueError: If the column has a check that cannot be compiled
+
+        """
+        dtype = None if _is_string_column(column=column) else np.dtype(str(column.dtype))
+
+        checks = []
+        for check in column.checks:
+            if check.name not in NUMPY_CHECKS or dtype is None:
+                raise ValueError(
+                    f"The check {check.name} of column {name} cannot be compiled to NumPy, use "
+                    f"the pandera validation backend"
+                )
+
+            statistic, compare = NUMPY_CHECKS[check.name]
+            bound = dtype.type(check.statistics[statistic])
+            checks.append((check, compare, bound))
+
+        return name, dtype, column.nullable, checks
+
+    def _coerce(
+        self, invoices: pd.DataFrame
+    ) -> Tuple[pd.Index, Dict[str, Tuple[np.ndarray, np.ndarray]]]:
+        """Private method to coerce the index and the schema columns to their dtypes.
+
+        Args:
+            invoices (pd.DataFrame): Given invoices
+
+        Returns (Tuple[pd.Index, Dict[str, Tuple[np.ndarray, np.ndarray]]]): The coerced index,
+            and the coerced values and null mask of every schema column
+
+        Raises:
+            SchemaError: If the index or a column cannot be coerced, or does not have the dtype of
+                the schema when coerce is False
+
+        """
+        if not self.coerce:
+            self._check_dtypes(invoices=invoices)
+
+        index = invoices.index
+        columns = {}
+        failure_cases = []
+        failure_dtypes = []
+
+        if self._index_dtype is not None and index.dtype != self._index_dtype:
+            try:
+                index = index.astype(self._index_dtype)
+            except (TypeError, ValueError):
+                failure_cases.append(
+                    self._coercion_failure_cases(series=index.to_series(), dtype=self._index_dtype)
+                )
+                failure_dtypes.append(self._index_dtype)
+
+        for name, dtype, *_ in self._columns:
+            series = invoices[name]
+
+            try:
+                columns[name] = self._coerce_series(series=series, dtype=dtype)
+            except (TypeError, ValueError):
+                failure_cases.append(self._coercion_failure_cases(series=series, dtype=dtype))
+                failure_dtypes.append(dtype)
+
+        if failure_cases:
+            all_failure_cases = pd.concat(failure_cases, ignore_index=True)
+            self._raise(
+                invoices=invoices,
+                message=(
+                    f"Error while coercing to the schema dtypes, failure cases: "
+                    f"{', '.join(map(str, all_failure_cases['failure_case']))}"
+                ),
+                failure_cases=all_failure_cases,
+                check=f"coerce_dtype('{failure_dtypes[0] or 'str'}')",
+            )
+
+        return index, columns
+
+    def _check_dtypes(self, invoices: pd.DataFrame) -> None:
+        """Private method to check that the schema columns have their dtypes, when the schema does
+        not coerce.
+
+        Args:
+            invoices (pd.DataFrame): Given invoices
+
+        Raises:
+            SchemaError: If a column does not have the dtype of the schema
+
+        """
+        for name, dtype, *_ in self._columns:
+            series_dtype = invoices[name].dtype
+
+            if (
+                not pd.api.types.is_string_dtype(series_dtype)
+                if dtype is None
+                else series_dtype != dtype
+            ):
+                self._raise(
+                    invoices=invoices,
+                    message=(
+                        f"expected series '{name}' to have type {dtype or 'str'}, got "
+                        f"{series_dtype}"
+                    ),
+                    failure_cases=pd.DataFrame(
+                        {"index": [None], "failure_case": [str(series_dtype)]}
+                    ),
+                    schema=self.schema.columns[name],
+                    check=f"dtype('{dtype or 'str'}')",
+                )
+
+    def _coerce_series(
+        self, series: pd.Series, dtype: Optional[np.dtype]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Private method to coerce a column to its dtype.
+
+        Args:
+            series (pd.Series): Given column
+            dtype (Optional[np.dtype]): NumPy dtype of the column, None for a string column
+
+        Returns (Tuple[np.ndarray, np.ndarray]): The coerced values, and their null mask
+
+        Raises:
+            TypeError: If a value cannot be coerced
+            ValueError: If a value cannot be coerced
+
+        Notes:
+            Only the values of a string column that are not null are converted to str, the null
+            values are kept, as by pandera.
+
+        """
+        if dtype is None:
+            null_mask = series.isna()
+
+            return series.astype(str).where(~null_mask, series).array, null_mask.to_numpy()
+
+        if dtype.kind == "f":
+            values = series.to_numpy(dtype=dtype)
+
+            return values, np.isnan(values)
+
+        if pd.api.types.is_integer_dtype(series.dtype):
+            return series.to_numpy(dtype=dtype), np.zeros(series.shape[0], dtype=bool)
+
+        values = series.to_numpy(dtype=np.float64)
+
+        # Null values cannot be held by an integer dtype, they fail the coercion
+        if not np.isfinite(values).all():
+            raise ValueError(f"series '{series.name}' holds values that are not finite")
+
+        return values.astype(dtype), np.zeros(values.shape[0], dtype=bool)
+
+    def _coercion_failure_cases(self, series: pd.Series, dtype: Optional[np.dtype]) -> pd.DataFrame:
+        """Private method to find the values of a column or index that cannot be coerced.
+
+        Args:
+            series (pd.Series): Given column, or index as a series
+            dtype (Optional[np.dtype]): NumPy dtype it is coerced to
+
+        Returns (pd.DataFrame): The index and failure case of every value that cannot be coerced
+
+        """
+        coerced = pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64)
+
+        if dtype is not None and dtype.kind in "iu":
+            # Null and infinite values cannot be held by an integer dtype
+            failure_mask = ~np.isfinite(coerced)
+        else:
+            failure_mask = np.isnan(coerced) & series.notna().to_numpy()
+
+        return pd.DataFrame(
+            {"index": series.index[failure_mask], "failure_case": series[failure_mask].to_numpy()}
+        )
+
+    def _raise(
+        self,
+        invoices: pd.DataFrame,
+        message: str,
+        failure_cases: Union[str, pd.DataFrame],
+        schema: Optional[Union[pa.DataFrameSchema, pa.Column]] = None,
+        check: Optional[Union[str, pa.Check]] = None,
+        check_index: Optional[int] = None,
+    ) -> None:
+        """Private method to raise a SchemaError.
+
+        Args:
+            invoices (pd.DataFrame): Given invoices
+            message (str): Error message
+            failure_cases (Union[str, pd.DataFrame]): The index and failure case of every invalid
+                value, or the name of a missing column
+            schema (Optional[Union[pa.DataFrameSchema, pa.Column]]): The column schema of a column
+                error, by default the schema
+            check (Optional[Union[str, pa.Check]]): The failed check, or its name
+            check_index (Optional[int]): Number of the failed check of the column
+
+        Raises:
+            SchemaError: Always
+
+        """
+        raise pa.errors.SchemaError(
+            schema=self.schema if schema is None else schema,
+            data=invoices,
+            message=message,
+            failure_cases=failure_cases,
+            check=check,
+            check_index=check_index,
+        )
+
+
+def _is_string_column(column: pa.Column) -> bool:
+    """Function to check if a schema column holds strings, from its pandera dtype.
+
+    Args:
+        column (pa.Column): Column of the schema
+
+    Returns (bool): If the dtype of the column is pa.String
+
+    Notes:
+        pandera before 0.7 keeps the pa.String enum member of a column, whose pandas dtype is
+        object, later versions keep a data type of their pandas engine.
+
+    """
+    pandas_dtype = getattr(column, "pandas_dtype", None)
+
+    if pandas_dtype is not None:
+        return pandas_dtype is pa.String
+
+    from pandera.engines import pandas_engine
+
+    return pandas_engine.Engine.dtype(pa.String) == column.dtype
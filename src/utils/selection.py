@@ -0,0 +1,182 @@
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from src.utils.constants import PARALLEL_MEDIAN_MIN_ROWS, PARALLEL_MEDIAN_SAMPLE_SIZE
+
+# Half width of the candidate band around the median, in standard errors of the sample median
+_BAND_STANDARD_ERRORS = 6
+
+
+def exact_median(values: np.ndarray, scale: int = 1) -> float:
+    """Function to get the exact median of values by selection, O(n).
+
+    Args:
+        values (np.ndarray): Given values, e.g. a memory-mapped invoice value column
+        scale (int): The median is divided by scale, e.g. 100 to get units from cents
+
+    Returns (float): The median value, the mean of the two middle values if the number of values is
+        even (same as pd.Series.median), NaN if there are no values
+
+    Notes:
+        np.partition only places the middle value(s) at their sorted position, which is linear
+        instead of sorting all values.
+
+    """
+    value_count = values.shape[0]
+
+    if value_count == 0:
+        return float("nan")
+
+    return _select_median(
+        values=values, lower_rank=(value_count - 1) // 2, upper_rank=value_count // 2, scale=scale,
+    )
+
+
+def exact_quantiles(values: np.ndarray, quantiles: Sequence[float], scale: int = 1) -> List[float]:
+    """Function to get exact quantiles of values by one selection, O(n).
+
+    Args:
+        values (np.ndarray): Given values
+        quantiles (Sequence[float]): Given quantiles, 0 <= q <= 1, the 0 and 1 quantiles are the
+            minimum and maximum
+        scale (int): The quantiles are divided by scale, e.g. 100 to get units from cents
+
+    Returns (List[float]): One value per quantile, linearly interpolated between the two closest
+        values (same as pd.Series.quantile), NaN if there are no values
+
+    Notes:
+        np.quantile partitions the values once, around all the ranks the quantiles need, instead
+        of one pass per quantile.
+
+    """
+    if values.shape[0] == 0:
+        return [float("nan")] * len(quantiles)
+
+    return [value / scale for value in np.quantile(values, quantiles).tolist()]
+
+
+def parallel_exact_median(
+    values: np.ndarray,
+    scale: int = 1,
+    workers: int = 1,
+    min_row_count: int = PARALLEL_MEDIAN_MIN_ROWS,
+    sample_size: int = PARALLEL_MEDIAN_SAMPLE_SIZE,
+) -> float:
+    """Function to get the exact median of values by selection over chunks, on several cores.
+
+    Args:
+        values (np.ndarray): Given values, e.g. a memory-mapped invoice value column
+        scale (int): The median is divided by scale, e.g. 100 to get units from cents
+        workers (int): Number of threads, the values are split into one chunk per thread
+        min_row_count (int): Fewer values are selected by exact_median, by default 1000000
+        sample_size (int): Number of values sampled to narrow down the median, by default 65536
+
+    Returns (float): Exactly the value exact_median returns
+
+    Notes:
+        A random sample of the values gives a band [low, high] that holds the median with a very
+        high probability. Every thread counts the values of its chunk below the band and copies
+        out the values within it, NumPy releases the GIL for these passes. The median ranks are
+        then shifted by the number of values below the band, and selected from the band values,
+        a few percent of all values. In the unlikely case the band misses a median rank, the
+        median is selected from all values by exact_median.
+
+    """
+    value_count = values.shape[0]
+
+    if workers <= 1 or value_count < max(min_row_count, 1):
+        return exact_median(values=values, scale=scale)
+
+    lower_rank, upper_rank = (value_count - 1) // 2, value_count // 2
+    low, high = _sample_band(
+        values=values, lower_rank=lower_rank, upper_rank=upper_rank, sample_size=sample_size
+    )
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        chunk_bands = list(
+            executor.map(
+                lambda chunk: _band(values=chunk, low=low, high=high),
+                np.array_split(values, workers),
+            )
+        )
+
+    below_count = sum(below_count for below_count, _ in chunk_bands)
+    band_values = np.concatenate([band_values for _, band_values in chunk_bands])
+
+    if lower_rank < below_count or upper_rank - below_count >= band_values.shape[0]:
+        return exact_median(values=values, scale=scale)
+
+    return _select_median(
+        values=band_values,
+        lower_rank=lower_rank - below_count,
+        upper_rank=upper_rank - below_count,
+        scale=scale,
+    )
+
+
+def _select_median(values: np.ndarray, lower_rank: int, upper_rank: int, scale: int) -> float:
+    """Private function to get the median from the values at the two middle ranks.
+
+    Args:
+        values (np.ndarray): Given values
+        lower_rank (int): Rank of the lower middle value
+        upper_rank (int): Rank of the upper middle value, same as lower_rank for an odd number of
+            values
+        scale (int): The median is divided by scale
+
+    Returns (float): The median value
+
+    """
+    if lower_rank == upper_rank:
+        return np.partition(values, lower_rank)[lower_rank].item() / scale
+
+    values = np.partition(values, [lower_rank, upper_rank])
+
+    # .item() keeps integer values (cents) as Python ints, so the sum does not overflow
+    return (values[lower_rank].item() + values[upper_rank].item()) / (2 * scale)
+
+
+def _sample_band(
+    values: np.ndarray, lower_rank: int, upper_rank: int, sample_size: int
+) -> Tuple[float, float]:
+    """Private function to estimate a band of values around the median ranks from a sample.
+
+    Args:
+        values (np.ndarray): Given values
+        lower_rank (int): Rank of the lower middle value
+        upper_rank (int): Rank of the upper middle value
+        sample_size (int): Number of values to sample
+
+    Returns (Tuple[float, float]): Lowest and highest value of the band
+
+    """
+    value_count = values.shape[0]
+    sample = np.sort(
+        values[np.random.default_rng(seed=0).integers(0, value_count, size=sample_size)]
+    )
+
+    half_width = math.ceil(_BAND_STANDARD_ERRORS * math.sqrt(sample_size) / 2)
+    low_position = max(lower_rank * sample_size // value_count - half_width, 0)
+    high_position = min(upper_rank * sample_size // value_count + half_width, sample_size - 1)
+
+    return sample[low_position], sample[high_position]
+
+
+def _band(values: np.ndarray, low: float, high: float) -> Tuple[int, np.ndarray]:
+    """Private function to get the values of a chunk within a band.
+
+    Args:
+        values (np.ndarray): Chunk of values
+        low (float): Lowest value of the band
+        high (float): Highest value of the band
+
+    Returns (Tuple[int, np.ndarray]): Number of values below the band, and the values within it
+
+    """
+    below_count = int(np.count_nonzero(values < low))
+    band_values = values[(values >= low) & (values <= high)]
+
+    return below_count, band_values
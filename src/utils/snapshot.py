@@ -0,0 +1,75 @@
+import json
+import struct
+from typing import Dict, Tuple
+
+import numpy as np
+
+SNAPSHOT_MAGIC = b"GEOMSAGI"
+SNAPSHOT_VERSION = 1
+
+# Magic bytes, format version (uint16) and length of the JSON header (uint32), little endian
+SNAPSHOT_PREAMBLE = struct.Struct("<8sHI")
+
+
+def write_snapshot(path: str, header: Dict, arrays: Dict[str, np.ndarray]) -> None:
+    """Function to write a snapshot file.
+
+    Args:
+        path (str): Path of the snapshot file
+        header (Dict): JSON serialisable state
+        arrays (Dict[str, np.ndarray]): 1-D arrays, written as raw little endian bytes after the
+            header
+
+    Notes:
+        Layout: preamble | JSON header | array bytes, in the order listed in the header.
+
+    """
+    array_headers = [
+        {"name": name, "dtype": array.dtype.newbyteorder("<").str, "length": int(array.shape[0])}
+        for name, array in arrays.items()
+    ]
+    header_bytes = json.dumps({**header, "arrays": array_headers}).encode("utf-8")
+
+    with open(path, "wb") as snapshot_file:
+        snapshot_file.write(
+            SNAPSHOT_PREAMBLE.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(header_bytes))
+        )
+        snapshot_file.write(header_bytes)
+
+        for array_header, array in zip(array_headers, arrays.values()):
+            snapshot_file.write(np.ascontiguousarray(array, dtype=array_header["dtype"]).tobytes())
+
+
+def read_snapshot(path: str) -> Tuple[Dict, Dict[str, np.ndarray]]:
+    """Function to read a snapshot file written by write_snapshot.
+
+    Args:
+        path (str): Path of the snapshot file
+
+    Returns (Tuple[Dict, Dict[str, np.ndarray]]): The header, and the arrays by name
+
+    Raises:
+        ValueError: If the file is not a snapshot, or has another version
+
+    """
+    with open(path, "rb") as snapshot_file:
+        magic, version, header_length = SNAPSHOT_PREAMBLE.unpack(
+            snapshot_file.read(SNAPSHOT_PREAMBLE.size)
+        )
+
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise ValueError(
+                f"Not a version {SNAPSHOT_VERSION} snapshot: {path}, magic: {magic!r}, "
+                f"version: {version}"
+            )
+
+        header = json.loads(snapshot_file.read(header_length).decode("utf-8"))
+
+        arrays = {}
+        for array_header in header.pop("arrays"):
+            dtype = np.dtype(array_header["dtype"])
+            arrays[array_header["name"]] = np.frombuffer(
+                snapshot_file.read(dtype.itemsize * array_header["length"]), dtype=dtype
+            )
+
+    return header, arrays
@@ -0,0 +1,55 @@
+import signal
+from typing import Callable, Generator
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Seconds a test using the timeout fixture may run, e.g. a hanging process pool fails it
+TEST_TIMEOUT = 120
+
+
+@pytest.fixture()
+def timeout() -> Generator[None, None, None]:
+    """PyTest fixture that fails a test which runs for longer than TEST_TIMEOUT seconds"""
+
+    def _raise_timeout(signum, frame):
+        raise TimeoutError(f"The test did not finish within {TEST_TIMEOUT} seconds")
+
+    handler = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.alarm(TEST_TIMEOUT)
+
+    try:
+        yield
+
+    finally:
+        signal.alarm(0)
+        signal.signal(signal.SIGALRM, handler)
+
+
+@pytest.fixture()
+def make_invoices() -> Callable[..., pd.DataFrame]:
+    """PyTest fixture to create random invoices, with random names out of name_count names and
+    random values between 1 and max_invoice_value"""
+
+    def _make_invoices(
+        row_count: int, seed: int = 0, name_count: int = 100, max_invoice_value: float = 200000000
+    ) -> pd.DataFrame:
+        random_state = np.random.RandomState(seed=seed)
+        names = [f"company_{x}" for x in random_state.randint(0, name_count, size=row_count)]
+        values = np.round(random_state.uniform(1, max_invoice_value, size=row_count), 2)
+
+        return pd.DataFrame({"invoice_name": names, "invoice_value": values})
+
+    return _make_invoices
+
+
+@pytest.fixture()
+def rank_error() -> Callable[..., float]:
+    """PyTest fixture to compute the rank error of an approximate quantile, the distance between
+    the rank of the value among the values and the quantile q"""
+
+    def _rank_error(values: np.ndarray, value: float, q: float) -> float:
+        return abs(np.searchsorted(np.sort(values), value) / values.shape[0] - q)
+
+    return _rank_error
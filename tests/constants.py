@@ -1,4 +1,6 @@
 INVOICE_STATS_PATH = "src.invoice_stats"
+CONCURRENT_INVOICE_STATS_PATH = "src.concurrent_invoice_stats"
+INVOICE_VALIDATOR_PATH = "src.utils.invoice_validator"
 MAX_VALUE = 1234
 MIN_VALUE = 1
 LIMIT = 100
@@ -0,0 +1,91 @@
+import logging
+
+import pandas as pd
+import pytest
+from pandera.errors import SchemaError
+
+from src.invoice_stats import InvoiceStats
+
+LOGGER = logging.getLogger(__name__)
+
+LOGGER.info("Testing that invoices are streamed from CSV and Parquet files\nLoading...")
+
+
+@pytest.fixture()
+def invoices() -> pd.DataFrame:
+    """PyTest fixture with invoices to write to a file"""
+    return pd.DataFrame(
+        {
+            "invoice_name": [f"company_{index % 3}" for index in range(10)],
+            "invoice_value": [float(index + 1) for index in range(10)],
+            "invoice_comment": ["not stored"] * 10,
+        }
+    )
+
+
+@pytest.mark.parametrize("chunksize", [1, 3, 10, 100])
+def test_add_invoices_from_csv(tmp_path, invoices, chunksize):
+    path = str(tmp_path / "invoices.csv")
+    invoices.to_csv(path, index=False)
+
+    invoice_stats = InvoiceStats()
+    accepted_row_count = invoice_stats.add_invoices_from_file(path=path, chunksize=chunksize)
+
+    assert accepted_row_count == 10
+    assert invoice_stats.invoices.shape == (10, 2)
+
+    invoice_stats.get_mean()
+    invoice_stats.get_median()
+
+    assert invoice_stats.invoice_stats.values.tolist()[0] == [5.0, 5.0]  # 5.5 -> 5.0
+
+
+@pytest.mark.parametrize("chunksize, invoice_limit", [(3, 5), (5, 5), (100, 5)])
+def test_add_invoices_from_csv_invoice_limit(tmp_path, invoices, chunksize, invoice_limit):
+    path = str(tmp_path / "invoices.csv")
+    invoices.to_csv(path, index=False)
+
+    invoice_stats = InvoiceStats(invoice_limit=invoice_limit)
+    accepted_row_count = invoice_stats.add_invoices_from_file(path=path, chunksize=chunksize)
+
+    assert accepted_row_count == invoice_limit
+    assert invoice_stats.invoices["invoice_value"].tolist() == [1.0, 2.0, 3.0, 4.0, 5.0]
+
+    # Nothing is accepted once the limit is reached
+    assert invoice_stats.add_invoices_from_file(path=path, chunksize=chunksize) == 0
+
+
+def test_add_invoices_from_csv_failure(tmp_path, invoices):
+    path = str(tmp_path / "invoices.csv")
+    invoices.loc[7, "invoice_value"] = -1.0
+    invoices.to_csv(path, index=False)
+
+    invoice_stats = InvoiceStats()
+
+    with pytest.raises(SchemaError):
+        invoice_stats.add_invoices_from_file(path=path, chunksize=5)
+
+    # The chunk before the invalid invoice has been accepted
+    assert invoice_stats.invoices.shape[0] == 5
+
+
+def test_add_invoices_from_parquet(tmp_path, invoices):
+    pytest.importorskip("pyarrow")
+
+    path = str(tmp_path / "invoices.parquet")
+    invoices.to_parquet(path, index=False)
+
+    invoice_stats = InvoiceStats(fixed_point=True)
+    accepted_row_count = invoice_stats.add_invoices_from_file(path=path, chunksize=4)
+
+    assert accepted_row_count == 10
+    assert invoice_stats.invoices["invoice_value"].tolist() == [
+        (index + 1) * 100 for index in range(10)
+    ]
+
+
+def test_add_invoices_from_unknown_file_format(tmp_path):
+    invoice_stats = InvoiceStats()
+
+    with pytest.raises(ValueError):
+        invoice_stats.add_invoices_from_file(path=str(tmp_path / "invoices.json"))
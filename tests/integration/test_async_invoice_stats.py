@@ -0,0 +1,72 @@
+import asyncio
+import logging
+
+import numpy as np
+import pytest
+from pandera.errors import SchemaError
+
+from src.async_invoice_stats import AsyncInvoiceStats
+from src.invoice_stats import InvoiceStats
+
+LOGGER = logging.getLogger(__name__)
+
+LOGGER.info("Testing the asyncio front-end\nLoading...")
+
+
+@pytest.mark.parametrize("producer_count", [1, 8])
+@pytest.mark.parametrize("fixed_point", [False, True])
+def test_async_invoice_stats(producer_count, fixed_point):
+    random_state = np.random.RandomState(seed=producer_count)
+    invoice_values = np.round(random_state.uniform(1, 10000, size=5000), 2)
+
+    async def produce(async_invoice_stats, values):
+        for value in values.tolist():
+            await async_invoice_stats.submit(
+                invoice={"invoice_name": "company_a", "invoice_value": value}
+            )
+
+    async def run():
+        async with AsyncInvoiceStats(
+            invoice_stats=InvoiceStats(fixed_point=fixed_point),
+            max_batch_size=1000,
+            max_queue_size=500,
+        ) as async_invoice_stats:
+            await asyncio.gather(
+                *(
+                    produce(async_invoice_stats=async_invoice_stats, values=values)
+                    for values in np.array_split(invoice_values, producer_count)
+                )
+            )
+
+            return (
+                await async_invoice_stats.get_mean(),
+                await async_invoice_stats.get_median(),
+                async_invoice_stats.invoice_stats.invoice_count,
+            )
+
+    mean, median, invoice_count = asyncio.run(run())
+
+    assert invoice_count == 5000
+    assert mean == np.floor(invoice_values.mean() + 0.5)
+    assert median == np.floor(np.median(invoice_values) + 0.5)
+
+
+def test_async_invoice_stats_rejected_invoice():
+    async def run():
+        async with AsyncInvoiceStats(max_latency=0.01) as async_invoice_stats:
+            rejected = await async_invoice_stats.submit(
+                invoice={"invoice_name": "company_a", "invoice_value": -1}
+            )
+            added = await async_invoice_stats.submit(
+                invoice={"invoice_name": "company_b", "invoice_value": 10}
+            )
+
+            # The invalid invoice is rejected on its own, the valid one of its batch is added
+            with pytest.raises(SchemaError):
+                await rejected
+
+            await added
+
+            return await async_invoice_stats.get_mean()
+
+    assert asyncio.run(run()) == 10.0
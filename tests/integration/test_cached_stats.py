@@ -0,0 +1,89 @@
+import logging
+
+import pandas as pd
+import pytest
+
+from src.invoice_stats import InvoiceStats
+
+LOGGER = logging.getLogger(__name__)
+
+LOGGER.info("Testing that the stats are cached until the invoices change\nLoading...")
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{}, {"fixed_point": True}, {"sketch_k": 200}, {"storage_dir": "invoice_store"}]
+)
+def test_cached_stats(make_invoices, kwargs, tmp_path):
+    if "storage_dir" in kwargs:
+        kwargs = {"storage_dir": str(tmp_path / kwargs["storage_dir"])}
+
+    invoice_stats = InvoiceStats(metrics=True, **kwargs)
+    invoice_stats.add_invoice(
+        invoice=make_invoices(row_count=1000, name_count=10, max_invoice_value=10000)
+    )
+
+    invoice_stats.get_stats(quantiles=[0.95])
+    stats = invoice_stats.invoice_stats.copy()
+
+    # Polling the stats does not compute them again
+    for _ in range(3):
+        invoice_stats.get_mean()
+        invoice_stats.get_median()
+        invoice_stats.get_quantiles(quantiles=[0.95])
+
+    pd.testing.assert_frame_equal(invoice_stats.invoice_stats, stats)
+    assert invoice_stats.metrics()["timings"]["aggregation"]["count"] == 1
+
+    # A change is picked up by the next fetch
+    invoice_stats.add_invoice(invoice=make_invoices(row_count=10, seed=1).assign(invoice_value=1.0))
+    invoice_stats.get_stats(quantiles=[0.95])
+
+    assert invoice_stats.invoice_stats["invoice_count"][0] == 1010
+    assert invoice_stats.invoice_stats["invoice_min"][0] == 1.0
+    assert invoice_stats.metrics()["timings"]["aggregation"]["count"] == 2
+
+
+@pytest.mark.parametrize("fixed_point", [False, True])
+def test_fused_stats(make_invoices, fixed_point):
+    invoices = make_invoices(row_count=1000, name_count=10, max_invoice_value=10000)
+
+    invoice_stats = InvoiceStats(fixed_point=fixed_point)
+    invoice_stats.add_invoice(invoice=invoices)
+    invoice_stats.get_stats(quantiles=[0.25, 0.95])
+
+    # Same stats as fetched one by one
+    separate_invoice_stats = InvoiceStats(fixed_point=fixed_point)
+    separate_invoice_stats.add_invoice(invoice=invoices)
+    separate_invoice_stats.get_mean()
+    separate_invoice_stats.get_median()
+    separate_invoice_stats.get_quantiles(quantiles=[0.25, 0.95])
+
+    pd.testing.assert_frame_equal(invoice_stats.invoice_stats, separate_invoice_stats.invoice_stats)
+
+
+def test_cached_stats_after_remove_and_clear():
+    invoice_stats = InvoiceStats()
+    invoice_stats.add_invoices(
+        invoices=[
+            {"invoice_name": "company_a", "invoice_value": 10},
+            {"invoice_name": "company_b", "invoice_value": 20},
+            {"invoice_name": "company_c", "invoice_value": 60},
+        ]
+    )
+    invoice_stats.get_stats()
+
+    assert invoice_stats.invoice_stats["invoice_mean"][0] == 30.0
+    assert invoice_stats.invoice_stats["invoice_median"][0] == 20.0
+
+    invoice_stats.remove_invoices(names=["company_c"])
+    invoice_stats.get_stats()
+
+    assert invoice_stats.invoice_stats["invoice_mean"][0] == 15.0
+    assert invoice_stats.invoice_stats["invoice_median"][0] == 15.0
+
+    invoice_stats.clear()
+    invoice_stats.add_invoice(invoice={"invoice_name": "company_d", "invoice_value": 40})
+    invoice_stats.get_mean()
+
+    # The row dropped by clear is assigned again
+    assert invoice_stats.invoice_stats["invoice_mean"][0] == 40.0
@@ -0,0 +1,59 @@
+import logging
+import threading
+
+import numpy as np
+import pytest
+
+from src.concurrent_invoice_stats import ConcurrentInvoiceStats
+
+LOGGER = logging.getLogger(__name__)
+
+LOGGER.info("Testing concurrent writers and readers\nLoading...")
+
+
+@pytest.mark.parametrize("writer_count, shard_count", [(8, 4), (4, 8), (16, 1)])
+@pytest.mark.parametrize("fixed_point", [False, True])
+def test_concurrent_invoice_stats(writer_count, shard_count, fixed_point):
+    random_state = np.random.RandomState(seed=writer_count)
+    invoice_values = np.round(random_state.uniform(1, 10000, size=20000), 2)
+    concurrent_invoice_stats = ConcurrentInvoiceStats(
+        invoice_limit=15000, fixed_point=fixed_point, shard_count=shard_count
+    )
+    snapshots = []
+
+    def write(values):
+        for batch in np.array_split(values, 20):
+            concurrent_invoice_stats.add_invoices(
+                invoices=[
+                    {"invoice_name": "company_a", "invoice_value": value}
+                    for value in batch.tolist()
+                ]
+            )
+
+    def read():
+        for _ in range(20):
+            snapshots.append(concurrent_invoice_stats.get_stats())
+
+    threads = [
+        threading.Thread(target=write, args=(values,))
+        for values in np.array_split(invoice_values, writer_count)
+    ] + [threading.Thread(target=read)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    # The invoice limit holds across all shards, and the stats match the invoices that were added
+    held_values = np.concatenate(
+        [buffer.values for buffer in concurrent_invoice_stats._shard_buffers]
+    ) / (100 if fixed_point else 1)
+    stats = concurrent_invoice_stats.get_stats()
+
+    assert stats["invoice_count"] == 15000
+    assert stats["invoice_mean"] == pytest.approx(held_values.mean(), rel=1e-12)
+    assert stats["invoice_median"] == pytest.approx(np.median(held_values), rel=1e-15)
+
+    # Every snapshot counted whole batches only
+    assert all(snapshot["invoice_count"] <= 15000 for snapshot in snapshots)
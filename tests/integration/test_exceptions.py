@@ -58,8 +58,8 @@ def test_get_median_failure(incorrect_invoice):
     invoice_stats = InvoiceStats()
     invoice_stats.add_invoice(incorrect_invoice)
 
-    # force wrong value
-    invoice_stats.invoices["invoice_value"] = "abc"
+    # force wrong value, the median is read from the running median
+    invoice_stats._running_median._lower[0] = "abc"
 
     with pytest.raises(Exception):
         invoice_stats.get_median()
@@ -79,8 +79,8 @@ def test_get_mean_failure(incorrect_invoice):
     invoice_stats = InvoiceStats()
     invoice_stats.add_invoice(incorrect_invoice)
 
-    # force wrong value
-    invoice_stats.invoices["invoice_value"] = "abc"
+    # force wrong value, the mean is read from the running sum
+    invoice_stats._running_sum._fraction_total = "abc"
 
     with pytest.raises(Exception):
         invoice_stats.get_mean()
@@ -96,13 +96,78 @@ def test_get_mean_failure(incorrect_invoice):
         }
     ],
 )
-def test_set_agg_value_invoice_values_failure(incorrect_invoice):
+def test_compute_aggregates_failure(incorrect_invoice):
     invoice_stats = InvoiceStats()
 
     invoice_stats.add_invoice(invoice=incorrect_invoice)
 
     # force wrong value
-    invoice_stats.invoices["invoice_value"] = "abc"
+    invoice_stats._running_sum._fraction_total = "abc"
 
-    with pytest.raises(Exception):
-        invoice_stats._set_agg_value_invoice_values(row=0, column="asdasd", agg_type="mean")
+    with pytest.raises(TypeError):
+        invoice_stats._compute_aggregates(columns=[invoice_stats.mean_col_name])
+
+
+@pytest.mark.parametrize(
+    "valid_invoice, incorrect_invoice",
+    [
+        (
+            {"invoice_name": f"company_ok", "invoice_value": Decimal(123)},
+            {"invoice_name": f"company_fail", "invoice_value": Decimal(-1000000)},
+        )
+    ],
+)
+def test_insert_failure_keeps_stored_invoices(valid_invoice, incorrect_invoice):
+    invoice_stats = InvoiceStats()
+    invoice_stats.add_invoice(invoice=valid_invoice)
+
+    with pytest.raises(SchemaError):
+        invoice_stats.add_invoice(invoice=incorrect_invoice)
+
+    # The rejected invoice is never added to the invoice table
+    assert invoice_stats.invoices.shape[0] == 1
+
+
+@pytest.mark.parametrize(
+    "incorrect_invoice",
+    [
+        {
+            "invoice_name": f"company_fail",
+            "invoice_value": 123.0,  # type: ignore
+        }
+    ],
+)
+def test_validate_all_failure(incorrect_invoice):
+    invoice_stats = InvoiceStats()
+    invoice_stats.add_invoice(incorrect_invoice)
+
+    # force wrong value
+    invoice_stats.invoices["invoice_value"] = -1.0
+
+    with pytest.raises(SchemaError):
+        invoice_stats.validate_all()
+
+
+@pytest.mark.parametrize("fixed_point", [False, True])
+@pytest.mark.parametrize("stored_on_disk", [False, True])
+def test_validate_all_after_inserts(tmp_path, fixed_point, stored_on_disk):
+    invoice_stats = InvoiceStats(
+        fixed_point=fixed_point,
+        storage_dir=str(tmp_path / "invoice_store") if stored_on_disk else None,
+    )
+    invoice_stats.add_invoices(
+        invoices=[
+            {"invoice_name": f"company_a", "invoice_value": Decimal(123)},
+            {"invoice_name": f"company_b", "invoice_value": Decimal(456)},
+        ]
+    )
+    invoice_stats.add_invoice(invoice={"invoice_name": f"company_a", "invoice_value": 789.0})
+
+    # The stored invoices follow the invoice schema, the names are not dictionary encoded
+    invoice_stats.validate_all()
+
+    assert invoice_stats.invoices["invoice_name"].tolist() == [
+        "company_a",
+        "company_b",
+        "company_a",
+    ]
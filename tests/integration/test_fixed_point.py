@@ -0,0 +1,90 @@
+import logging
+from decimal import Decimal
+
+import pytest
+from pandera.errors import SchemaError, SchemaErrors
+
+from src.invoice_stats import InvoiceStats
+from src.utils.constants import MAX_INVOICE_VALUE, MIN_INVOICE_VALUE
+
+LOGGER = logging.getLogger(__name__)
+
+LOGGER.info("Testing that invoice values can be stored as int64 cents\nLoading...")
+
+
+@pytest.mark.parametrize(
+    "random_invoices, expected_mean, expected_median",
+    [
+        (
+            [
+                {"invoice_name": f"company_a", "invoice_value": Decimal(11)},
+                {"invoice_name": f"company_b", "invoice_value": Decimal(123333.123)},
+                {"invoice_name": f"company_c", "invoice_value": Decimal(100000200.23)},
+                {"invoice_name": f"company_d", "invoice_value": Decimal(200000000.00)},
+            ],
+            75030886.0,  # 75030886.0875 -> 75030886.0
+            50061767.0,  # 50061766.675 -> 50061767.0
+        ),
+        (
+            [
+                {"invoice_name": f"company_a", "invoice_value": Decimal("1.10")},
+                {"invoice_name": f"company_b", "invoice_value": Decimal("2.20")},
+                {"invoice_name": f"company_c", "invoice_value": "3.30"},
+            ],
+            2.0,  # 2.2 -> 2.0
+            2.0,  # 2.2 -> 2.0
+        ),
+    ],
+)
+def test_mean_and_median_of_invoices_in_cents(random_invoices, expected_mean, expected_median):
+    invoice_stats = InvoiceStats(fixed_point=True)
+
+    invoice_stats.add_invoices(invoices=random_invoices)
+
+    # Invoice values are stored as int64 cents
+    assert invoice_stats.invoices["invoice_value"].dtype == "int64"
+
+    invoice_stats.get_mean()
+    invoice_stats.get_median()
+
+    assert invoice_stats.invoice_stats.values.tolist()[0] == [expected_mean, expected_median]
+
+
+def test_exact_mean_in_cents():
+    invoice_stats = InvoiceStats(fixed_point=True)
+
+    invoice_stats.add_invoices(
+        invoices=[{"invoice_name": f"company_a", "invoice_value": "1.10"}] * 3
+        + [{"invoice_name": f"company_b", "invoice_value": "1.20"}] * 3
+    )
+
+    assert invoice_stats.invoices["invoice_value"].tolist() == [110] * 3 + [120] * 3
+    assert invoice_stats._running_sum.mean(scale=100) == 1.15
+    assert invoice_stats._running_median.median(scale=100) == 1.15
+
+
+@pytest.mark.parametrize(
+    "incorrect_invoice",
+    [
+        {"invoice_name": f"company_fail", "invoice_value": MAX_INVOICE_VALUE + Decimal("0.01")},
+        {"invoice_name": f"company_fail", "invoice_value": MIN_INVOICE_VALUE - Decimal("0.01")},
+        {"invoice_name": f"company_fail", "invoice_value": "abc"},
+    ],
+)
+def test_insert_failure_in_cents(incorrect_invoice):
+    invoice_stats = InvoiceStats(fixed_point=True)
+
+    # The bounds are enforced in cents
+    invoice_stats.add_invoice(
+        invoice={"invoice_name": f"company_max", "invoice_value": MAX_INVOICE_VALUE}
+    )
+    invoice_stats.add_invoice(
+        invoice={"invoice_name": f"company_min", "invoice_value": MIN_INVOICE_VALUE}
+    )
+
+    # Same errors as when the invoice values are stored as float64
+    with pytest.raises((SchemaError, SchemaErrors)):
+        invoice_stats.add_invoice(invoice=incorrect_invoice)
+
+    assert invoice_stats.invoices.shape[0] == 2
+    invoice_stats.validate_all()
@@ -0,0 +1,64 @@
+import logging
+from decimal import Decimal
+
+import pytest
+
+from src.invoice_stats import InvoiceStats
+
+LOGGER = logging.getLogger(__name__)
+
+LOGGER.info("Testing the stats per invoice name\nLoading...")
+
+
+@pytest.mark.parametrize(
+    "random_invoices",
+    [
+        [
+            {"invoice_name": "company_a", "invoice_value": Decimal("11.00")},
+            {"invoice_name": "company_b", "invoice_value": Decimal("123333.12")},
+            {"invoice_name": "company_a", "invoice_value": Decimal("100000200.23")},
+            {"invoice_name": "company_a", "invoice_value": Decimal("20.50")},
+        ]
+    ],
+)
+@pytest.mark.parametrize("fixed_point", [False, True])
+def test_group_stats(random_invoices, fixed_point):
+    invoice_stats = InvoiceStats(fixed_point=fixed_point, group_stats=True)
+    invoice_stats.add_invoices(invoices=random_invoices[:2])
+    invoice_stats.add_invoice(invoice=random_invoices[2])
+    invoice_stats.add_invoice(invoice=random_invoices[3])
+
+    group_stats = invoice_stats.get_group_stats(name="company_a")
+
+    assert group_stats["invoice_count"] == 3
+    assert group_stats["invoice_mean"] == pytest.approx((11.0 + 100000200.23 + 20.5) / 3)
+    assert group_stats["invoice_median"] == 20.5
+
+    all_group_stats = invoice_stats.get_all_group_stats()
+
+    assert all_group_stats.index.tolist() == ["company_a", "company_b"]
+    assert all_group_stats.loc["company_b"].tolist() == [1, 123333.12, 123333.12]
+
+    with pytest.raises(KeyError):
+        invoice_stats.get_group_stats(name="company_c")
+
+
+def test_group_stats_reopened_store(tmp_path):
+    storage_dir = str(tmp_path / "invoice_store")
+
+    invoice_stats = InvoiceStats(storage_dir=storage_dir, group_stats=True)
+    invoice_stats.add_invoices(
+        invoices=[
+            {"invoice_name": "company_a", "invoice_value": 10},
+            {"invoice_name": "company_a", "invoice_value": 20},
+        ]
+    )
+
+    # The group stats are rebuilt from the stored invoices
+    reopened_invoice_stats = InvoiceStats(storage_dir=storage_dir, group_stats=True)
+
+    assert reopened_invoice_stats.get_group_stats(name="company_a") == {
+        "invoice_count": 2,
+        "invoice_mean": 15.0,
+        "invoice_median": 15.0,
+    }
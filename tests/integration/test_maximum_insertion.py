@@ -2,7 +2,6 @@ import logging
 import random
 import string
 from decimal import Decimal
-from time import process_time
 
 import pytest
 
@@ -35,29 +34,12 @@ LOGGER.info(
 )
 def test_20_million_insert_of_invoices(random_invoices):
     invoice_stats = InvoiceStats()
-    t_insert_20_million_rows = process_time()
     invoice_stats.add_invoices(invoices=random_invoices)
-    elapsed_time_insert_20_million_rows = process_time() - t_insert_20_million_rows
-
-    LOGGER.info(
-        f"elapsed_time_insert_20_million_rows: {elapsed_time_insert_20_million_rows} seconds"
-    )
 
     invoice_stats.invoice_schema.validate(invoice_stats.invoices)
 
-    t_get_median_20_million_rows = process_time()
     invoice_stats.get_median()
-    elapsed_time_get_median_20_million_rows = process_time() - t_get_median_20_million_rows
-
-    LOGGER.info(
-        f"elapsed_time_get_median_20_million_rows: {elapsed_time_get_median_20_million_rows} seconds"
-    )
-
-    t_get_mean_20_million_rows = process_time()
     invoice_stats.get_mean()
-    elapsed_time_get_mean_20_million_rows = process_time() - t_get_mean_20_million_rows
-
-    LOGGER.info(f"elapsed_time_get_mean_20_million_rows: {elapsed_time_get_mean_20_million_rows}")
 
     LOGGER.info(f"\n{invoice_stats.invoice_stats.to_string()}\n")
 
@@ -1,6 +1,9 @@
 import logging
+import math
 from decimal import Decimal
 
+import numpy as np
+import pandas as pd
 import pytest
 
 from src.invoice_stats import InvoiceStats
@@ -50,3 +53,29 @@ def test_mean_and_median_of_invoices(random_invoices, expected_mean, expected_me
         f"{invoice_stats.invoice_stats.values.tolist()[0]} == {[expected_mean, expected_median]}"
     )
     assert invoice_stats.invoice_stats.values.tolist()[0] == [expected_mean, expected_median]
+
+
+@pytest.mark.parametrize(
+    "values, expected_values",
+    [
+        (
+            [3.5, 3.6, 3.4, 3.0, 0.5, 0.51, -3.5, -3.6, np.nan, np.inf],
+            [3.0, 4.0, 3.0, 3.0, 0.0, 1.0, -4.0, -4.0, np.nan, np.inf],
+        )
+    ],
+)
+def test_round_down_values(values, expected_values):
+    invoice_stats = InvoiceStats()
+    invoice_stats.invoice_stats = pd.DataFrame({"invoice_mean": values})
+
+    invoice_stats._round_down(column="invoice_mean")
+
+    # Same semantics as: np.ceil(x) if math.modf(x)[0] > 0.5 else np.floor(x)
+    expected_values_by_modf = [
+        np.ceil(value) if math.modf(value)[0] > 0.5 else np.floor(value) for value in values
+    ]
+
+    np.testing.assert_array_equal(invoice_stats.invoice_stats["invoice_mean"], expected_values)
+    np.testing.assert_array_equal(
+        invoice_stats.invoice_stats["invoice_mean"], expected_values_by_modf
+    )
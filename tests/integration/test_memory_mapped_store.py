@@ -0,0 +1,62 @@
+import logging
+from decimal import Decimal
+
+import pytest
+
+from src.invoice_stats import InvoiceStats
+
+LOGGER = logging.getLogger(__name__)
+
+LOGGER.info(
+    "Testing that invoices are stored in, and reopened from, memory-mapped files\nLoading..."
+)
+
+
+@pytest.mark.parametrize(
+    "random_invoices, random_invoice, expected_mean, expected_median",
+    [
+        (
+            [
+                {"invoice_name": f"company_a", "invoice_value": Decimal(11)},
+                {"invoice_name": f"company_b", "invoice_value": Decimal(123333.123)},
+                {"invoice_name": f"company_c", "invoice_value": Decimal(100000200.23)},
+                {"invoice_name": f"company_d", "invoice_value": Decimal(200000000.00)},
+            ],
+            {"invoice_name": f"company_a", "invoice_value": Decimal(999)},
+            75030886.0,  # 75030886.08825 -> 75030886.0
+            50061767.0,  # 50061766.6765 -> 50061767.0
+        )
+    ],
+)
+@pytest.mark.parametrize("fixed_point", [False, True])
+def test_reopen_memory_mapped_store(
+    tmp_path, random_invoices, random_invoice, expected_mean, expected_median, fixed_point
+):
+    storage_dir = str(tmp_path / "invoice_store")
+
+    invoice_stats = InvoiceStats(storage_dir=storage_dir, fixed_point=fixed_point)
+    invoice_stats.add_invoices(invoices=random_invoices)
+    invoice_stats.get_mean()
+    invoice_stats.get_median()
+
+    assert invoice_stats.invoice_stats.values.tolist()[0] == [expected_mean, expected_median]
+
+    # Reopen the store, the invoices are not inserted again
+    reopened_invoice_stats = InvoiceStats(storage_dir=storage_dir, fixed_point=fixed_point)
+
+    assert reopened_invoice_stats.invoices.shape == (len(random_invoices), 2)
+
+    reopened_invoice_stats.get_mean()
+    reopened_invoice_stats.get_median()
+
+    assert reopened_invoice_stats.invoice_stats.values.tolist()[0] == [
+        expected_mean,
+        expected_median,
+    ]
+
+    # Inserts continue after the stored invoices
+    reopened_invoice_stats.add_invoice(invoice=random_invoice)
+    reopened_invoice_stats.validate_all()
+
+    assert reopened_invoice_stats.invoices.shape == (len(random_invoices) + 1, 2)
+    assert reopened_invoice_stats.invoices["invoice_name"].tolist()[-1] == "company_a"
@@ -0,0 +1,84 @@
+import logging
+from decimal import Decimal
+
+import pytest
+from pandera.errors import SchemaError, SchemaErrors
+
+from src.invoice_stats import InvoiceStats
+from src.utils.metrics import MetricsSink
+
+LOGGER = logging.getLogger(__name__)
+
+LOGGER.info("Testing the metrics of the insert and aggregation phases\nLoading...")
+
+
+class RecordingSink(MetricsSink):
+    def __init__(self):
+        self.timings = []
+        self.counters = {}
+
+    def record_timing(self, name, seconds):
+        self.timings.append(name)
+
+    def increment(self, name, value):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+
+@pytest.mark.parametrize("fixed_point", [False, True])
+def test_metrics(fixed_point):
+    invoice_stats = InvoiceStats(invoice_limit=Decimal(3), fixed_point=fixed_point, metrics=True)
+
+    invoice_stats.add_invoices(
+        invoices=[
+            {"invoice_name": "company_a", "invoice_value": Decimal(11)},
+            {"invoice_name": "company_b", "invoice_value": Decimal(12)},
+        ]
+    )
+
+    with pytest.raises((SchemaError, SchemaErrors)):
+        invoice_stats.add_invoice(invoice={"invoice_name": "company_c", "invoice_value": 0})
+
+    # Only one of the two invoices fits within the limit
+    invoice_stats.add_invoices(
+        invoices=[
+            {"invoice_name": "company_d", "invoice_value": Decimal(13)},
+            {"invoice_name": "company_e", "invoice_value": Decimal(14)},
+        ]
+    )
+    invoice_stats.get_mean()
+    invoice_stats.get_median()
+
+    metrics = invoice_stats.metrics()
+
+    assert metrics["counters"] == {"rows_accepted": 3, "rows_rejected": 2}
+    assert metrics["gauges"]["rows_held"] == 3
+    assert metrics["gauges"]["bytes_held"] > 0
+    assert metrics["timings"]["frame_construction"]["count"] == 2
+    assert metrics["timings"]["validation"]["count"] == 3
+    assert metrics["timings"]["append"]["count"] == 2
+    assert metrics["timings"]["aggregation"]["count"] == 2
+    assert ("conversion" in metrics["timings"]) == fixed_point
+
+
+def test_metrics_disabled():
+    invoice_stats = InvoiceStats()
+    invoice_stats.add_invoice(invoice={"invoice_name": "company_a", "invoice_value": 11})
+
+    metrics = invoice_stats.metrics()
+
+    # The counters and timings are not recorded, the gauges are always up to date
+    assert metrics["counters"] == {}
+    assert metrics["timings"] == {}
+    assert metrics["gauges"]["rows_held"] == 1
+
+
+def test_metrics_reset_and_sink():
+    sink = RecordingSink()
+    invoice_stats = InvoiceStats(metrics_sink=sink)
+    invoice_stats.add_invoice(invoice={"invoice_name": "company_a", "invoice_value": 11})
+
+    assert invoice_stats.metrics(reset=True)["counters"] == {"rows_accepted": 1}
+    assert invoice_stats.metrics()["counters"] == {}
+
+    assert sink.counters == {"rows_accepted": 1}
+    assert sink.timings == ["validation", "append"]
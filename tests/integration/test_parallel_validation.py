@@ -0,0 +1,58 @@
+import logging
+
+import pandas as pd
+import pytest
+from pandera.errors import SchemaError, SchemaErrors
+
+from src.invoice_stats import InvoiceStats
+from src.utils.constants import PARALLEL_VALIDATION_MIN_ROWS
+
+LOGGER = logging.getLogger(__name__)
+
+LOGGER.info("Testing that large batches can be validated by a pool of workers\nLoading...")
+
+pytestmark = pytest.mark.usefixtures("timeout")
+
+
+@pytest.mark.parametrize("fixed_point", [False, True])
+def test_parallel_validation(make_invoices, fixed_point):
+    invoices = make_invoices(row_count=PARALLEL_VALIDATION_MIN_ROWS + 1)
+
+    serial_invoice_stats = InvoiceStats(fixed_point=fixed_point)
+    serial_invoice_stats.add_invoice(invoice=invoices)
+    serial_invoice_stats.get_mean()
+    serial_invoice_stats.get_median()
+
+    parallel_invoice_stats = InvoiceStats(fixed_point=fixed_point, validation_workers=2)
+    parallel_invoice_stats.add_invoice(invoice=invoices)
+    parallel_invoice_stats.get_mean()
+    parallel_invoice_stats.get_median()
+    parallel_invoice_stats.validate_all()
+
+    # The batches were validated by the pool of workers, it is kept until close
+    assert parallel_invoice_stats._validator._parallel_validator._executor is not None
+    parallel_invoice_stats.close()
+
+    pd.testing.assert_frame_equal(parallel_invoice_stats.invoices, serial_invoice_stats.invoices)
+    pd.testing.assert_frame_equal(
+        parallel_invoice_stats.invoice_stats, serial_invoice_stats.invoice_stats
+    )
+
+
+def test_parallel_validation_error(make_invoices):
+    invoices = make_invoices(row_count=PARALLEL_VALIDATION_MIN_ROWS + 1)
+    invoices.loc[PARALLEL_VALIDATION_MIN_ROWS, "invoice_value"] = 0.0
+
+    with pytest.raises((SchemaError, SchemaErrors)) as serial_error:
+        InvoiceStats().add_invoice(invoice=invoices)
+
+    parallel_invoice_stats = InvoiceStats(validation_workers=2)
+
+    with pytest.raises((SchemaError, SchemaErrors)) as parallel_error:
+        parallel_invoice_stats.add_invoice(invoice=invoices)
+
+    parallel_invoice_stats.close()
+
+    # Same error as the serial path, and none of the invoices are added
+    assert str(parallel_error.value) == str(serial_error.value)
+    assert parallel_invoice_stats.invoice_count == 0
@@ -0,0 +1,63 @@
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+import numpy as np
+import pytest
+
+from src.invoice_stats import InvoiceStats
+from src.utils.partial_aggregate import PartialAggregate, merge_partial_aggregates
+from src.utils.quantile_sketch import QuantileSketch
+
+LOGGER = logging.getLogger(__name__)
+
+LOGGER.info("Testing partial aggregates merged across processes\nLoading...")
+
+
+def aggregate_invoices(values: List[float], fixed_point: bool, exact: bool) -> PartialAggregate:
+    """Function run by the worker processes, to aggregate a part of the invoices"""
+    invoice_stats = InvoiceStats(fixed_point=fixed_point)
+    invoice_stats.add_invoices(
+        invoices=[{"invoice_name": "company_a", "invoice_value": value} for value in values]
+    )
+
+    return invoice_stats.to_partial_aggregate(exact=exact)
+
+
+@pytest.mark.parametrize("exact", [False, True])
+@pytest.mark.parametrize("fixed_point", [False, True])
+def test_merge_partial_aggregates_from_processes(exact, fixed_point):
+    random_state = np.random.RandomState(seed=0)
+    invoice_values = np.round(random_state.uniform(1, 10000, size=40000), 2)
+    parts = [part.tolist() for part in np.array_split(invoice_values, 4)]
+
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        partial_aggregates = list(
+            executor.map(
+                aggregate_invoices, parts, [fixed_point] * len(parts), [exact] * len(parts)
+            )
+        )
+
+    merged = merge_partial_aggregates(partial_aggregates=partial_aggregates)
+    invoice_stats = InvoiceStats.from_partial_aggregate(partial_aggregate=merged)
+    invoice_stats.get_mean()
+    invoice_stats.get_median()
+
+    # The mean is exact
+    assert len(merged) == 40000
+    assert merged.mean() == pytest.approx(invoice_values.mean(), rel=1e-14)
+    assert invoice_stats.invoice_stats["invoice_mean"][0] == np.floor(invoice_values.mean() + 0.5)
+    assert (merged.min_value, merged.max_value) == (invoice_values.min(), invoice_values.max())
+
+    if exact:
+        assert merged.median() == pytest.approx(np.median(invoice_values), rel=1e-15)
+        assert invoice_stats.invoice_stats["invoice_median"][0] == np.floor(
+            np.median(invoice_values) + 0.5
+        )
+    else:
+        # The median is within the rank error bound of the sketch
+        median_rank = (
+            np.searchsorted(np.sort(invoice_values), merged.median()) / invoice_values.shape[0]
+        )
+
+        assert abs(median_rank - 0.5) <= QuantileSketch.normalized_rank_error(k=200)
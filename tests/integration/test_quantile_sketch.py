@@ -0,0 +1,85 @@
+import logging
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.invoice_stats import InvoiceStats
+from src.utils.quantile_sketch import QuantileSketch
+
+LOGGER = logging.getLogger(__name__)
+
+LOGGER.info("Testing the approximate quantiles of the sketch mode\nLoading...")
+
+SKETCH_K = 200
+
+
+@pytest.mark.parametrize("fixed_point", [False, True])
+def test_sketch_mode(make_invoices, rank_error, fixed_point):
+    # The invoice limit is not enforced, the sketch holds no invoices
+    invoice_stats = InvoiceStats(invoice_limit=1000, fixed_point=fixed_point, sketch_k=SKETCH_K)
+    batches = [make_invoices(row_count=10000, seed=seed) for seed in range(5)]
+
+    for batch in batches:
+        invoice_stats.add_invoice(invoice=batch)
+
+    values = pd.concat(batches)["invoice_value"].to_numpy()
+
+    assert invoice_stats.invoice_count == values.shape[0]
+    assert invoice_stats.invoices.empty
+
+    invoice_stats.get_mean()
+    invoice_stats.get_median()
+
+    # The mean stays exact, the median and quantiles are within the error bound of the sketch
+    assert invoice_stats.invoice_stats.at[0, "invoice_mean"] == np.round(np.mean(values))
+    assert rank_error(
+        values=values, value=invoice_stats.invoice_stats.at[0, "invoice_median"], q=0.5
+    ) <= QuantileSketch.normalized_rank_error(k=SKETCH_K)
+
+    for q in [0.95, 0.99]:
+        assert rank_error(
+            values=values, value=invoice_stats.get_quantile(q=q), q=q
+        ) <= QuantileSketch.normalized_rank_error(k=SKETCH_K)
+
+
+def test_sketch_mode_constant_memory(make_invoices):
+    invoice_stats = InvoiceStats(sketch_k=SKETCH_K, metrics=True)
+    invoice_stats.add_invoice(invoice=make_invoices(row_count=10000, seed=0))
+    bytes_held = invoice_stats.metrics()["gauges"]["bytes_held"]
+
+    for seed in range(1, 10):
+        invoice_stats.add_invoice(invoice=make_invoices(row_count=10000, seed=seed))
+
+    assert invoice_stats.metrics()["gauges"]["bytes_held"] < 2 * bytes_held
+
+
+def test_exact_quantile():
+    invoice_stats = InvoiceStats()
+    invoice_stats.add_invoices(
+        invoices=[
+            {"invoice_name": "company_a", "invoice_value": Decimal(1)},
+            {"invoice_name": "company_b", "invoice_value": Decimal(2)},
+            {"invoice_name": "company_c", "invoice_value": Decimal(3)},
+            {"invoice_name": "company_d", "invoice_value": Decimal(4)},
+        ]
+    )
+
+    # Same as pd.Series.quantile without sketch_k
+    assert invoice_stats.get_quantile(q=0.5) == 2.5
+    assert invoice_stats.get_quantile(q=0.95) == pd.Series([1.0, 2.0, 3.0, 4.0]).quantile(0.95)
+
+
+def test_sketch_snapshot(make_invoices, tmp_path):
+    path = str(tmp_path / "invoice_stats.snapshot")
+
+    invoice_stats = InvoiceStats(sketch_k=SKETCH_K)
+    invoice_stats.add_invoice(invoice=make_invoices(row_count=10000, seed=0))
+    invoice_stats.save_snapshot(path=path)
+
+    restored_invoice_stats = InvoiceStats.load_snapshot(path=path)
+
+    assert restored_invoice_stats.sketch_k == SKETCH_K
+    assert restored_invoice_stats.invoice_count == invoice_stats.invoice_count
+    assert restored_invoice_stats.get_quantile(q=0.5) == invoice_stats.get_quantile(q=0.5)
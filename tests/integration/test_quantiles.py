@@ -0,0 +1,54 @@
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.invoice_stats import InvoiceStats
+
+LOGGER = logging.getLogger(__name__)
+
+LOGGER.info("Testing the quantiles and summary stats of the invoice values\nLoading...")
+
+
+@pytest.mark.parametrize("fixed_point", [False, True])
+def test_get_quantiles(fixed_point):
+    values = np.round(np.random.RandomState(seed=0).uniform(1, 200000000, size=1001), 2)
+    invoice_stats = InvoiceStats(fixed_point=fixed_point)
+    invoice_stats.add_invoice(
+        invoice=pd.DataFrame({"invoice_name": "company_a", "invoice_value": values})
+    )
+
+    invoice_stats.get_mean()
+    invoice_stats.get_median()
+    invoice_stats.get_quantiles(quantiles=[0.25, 0.5, 0.75, 0.95, 0.99])
+
+    expected_values = pd.Series(values)
+    expected_stats = {
+        "invoice_mean": expected_values.mean(),
+        "invoice_median": expected_values.median(),
+        "invoice_min": expected_values.min(),
+        "invoice_max": expected_values.max(),
+        "invoice_std": expected_values.std(),
+        "invoice_q25": expected_values.quantile(0.25),
+        "invoice_q50": expected_values.quantile(0.5),
+        "invoice_q75": expected_values.quantile(0.75),
+        "invoice_q95": expected_values.quantile(0.95),
+        "invoice_q99": expected_values.quantile(0.99),
+    }
+
+    assert invoice_stats.invoice_stats.shape == (1, 11)
+    assert invoice_stats.invoice_stats.at[0, "invoice_count"] == 1001
+
+    # Rounded like the mean and median
+    for column, expected_stat in expected_stats.items():
+        assert invoice_stats.invoice_stats.at[0, column] == pytest.approx(expected_stat, abs=0.5)
+        assert invoice_stats.invoice_stats.at[0, column] % 1 == 0
+
+
+def test_get_quantiles_empty():
+    invoice_stats = InvoiceStats()
+    invoice_stats.get_quantiles()
+
+    assert invoice_stats.invoice_stats.at[0, "invoice_count"] == 0
+    assert invoice_stats.invoice_stats.drop(columns="invoice_count").isna().all(axis=None)
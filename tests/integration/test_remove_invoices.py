@@ -0,0 +1,83 @@
+import logging
+
+import numpy as np
+import pytest
+
+from src.invoice_stats import InvoiceStats
+
+LOGGER = logging.getLogger(__name__)
+
+LOGGER.info("Testing the removal of invoices\nLoading...")
+
+
+@pytest.mark.parametrize("fixed_point", [False, True])
+def test_remove_invoices(fixed_point):
+    random_state = np.random.RandomState(seed=0)
+    invoice_stats = InvoiceStats(fixed_point=fixed_point, invoice_limit=1000, group_stats=True)
+    invoice_stats.add_invoices(
+        invoices=[
+            {"invoice_name": f"company_{name}", "invoice_value": value}
+            for name, value in zip(
+                random_state.randint(0, 5, size=1000),
+                np.round(random_state.uniform(1, 10000, size=1000), 2).tolist(),
+            )
+        ]
+    )
+
+    assert invoice_stats.remove_invoices(invoice_ids=list(range(0, 1000, 3))) == 334
+    invoice_stats.remove_invoice(invoice_id=1)
+    removed_count = invoice_stats.remove_invoices(names=["company_2"])
+
+    # Invoices removed below the invoice limit can be replaced
+    invoice_stats.add_invoices(invoices=[{"invoice_name": "company_5", "invoice_value": 12.5}] * 5)
+
+    invoices = invoice_stats.invoices
+    invoice_values = invoices["invoice_value"] / (100 if fixed_point else 1)
+
+    assert invoice_stats.invoice_count == 1000 - 334 - 1 - removed_count + 5
+    assert invoices.shape[0] == invoice_stats.invoice_count
+    assert invoices.index[-5:].tolist() == [1000, 1001, 1002, 1003, 1004]
+    assert "company_2" not in invoices["invoice_name"].tolist()
+
+    invoice_stats.get_mean()
+    invoice_stats.get_median()
+
+    assert invoice_stats.invoice_stats["invoice_mean"][0] == np.floor(invoice_values.mean() + 0.5)
+    assert invoice_stats.invoice_stats["invoice_median"][0] == np.floor(
+        invoice_values.median() + 0.5
+    )
+
+    expected_group_stats = (
+        invoice_values.groupby(invoices["invoice_name"].astype(str))
+        .agg(["count", "mean", "median"])
+        .sort_index()
+    )
+    group_stats = invoice_stats.get_all_group_stats().sort_index()
+
+    assert group_stats.index.tolist() == expected_group_stats.index.tolist()
+    assert group_stats["invoice_count"].tolist() == expected_group_stats["count"].tolist()
+    assert group_stats["invoice_median"].tolist() == expected_group_stats["median"].tolist()
+    np.testing.assert_allclose(group_stats["invoice_mean"], expected_group_stats["mean"], rtol=1e-9)
+
+
+def test_remove_unknown_invoice():
+    invoice_stats = InvoiceStats()
+    invoice_stats.add_invoices(
+        invoices=[
+            {"invoice_name": "company_a", "invoice_value": 10},
+            {"invoice_name": "company_b", "invoice_value": 20},
+        ]
+    )
+    invoice_stats.remove_invoice(invoice_id=0)
+
+    with pytest.raises(KeyError):
+        invoice_stats.remove_invoice(invoice_id=0)
+
+    with pytest.raises(KeyError):
+        invoice_stats.remove_invoices(invoice_ids=[1, 2])
+
+    # Nothing is removed when an id is not found
+    invoice_stats.get_mean()
+
+    assert invoice_stats.invoice_count == 1
+    assert invoice_stats.invoice_stats["invoice_mean"][0] == 20.0
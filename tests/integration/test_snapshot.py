@@ -0,0 +1,83 @@
+import logging
+from decimal import Decimal
+
+import pytest
+
+from src.invoice_stats import InvoiceStats
+
+LOGGER = logging.getLogger(__name__)
+
+LOGGER.info("Testing that InvoiceStats is restored from a snapshot\nLoading...")
+
+
+@pytest.mark.parametrize(
+    "random_invoices, random_invoice, expected_mean, expected_median",
+    [
+        (
+            [
+                {"invoice_name": f"company_a", "invoice_value": Decimal(11)},
+                {"invoice_name": f"company_b", "invoice_value": Decimal(123333.123)},
+                {"invoice_name": f"company_c", "invoice_value": Decimal(100000200.23)},
+                {"invoice_name": f"company_d", "invoice_value": Decimal(200000000.00)},
+            ],
+            {"invoice_name": f"company_single", "invoice_value": Decimal(999)},
+            75030886.0,  # 75030886.08825 -> 75030886.0
+            50061767.0,  # 50061766.6765 -> 50061767.0
+        )
+    ],
+)
+@pytest.mark.parametrize("fixed_point", [False, True])
+def test_save_and_load_snapshot(
+    tmp_path, random_invoices, random_invoice, expected_mean, expected_median, fixed_point
+):
+    path = str(tmp_path / "invoice_stats.snapshot")
+
+    invoice_stats = InvoiceStats(
+        max_invoice_value=Decimal("200000000.00"), invoice_limit=6, fixed_point=fixed_point
+    )
+    invoice_stats.add_invoices(invoices=random_invoices)
+    invoice_stats.save_snapshot(path=path)
+
+    restored_invoice_stats = InvoiceStats.load_snapshot(path=path)
+
+    # Limits are restored
+    assert restored_invoice_stats.max_invoice_value == invoice_stats.max_invoice_value
+    assert restored_invoice_stats.min_invoice_value == invoice_stats.min_invoice_value
+    assert restored_invoice_stats.invoice_limit == 6
+    assert restored_invoice_stats.fixed_point == fixed_point
+
+    # Stats are answered without the invoices
+    assert restored_invoice_stats.invoices.empty
+    assert restored_invoice_stats.invoice_count == len(random_invoices)
+
+    restored_invoice_stats.get_mean()
+    restored_invoice_stats.get_median()
+
+    assert restored_invoice_stats.invoice_stats.values.tolist()[0] == [
+        expected_mean,
+        expected_median,
+    ]
+
+    # Inserts continue on top of the restored invoices, and count against the invoice limit
+    restored_invoice_stats.add_invoices(invoices=[random_invoice] * 3)
+
+    assert restored_invoice_stats.invoice_count == 6
+    assert restored_invoice_stats.invoices.shape[0] == 2
+
+    invoice_stats.add_invoices(invoices=[random_invoice] * 2)
+    invoice_stats.get_mean()
+    invoice_stats.get_median()
+    restored_invoice_stats.get_mean()
+    restored_invoice_stats.get_median()
+
+    assert (
+        restored_invoice_stats.invoice_stats.values.tolist()
+        == invoice_stats.invoice_stats.values.tolist()
+    )
+
+
+def test_save_snapshot_with_storage_dir(tmp_path):
+    invoice_stats = InvoiceStats(storage_dir=str(tmp_path / "invoice_store"))
+
+    with pytest.raises(ValueError):
+        invoice_stats.save_snapshot(path=str(tmp_path / "invoice_stats.snapshot"))
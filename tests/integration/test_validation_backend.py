@@ -0,0 +1,53 @@
+import logging
+
+import pandas as pd
+import pytest
+from pandera.errors import SchemaError, SchemaErrors
+
+from src.invoice_stats import InvoiceStats
+
+LOGGER = logging.getLogger(__name__)
+
+LOGGER.info("Testing the numpy validation backend against pandera\nLoading...")
+
+
+@pytest.mark.parametrize("fixed_point", [False, True])
+def test_validation_backends(make_invoices, fixed_point):
+    invoices = make_invoices(row_count=1000, max_invoice_value=10000)
+
+    invoice_stats = InvoiceStats(fixed_point=fixed_point)
+    numpy_invoice_stats = InvoiceStats(fixed_point=fixed_point, validation_backend="numpy")
+
+    for stats in (invoice_stats, numpy_invoice_stats):
+        stats.add_invoice(invoice=invoices)
+        stats.validate_all()
+        stats.get_mean()
+        stats.get_median()
+
+    pd.testing.assert_frame_equal(numpy_invoice_stats.invoices, invoice_stats.invoices)
+    pd.testing.assert_frame_equal(numpy_invoice_stats.invoice_stats, invoice_stats.invoice_stats)
+
+
+@pytest.mark.parametrize("fixed_point", [False, True])
+@pytest.mark.parametrize("invalid_value", [0.0, 200000000.01, None, "abc"])
+def test_validation_backends_error(make_invoices, fixed_point, invalid_value):
+    invoices = make_invoices(row_count=10, max_invoice_value=10000).astype(
+        {"invoice_value": object}
+    )
+    invoices.loc[5, "invoice_value"] = invalid_value
+
+    # Older pandera versions raise the error of pandas for values that cannot be coerced
+    with pytest.raises((SchemaError, SchemaErrors, ValueError)) as validation_error:
+        InvoiceStats(fixed_point=fixed_point).add_invoice(invoice=invoices)
+
+    numpy_invoice_stats = InvoiceStats(fixed_point=fixed_point, validation_backend="numpy")
+
+    with pytest.raises(SchemaError) as numpy_validation_error:
+        numpy_invoice_stats.add_invoice(invoice=invoices)
+
+    # Same invalid invoice, and none of the invoices are added
+    assert numpy_validation_error.value.failure_cases["index"].tolist() == [5]
+    assert numpy_invoice_stats.invoice_count == 0
+
+    if hasattr(validation_error.value, "failure_cases"):
+        assert validation_error.value.failure_cases["index"].tolist() == [5]
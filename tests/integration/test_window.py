@@ -0,0 +1,58 @@
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.invoice_stats import InvoiceStats
+
+LOGGER = logging.getLogger(__name__)
+
+LOGGER.info("Testing the stats over a window of the most recent invoices\nLoading...")
+
+
+@pytest.mark.parametrize("batch_sizes", [[1] * 30, [3, 50, 1, 120, 7, 99, 100, 2]])
+@pytest.mark.parametrize("fixed_point", [False, True])
+def test_window(batch_sizes, fixed_point):
+    random_state = np.random.RandomState(seed=len(batch_sizes))
+    invoice_stats = InvoiceStats(window_size=100, fixed_point=fixed_point)
+    invoice_values = []
+
+    for batch_size in batch_sizes:
+        batch_values = np.round(random_state.uniform(1, 10000, size=batch_size), 2).tolist()
+        invoice_values.extend(batch_values)
+
+        invoice_stats.add_invoices(
+            invoices=[
+                {"invoice_name": "company_a", "invoice_value": value} for value in batch_values
+            ]
+        )
+
+        invoice_stats.get_mean()
+        invoice_stats.get_median()
+
+        # Matches the pandas stats of the most recent invoices after every batch
+        window_values = pd.Series(invoice_values[-100:])
+
+        assert invoice_stats.invoice_count == window_values.shape[0]
+        assert invoice_stats.invoice_stats["invoice_mean"][0] == np.floor(
+            window_values.mean() + 0.5
+        )
+        assert invoice_stats.invoice_stats["invoice_median"][0] == np.floor(
+            window_values.median() + 0.5
+        )
+
+    assert invoice_stats.get_quantile(q=0.95) == pytest.approx(window_values.quantile(0.95))
+    assert invoice_stats.invoices.empty
+
+
+def test_window_is_not_bound_by_the_invoice_limit():
+    invoice_stats = InvoiceStats(window_size=10, invoice_limit=20)
+
+    for _ in range(5):
+        invoice_stats.add_invoices(
+            invoices=[{"invoice_name": "company_a", "invoice_value": 10}] * 10
+        )
+
+    assert invoice_stats.invoice_count == 10
+    assert invoice_stats.metrics()["gauges"]["bytes_held"] == 80
@@ -0,0 +1,174 @@
+import asyncio
+import threading
+from unittest.mock import MagicMock, call
+
+import pandas as pd
+import pytest
+
+from src.async_invoice_stats import AsyncInvoiceStats
+from src.invoice_stats import InvoiceStats
+
+
+@pytest.fixture()
+def mock_invoice_stats() -> MagicMock:
+    """PyTest fixture to create a mocked invoice stats instance to use in tests"""
+    mock_invoice_stats = MagicMock(spec=InvoiceStats)
+    mock_invoice_stats.invoice_stats = MagicMock(spec=pd.DataFrame)
+    mock_invoice_stats.mean_col_name = "invoice_mean"
+    mock_invoice_stats.median_col_name = "invoice_median"
+
+    return mock_invoice_stats
+
+
+def invoice(value: int) -> dict:
+    return {"invoice_name": "company_a", "invoice_value": value}
+
+
+class TestAsyncInvoiceStats:
+    @pytest.mark.parametrize(
+        "max_batch_size, expected_batch_sizes", [(10, [10]), (4, [4, 4, 2]), (1, [1] * 10)]
+    )
+    def test_submit_micro_batches(self, mock_invoice_stats, max_batch_size, expected_batch_sizes):
+        async def submit_invoices():
+            async with AsyncInvoiceStats(
+                invoice_stats=mock_invoice_stats, max_batch_size=max_batch_size, max_latency=1
+            ) as async_invoice_stats:
+                for value in range(10):
+                    await async_invoice_stats.submit(invoice=invoice(value=value))
+
+        asyncio.run(submit_invoices())
+
+        # Every batch is added at once, in the order the invoices were submitted
+        batches = [args[0] for args, _ in mock_invoice_stats.add_invoices.call_args_list]
+
+        assert [len(batch) for batch in batches] == expected_batch_sizes
+        assert [row for batch in batches for row in batch] == [invoice(value=x) for x in range(10)]
+
+    def test_latency_flushes_partial_batch(self, mock_invoice_stats):
+        async def submit_invoice():
+            async_invoice_stats = AsyncInvoiceStats(
+                invoice_stats=mock_invoice_stats, max_latency=0.01
+            )
+            await async_invoice_stats.submit(invoice=invoice(value=1))
+
+            # The batch is not full, it is added once the latency has passed
+            await asyncio.sleep(0.2)
+            add_invoices_call_count = mock_invoice_stats.add_invoices.call_count
+
+            await async_invoice_stats.close()
+
+            return add_invoices_call_count
+
+        assert asyncio.run(submit_invoice()) == 1
+
+    def test_backpressure(self, mock_invoice_stats):
+        add_invoices_event = threading.Event()
+        mock_invoice_stats.add_invoices.side_effect = lambda invoices: add_invoices_event.wait()
+
+        async def submit_invoices():
+            async_invoice_stats = AsyncInvoiceStats(
+                invoice_stats=mock_invoice_stats, max_batch_size=1, max_queue_size=2
+            )
+            submit = asyncio.ensure_future(
+                asyncio.gather(
+                    *(async_invoice_stats.submit(invoice=invoice(value=x)) for x in range(4))
+                )
+            )
+            await asyncio.sleep(0.1)
+
+            # The first batch is being added, only max_queue_size invoices fit in the queue and
+            # the last submit waits
+            queue_size = async_invoice_stats._queue.qsize()
+            submit_done = submit.done()
+
+            add_invoices_event.set()
+            await submit
+            await async_invoice_stats.close()
+
+            return queue_size, submit_done
+
+        assert asyncio.run(submit_invoices()) == (2, False)
+        assert mock_invoice_stats.add_invoices.call_count == 4
+
+    def test_get_mean_and_median(self, mock_invoice_stats):
+        mock_invoice_stats.invoice_stats.at.__getitem__.side_effect = [10.0, 20.0]
+
+        async def get_mean_and_median():
+            async with AsyncInvoiceStats(
+                invoice_stats=mock_invoice_stats, max_latency=1
+            ) as async_invoice_stats:
+                await async_invoice_stats.submit(invoice=invoice(value=1))
+
+                return await async_invoice_stats.get_mean(), await async_invoice_stats.get_median()
+
+        assert asyncio.run(get_mean_and_median()) == (10.0, 20.0)
+
+        # The queued invoices are added before the aggregates are computed
+        mock_calls = [
+            mock_call
+            for mock_call in mock_invoice_stats.mock_calls
+            if not mock_call[0].startswith("invoice_stats")
+        ]
+
+        assert mock_calls == [
+            call.add_invoices([invoice(value=1)]),
+            call.get_mean(row=0),
+            call.get_median(row=0),
+        ]
+        assert mock_invoice_stats.invoice_stats.at.__getitem__.call_args_list == [
+            call((0, "invoice_mean")),
+            call((0, "invoice_median")),
+        ]
+
+    def test_rejected_invoice(self, mock_invoice_stats):
+        def add_invoices(invoices):
+            if any(row["invoice_value"] < 0 for row in invoices):
+                raise ValueError("invalid invoice")
+
+        mock_invoice_stats.add_invoices.side_effect = add_invoices
+
+        async def submit_invoices():
+            async_invoice_stats = AsyncInvoiceStats(
+                invoice_stats=mock_invoice_stats, max_latency=0.01
+            )
+            added = [
+                await async_invoice_stats.submit(invoice=invoice(value=value))
+                for value in [1, 2, -3, 4]
+            ]
+            await async_invoice_stats.flush()
+
+            # Only the future of the invalid invoice holds an error
+            errors = [future.exception() for future in added]
+            await async_invoice_stats.close()
+
+            return errors
+
+        errors = asyncio.run(submit_invoices())
+
+        assert [error is None for error in errors] == [True, True, False, True]
+        assert isinstance(errors[2], ValueError)
+
+        # The rejected batch is split in halves, the valid invoices are still added
+        assert mock_invoice_stats.add_invoices.call_args_list == [
+            call([invoice(value=value) for value in [1, 2, -3, 4]]),
+            call([invoice(value=1), invoice(value=2)]),
+            call([invoice(value=-3), invoice(value=4)]),
+            call([invoice(value=-3)]),
+            call([invoice(value=4)]),
+        ]
+
+    def test_closed(self, mock_invoice_stats):
+        async def submit_after_close():
+            async_invoice_stats = AsyncInvoiceStats(invoice_stats=mock_invoice_stats)
+            await async_invoice_stats.close()
+            await async_invoice_stats.close()
+
+            with pytest.raises(RuntimeError):
+                await async_invoice_stats.submit(invoice=invoice(value=1))
+
+            with pytest.raises(RuntimeError):
+                await async_invoice_stats.get_mean()
+
+        asyncio.run(submit_after_close())
+
+        assert mock_invoice_stats.add_invoices.call_count == 0
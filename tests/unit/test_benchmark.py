@@ -0,0 +1,59 @@
+import pytest
+
+from benchmarks.invoice_stats_benchmark import (
+    BENCHMARKS,
+    compare_to_baseline,
+    create_invoices,
+    run_benchmarks,
+)
+
+
+def _result(benchmark="get_mean", scale=1000, wall_time=1.0, peak_memory=100):
+    return {
+        "benchmark": benchmark,
+        "scale": scale,
+        "rows": scale,
+        "wall_time": wall_time,
+        "cpu_time": wall_time,
+        "peak_memory": peak_memory,
+    }
+
+
+def test_create_invoices():
+    invoices = create_invoices(scale=10)
+
+    assert len(invoices) == 10
+    assert set(invoices[0]) == {"invoice_name", "invoice_value"}
+    assert create_invoices(scale=10) == invoices
+
+
+@pytest.mark.parametrize(
+    "result,expected_regression_count",
+    [
+        (_result(), 0),
+        (_result(wall_time=1.2, peak_memory=120), 0),
+        (_result(wall_time=1.3), 1),
+        (_result(peak_memory=130), 1),
+        (_result(wall_time=1.3, peak_memory=130), 2),
+        (_result(benchmark="get_median", wall_time=10.0), 0),
+        (_result(scale=100000, wall_time=10.0), 0),
+    ],
+)
+def test_compare_to_baseline(result, expected_regression_count):
+    regressions = compare_to_baseline(
+        results=[result], baseline=[_result()], time_threshold=0.25, memory_threshold=0.25
+    )
+
+    assert len(regressions) == expected_regression_count
+
+
+def test_run_benchmarks():
+    results = run_benchmarks(scales=[20], benchmark_names=list(BENCHMARKS))
+
+    assert [result["benchmark"] for result in results] == list(BENCHMARKS)
+
+    for result in results:
+        assert result["scale"] == 20
+        assert result["wall_time"] >= 0
+        assert result["cpu_time"] >= 0
+        assert result["peak_memory"] > 0
@@ -0,0 +1,153 @@
+import math
+import threading
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from pandera.errors import SchemaError
+
+from src.concurrent_invoice_stats import ConcurrentInvoiceStats
+from tests.constants import CONCURRENT_INVOICE_STATS_PATH
+
+
+@pytest.fixture()
+def concurrent_invoice_stats() -> ConcurrentInvoiceStats:
+    """PyTest fixture to create concurrent invoice stats to use in tests"""
+    return ConcurrentInvoiceStats(invoice_limit=10, shard_count=2)
+
+
+def invoices(values: list) -> list:
+    return [{"invoice_name": "company_a", "invoice_value": value} for value in values]
+
+
+class TestConcurrentInvoiceStats:
+    def test_empty_stats(self, concurrent_invoice_stats):
+        stats = concurrent_invoice_stats.get_stats()
+
+        assert stats["invoice_count"] == 0
+        assert math.isnan(stats["invoice_mean"])
+        assert math.isnan(stats["invoice_median"])
+
+    def test_add_invoices(self, concurrent_invoice_stats):
+        assert concurrent_invoice_stats.add_invoices(invoices=invoices([1, 2, 6])) == 3
+        assert concurrent_invoice_stats.add_invoice(invoice=invoices([11])[0]) == 1
+
+        assert concurrent_invoice_stats.get_stats() == {
+            "invoice_count": 4,
+            "invoice_mean": 5.0,
+            "invoice_median": 4.0,
+        }
+        assert concurrent_invoice_stats.get_mean() == 5.0
+        assert concurrent_invoice_stats.get_median() == 4.0
+
+    def test_threads_get_own_shard(self, concurrent_invoice_stats):
+        def add_invoices(value):
+            concurrent_invoice_stats.add_invoices(invoices=invoices([value, value]))
+
+        threads = [threading.Thread(target=add_invoices, args=(value,)) for value in [1, 2]]
+
+        for thread in threads:
+            thread.start()
+            thread.join()
+
+        # Every writer thread appends to its own shard, round robin
+        assert sorted(
+            buffer.values.tolist() for buffer in concurrent_invoice_stats._shard_buffers
+        ) == [[1.0, 1.0], [2.0, 2.0]]
+
+    def test_invoice_limit_across_shards(self, concurrent_invoice_stats):
+        def add_invoices():
+            concurrent_invoice_stats.add_invoices(invoices=invoices([1, 2, 3, 4]))
+
+        threads = [threading.Thread(target=add_invoices) for _ in range(4)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        # The first invoices up to the limit are added, in any of the shards
+        assert concurrent_invoice_stats.invoice_count == 10
+        assert concurrent_invoice_stats.add_invoices(invoices=invoices([1])) == 0
+
+    def test_failed_validation_releases_rows(self, concurrent_invoice_stats):
+        with pytest.raises(Exception):
+            concurrent_invoice_stats.add_invoices(invoices=invoices([1, -1]))
+
+        assert concurrent_invoice_stats._reserved_row_count == 0
+        assert concurrent_invoice_stats.add_invoices(invoices=invoices(list(range(1, 11)))) == 10
+
+    def test_snapshot_is_not_changed_by_appends(self, concurrent_invoice_stats):
+        concurrent_invoice_stats.add_invoices(invoices=invoices([1, 2]))
+
+        running_sum, values = concurrent_invoice_stats._snapshot(with_values=True)
+        concurrent_invoice_stats.add_invoices(invoices=invoices([3] * 8))
+
+        assert running_sum.count == 2
+        assert np.concatenate(values).tolist() == [1.0, 2.0]
+
+    def test_fixed_point(self):
+        concurrent_invoice_stats = ConcurrentInvoiceStats(fixed_point=True, shard_count=2)
+        concurrent_invoice_stats.add_invoices(invoices=invoices(["1.10", "2.20", "4.40"]))
+
+        assert concurrent_invoice_stats.get_mean() == pytest.approx(7.7 / 3, rel=1e-15)
+        assert concurrent_invoice_stats.get_median() == 2.2
+
+    def test_clear(self, concurrent_invoice_stats):
+        concurrent_invoice_stats.add_invoices(invoices=invoices(list(range(1, 11))))
+        concurrent_invoice_stats.clear()
+
+        assert concurrent_invoice_stats.invoice_count == 0
+        assert concurrent_invoice_stats.add_invoices(invoices=invoices([5])) == 1
+
+    def test_clear_while_inserting(self, concurrent_invoice_stats):
+        validate = concurrent_invoice_stats._validator.validate
+        validating, cleared = threading.Event(), threading.Event()
+
+        def blocking_validate(invoices):
+            if threading.current_thread() is writer:
+                validating.set()
+                cleared.wait()
+
+            return validate(invoices=invoices)
+
+        def add_invoices():
+            concurrent_invoice_stats.add_invoices(invoices=invoices([1, 2, 3, 4]))
+
+        writer = threading.Thread(target=add_invoices, daemon=True)
+
+        with patch.object(concurrent_invoice_stats._validator, "validate", blocking_validate):
+            writer.start()
+            validating.wait(timeout=10)
+
+            try:
+                concurrent_invoice_stats.add_invoices(invoices=invoices([5] * 6))
+                concurrent_invoice_stats.clear()
+                added_row_count = concurrent_invoice_stats.add_invoices(invoices=invoices([6] * 10))
+
+            finally:
+                cleared.set()
+                writer.join(timeout=10)
+
+        # The rows reserved by the insert in progress are kept by the clear, and it is appended
+        # after the clear, within the invoice limit
+        assert added_row_count == 6
+        assert concurrent_invoice_stats.invoice_count == 10
+        assert concurrent_invoice_stats._pending_row_count == 0
+
+    def test_validation_backend(self):
+        concurrent_invoice_stats = ConcurrentInvoiceStats(shard_count=2, validation_backend="numpy")
+        concurrent_invoice_stats.add_invoices(invoices=invoices([1, 2, 6]))
+
+        assert concurrent_invoice_stats.get_mean() == 3.0
+
+        with pytest.raises(SchemaError):
+            concurrent_invoice_stats.add_invoices(invoices=invoices([0]))
+
+    def test_limit_warning(self, concurrent_invoice_stats):
+        with patch(f"{CONCURRENT_INVOICE_STATS_PATH}.LOGGER") as mock_logging:
+            concurrent_invoice_stats.add_invoices(invoices=invoices(list(range(1, 13))))
+            concurrent_invoice_stats.add_invoices(invoices=invoices([1]))
+
+        assert mock_logging.warning.call_count == 2
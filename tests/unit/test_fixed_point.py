@@ -0,0 +1,57 @@
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandera.errors import SchemaError
+
+from src.utils.constants import MAX_INVOICE_VALUE, MIN_INVOICE_VALUE
+from src.utils.fixed_point import to_cents, to_cents_limit
+from src.utils.schemas.invoice import create_invoice_cents_schema
+
+
+@pytest.fixture()
+def invoice_cents_schema():
+    """PyTest fixture to create an invoice cents schema to use in tests"""
+    return create_invoice_cents_schema(
+        max_invoice_value=MAX_INVOICE_VALUE, min_invoice_value=MIN_INVOICE_VALUE
+    )
+
+
+@pytest.mark.parametrize(
+    "values, expected_cents",
+    [
+        ([Decimal("1.10"), Decimal("0.01"), 3, 2.5, "4.99"], [110, 1, 300, 250, 499]),
+        ([Decimal(123333.123), Decimal(100000200.23)], [12333312, 10000020023]),
+        ([MAX_INVOICE_VALUE], [20000000000]),
+        # Decimal and str values are rounded half up, not through a float
+        ([Decimal("1.005"), "1.005", Decimal("1.004")], [101, 101, 100]),
+        (np.array([1.1, 2.5]), [110, 250]),
+    ],
+)
+def test_to_cents(invoice_cents_schema, values, expected_cents):
+    cents = to_cents(
+        values=pd.Series(values, dtype=None if isinstance(values, np.ndarray) else object),
+        schema=invoice_cents_schema,
+    )
+
+    assert cents.dtype == np.int64
+    assert cents.tolist() == expected_cents
+
+
+@pytest.mark.parametrize("value", ["abc", None, np.nan, Decimal("NaN"), "inf"])
+def test_to_cents_invalid_value(invoice_cents_schema, value):
+    values = pd.Series([Decimal("1.10"), value], dtype=object, name="invoice_value")
+
+    with pytest.raises(SchemaError) as validation_error:
+        to_cents(values=values, schema=invoice_cents_schema)
+
+    assert validation_error.value.failure_cases["index"].tolist() == [1]
+
+
+@pytest.mark.parametrize(
+    "value, expected_cents",
+    [(MAX_INVOICE_VALUE, 20000000000), (MIN_INVOICE_VALUE, 100), (Decimal("12.34"), 1234)],
+)
+def test_to_cents_limit(value, expected_cents):
+    assert to_cents_limit(value=value) == expected_cents
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.group_stats import GroupStats
+
+
+@pytest.fixture()
+def group_stats() -> GroupStats:
+    """PyTest fixture to create group stats to use in tests"""
+    return GroupStats()
+
+
+class TestGroupStats:
+    def test_extend(self, group_stats):
+        group_stats.extend(
+            names=np.array(["company_a", "company_b", "company_a"], dtype=object),
+            values=np.array([1.0, 10.0, 3.0]),
+        )
+        group_stats.extend(names=np.array(["company_a"], dtype=object), values=np.array([8.0]))
+
+        assert len(group_stats) == 2
+        assert group_stats.get(name="company_a") == {
+            "invoice_count": 3,
+            "invoice_mean": 4.0,
+            "invoice_median": 3.0,
+        }
+        assert group_stats.get(name="company_b") == {
+            "invoice_count": 1,
+            "invoice_mean": 10.0,
+            "invoice_median": 10.0,
+        }
+
+    def test_get_unknown_name(self, group_stats):
+        with pytest.raises(KeyError):
+            group_stats.get(name="company_a")
+
+    def test_integer_values(self):
+        group_stats = GroupStats(value_dtype=np.int64)
+        group_stats.extend(
+            names=np.array(["company_a", "company_a"], dtype=object),
+            values=np.array([1100, 2250], dtype=np.int64),
+        )
+
+        assert group_stats.get(name="company_a", scale=100) == {
+            "invoice_count": 2,
+            "invoice_mean": 16.75,
+            "invoice_median": 16.75,
+        }
+
+    def test_matches_groupby(self, group_stats):
+        random_state = np.random.RandomState(seed=0)
+        names = np.array([f"company_{x}" for x in random_state.randint(0, 50, size=10000)])
+        values = np.round(random_state.uniform(1, 1000, size=10000), 2)
+
+        for batch_names, batch_values in zip(np.array_split(names, 7), np.array_split(values, 7)):
+            group_stats.extend(names=batch_names.astype(object), values=batch_values)
+
+        expected_stats = (
+            pd.DataFrame({"invoice_name": names, "invoice_value": values})
+            .groupby("invoice_name")["invoice_value"]
+            .agg(["count", "mean", "median"])
+        )
+        group_frame = group_stats.to_frame().sort_index()
+
+        assert group_frame.index.tolist() == expected_stats.index.tolist()
+        assert group_frame["invoice_count"].tolist() == expected_stats["count"].tolist()
+        assert group_frame["invoice_median"].tolist() == expected_stats["median"].tolist()
+        np.testing.assert_allclose(group_frame["invoice_mean"], expected_stats["mean"], rtol=1e-12)
+
+    def test_remove(self, group_stats):
+        group_stats.extend(
+            names=np.array(["company_a", "company_b", "company_a", "company_a"], dtype=object),
+            values=np.array([1.0, 10.0, 3.0, 8.0]),
+        )
+        group_stats.remove(
+            names=np.array(["company_a", "company_b"], dtype=object), values=np.array([8.0, 10.0])
+        )
+
+        assert len(group_stats) == 1
+        assert group_stats.get(name="company_a") == {
+            "invoice_count": 2,
+            "invoice_mean": 2.0,
+            "invoice_median": 2.0,
+        }
+        # A group without invoices is not returned
+        assert group_stats.to_frame().index.tolist() == ["company_a"]
+
+        with pytest.raises(KeyError):
+            group_stats.get(name="company_b")
+
+    def test_clear(self, group_stats):
+        group_stats.extend(names=np.array(["company_a"], dtype=object), values=np.array([1.0]))
+        group_stats.clear()
+
+        assert len(group_stats) == 0
+        assert group_stats.to_frame().empty
+
+    def test_empty_batch(self, group_stats):
+        group_stats.extend(names=np.array([], dtype=object), values=np.array([]))
+
+        assert len(group_stats) == 0
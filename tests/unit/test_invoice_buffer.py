@@ -0,0 +1,187 @@
+import numpy as np
+import pytest
+
+from src.utils.invoice_buffer import InvoiceBuffer
+from tests.constants import LIMIT
+
+
+@pytest.fixture()
+def invoice_buffer() -> InvoiceBuffer:
+    """PyTest fixture to create an invoice buffer to use in tests"""
+    return InvoiceBuffer(capacity_limit=LIMIT, initial_capacity=2)
+
+
+class TestInvoiceBuffer:
+    def test_append(self, invoice_buffer):
+        invoice_buffer.append(
+            names=np.array(["company_a", "company_b"], dtype=object), values=np.array([1.0, 2.0]),
+        )
+        invoice_buffer.append(names=np.array(["company_c"], dtype=object), values=np.array([3.0]))
+
+        assert len(invoice_buffer) == 3
+        assert invoice_buffer.names.tolist() == ["company_a", "company_b", "company_c"]
+        assert invoice_buffer.values.tolist() == [1.0, 2.0, 3.0]
+
+    def test_append_reuses_name_codes(self, invoice_buffer):
+        invoice_buffer.append(
+            names=np.array(["company_a", "company_b"], dtype=object), values=np.array([1.0, 2.0]),
+        )
+        invoice_buffer.append(
+            names=np.array(["company_b", "company_a", "company_c"], dtype=object),
+            values=np.array([3.0, 4.0, 5.0]),
+        )
+
+        # Names are stored once in the name index, and as int32 codes in the column
+        assert invoice_buffer.name_codes.dtype == np.int32
+        assert invoice_buffer.name_codes.tolist() == [0, 1, 1, 0, 2]
+        assert invoice_buffer.name_index.names == ["company_a", "company_b", "company_c"]
+
+    @pytest.mark.parametrize(
+        "row_counts, expected_capacity", [([1], 2), ([3], 4), ([3, 2], 8), ([LIMIT - 1], LIMIT)]
+    )
+    def test_capacity_doubling(self, invoice_buffer, row_counts, expected_capacity):
+        for row_count in row_counts:
+            invoice_buffer.append(
+                names=np.full(row_count, "company_a", dtype=object), values=np.ones(row_count),
+            )
+
+        # Capacity is doubled, but never beyond the capacity limit
+        assert invoice_buffer.capacity == expected_capacity
+        # int32 name codes and float64 values
+        assert invoice_buffer.nbytes == expected_capacity * (4 + 8)
+
+    def test_append_above_capacity_limit(self, invoice_buffer):
+        with pytest.raises(ValueError):
+            invoice_buffer.append(
+                names=np.full(LIMIT + 1, "company_a", dtype=object), values=np.ones(LIMIT + 1),
+            )
+
+        assert len(invoice_buffer) == 0
+
+    def test_to_frame(self, invoice_buffer):
+        invoice_buffer.append(
+            names=np.array(["company_a", "company_b"], dtype=object), values=np.array([1.0, 2.0]),
+        )
+
+        invoices = invoice_buffer.to_frame()
+
+        assert invoices.columns.tolist() == ["invoice_name", "invoice_value"]
+        assert invoices.values.tolist() == [["company_a", 1.0], ["company_b", 2.0]]
+        # The names are decoded, the invoice schema expects an object column
+        assert invoices["invoice_name"].dtype == object
+
+        # The frame is cached until the buffer changes
+        assert invoice_buffer.to_frame() is invoices
+
+        invoice_buffer.append(names=np.array(["company_c"], dtype=object), values=np.array([3.0]))
+
+        assert invoice_buffer.to_frame() is not invoices
+        assert invoice_buffer.to_frame().shape == (3, 2)
+
+    def test_clear(self, invoice_buffer):
+        invoice_buffer.append(
+            names=np.full(5, "company_a", dtype=object), values=np.ones(5),
+        )
+
+        invoice_buffer.clear()
+
+        assert len(invoice_buffer) == 0
+        assert invoice_buffer.capacity == 2
+        assert invoice_buffer.to_frame().empty
+
+    def test_delete(self, invoice_buffer):
+        invoice_buffer.append(
+            names=np.array(["company_a", "company_b", "company_c"], dtype=object),
+            values=np.array([1.0, 2.0, 3.0]),
+        )
+
+        names, values = invoice_buffer.delete(ids=np.array([1]))
+
+        assert names.tolist() == ["company_b"]
+        assert values.tolist() == [2.0]
+        assert len(invoice_buffer) == 2
+        assert invoice_buffer.ids.tolist() == [0, 2]
+        assert invoice_buffer.values.tolist() == [1.0, 3.0]
+        # The invoices keep their id as index
+        assert invoice_buffer.to_frame().index.tolist() == [0, 2]
+
+    @pytest.mark.parametrize("ids", [[1], [3], [-1], [0, 1]])
+    def test_delete_unknown_id(self, invoice_buffer, ids):
+        invoice_buffer.append(
+            names=np.array(["company_a", "company_b", "company_c"], dtype=object),
+            values=np.array([1.0, 2.0, 3.0]),
+        )
+        invoice_buffer.delete(ids=np.array([1]))
+
+        with pytest.raises(KeyError):
+            invoice_buffer.delete(ids=np.array(ids))
+
+        # Nothing is deleted when an id is not found
+        assert len(invoice_buffer) == 2
+
+    def test_delete_duplicate_id(self, invoice_buffer):
+        invoice_buffer.append(names=np.array(["company_a"], dtype=object), values=np.array([1.0]))
+
+        with pytest.raises(ValueError):
+            invoice_buffer.delete(ids=np.array([0, 0]))
+
+    def test_compaction_keeps_ids(self):
+        invoice_buffer = InvoiceBuffer(capacity_limit=4, initial_capacity=2)
+        invoice_buffer.append(
+            names=np.array(["company_a", "company_b", "company_c", "company_d"], dtype=object),
+            values=np.array([1.0, 2.0, 3.0, 4.0]),
+        )
+        invoice_buffer.delete(ids=np.array([0, 2]))
+
+        # The deleted rows are compacted away to make room for the new invoices
+        invoice_buffer.append(
+            names=np.array(["company_e", "company_f"], dtype=object), values=np.array([5.0, 6.0]),
+        )
+
+        assert invoice_buffer.capacity == 4
+        assert invoice_buffer.ids.tolist() == [1, 3, 4, 5]
+        assert invoice_buffer.names.tolist() == ["company_b", "company_d", "company_e", "company_f"]
+
+        names, values = invoice_buffer.delete(ids=np.array([5, 1]))
+
+        assert names.tolist() == ["company_f", "company_b"]
+        assert values.tolist() == [6.0, 2.0]
+        assert invoice_buffer.ids.tolist() == [3, 4]
+
+        with pytest.raises(ValueError):
+            invoice_buffer.append(
+                names=np.full(3, "company_g", dtype=object), values=np.ones(3),
+            )
+
+    def test_find(self, invoice_buffer):
+        invoice_buffer.append(
+            names=np.array(["company_a", "company_b", "company_a", "company_c"], dtype=object),
+            values=np.array([1.0, 2.0, 3.0, 4.0]),
+        )
+        invoice_buffer.delete(ids=np.array([0]))
+
+        assert invoice_buffer.find(names=["company_a", "company_c"]).tolist() == [2, 3]
+        assert invoice_buffer.find(names=["company_x"]).tolist() == []
+
+    def test_find_after_append_and_compaction(self):
+        invoice_buffer = InvoiceBuffer(capacity_limit=4, initial_capacity=2)
+        invoice_buffer.append(
+            names=np.array(["company_a", "company_b", "company_a"], dtype=object),
+            values=np.array([1.0, 2.0, 3.0]),
+        )
+
+        assert invoice_buffer.find(names=["company_a"]).tolist() == [0, 2]
+
+        # Rows appended after a find are found by the next one
+        invoice_buffer.append(names=np.array(["company_a"], dtype=object), values=np.array([4.0]))
+
+        assert invoice_buffer.find(names=["company_a", "company_a"]).tolist() == [0, 2, 3]
+
+        # The deleted rows are compacted away, the held rows keep their ids
+        invoice_buffer.delete(ids=np.array([0, 1]))
+        invoice_buffer.append(
+            names=np.array(["company_b", "company_a"], dtype=object), values=np.array([5.0, 6.0])
+        )
+
+        assert invoice_buffer.find(names=["company_a"]).tolist() == [2, 3, 5]
+        assert invoice_buffer.find(names=["company_b"]).tolist() == [4]
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from src.utils.invoice_name_index import InvoiceNameIndex
+
+
+@pytest.fixture()
+def name_index() -> InvoiceNameIndex:
+    """PyTest fixture to create a name index to use in tests"""
+    return InvoiceNameIndex()
+
+
+class TestInvoiceNameIndex:
+    def test_encode(self, name_index):
+        codes = name_index.encode(
+            names=np.array(["company_b", "company_a", "company_b"], dtype=object)
+        )
+
+        assert codes.dtype == np.int32
+        assert codes.tolist() == [0, 1, 0]
+        assert name_index.names == ["company_b", "company_a"]
+
+        # Existing codes are reused, new names get the next code
+        codes = name_index.encode(names=np.array(["company_a", "company_c"], dtype=object))
+
+        assert codes.tolist() == [1, 2]
+        assert len(name_index) == 3
+
+    def test_decode(self, name_index):
+        codes = name_index.encode(names=np.array(["company_a", "company_b"], dtype=object))
+
+        assert name_index.decode(codes=codes[::-1]).tolist() == ["company_b", "company_a"]
+
+    def test_initial_names(self):
+        name_index = InvoiceNameIndex(names=["company_a", "company_b"])
+
+        assert name_index.encode(names=np.array(["company_b"], dtype=object)).tolist() == [1]
+
+    def test_clear(self, name_index):
+        name_index.encode(names=np.array(["company_a", "company_b"], dtype=object))
+        name_index.clear()
+
+        assert len(name_index) == 0
+        assert name_index.encode(names=np.array(["company_b"], dtype=object)).tolist() == [0]
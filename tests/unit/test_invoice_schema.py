@@ -0,0 +1,57 @@
+from decimal import Decimal
+
+import pytest
+
+from src.utils.constants import MAX_INVOICE_VALUE, MIN_INVOICE_VALUE
+from src.utils.schemas.invoice import (
+    create_invoice_cents_schema,
+    create_invoice_schema,
+    create_invoice_stats_schema,
+    invoice_stats_optional_columns,
+)
+
+
+@pytest.mark.parametrize("create_schema", [create_invoice_schema, create_invoice_cents_schema])
+def test_invoice_schema_cached(create_schema):
+    schema = create_schema(max_invoice_value=MAX_INVOICE_VALUE, min_invoice_value=MIN_INVOICE_VALUE)
+
+    assert (
+        create_schema(max_invoice_value=MAX_INVOICE_VALUE, min_invoice_value=MIN_INVOICE_VALUE)
+        is schema
+    )
+    assert (
+        create_schema(max_invoice_value=Decimal(100), min_invoice_value=MIN_INVOICE_VALUE)
+        is not schema
+    )
+    assert (
+        create_schema(
+            max_invoice_value=MAX_INVOICE_VALUE, min_invoice_value=MIN_INVOICE_VALUE, nullable=True
+        )
+        is not schema
+    )
+
+
+def test_invoice_stats_schema_cached():
+    schema = create_invoice_stats_schema()
+
+    assert create_invoice_stats_schema() is schema
+    assert create_invoice_stats_schema(strict=False) is not schema
+    assert not create_invoice_stats_schema(strict=False).strict
+
+
+def test_invoice_stats_schema_optional_columns():
+    schema = create_invoice_stats_schema(optional_columns=("invoice_count", "invoice_q95"))
+
+    assert list(schema.columns) == [
+        "invoice_median",
+        "invoice_mean",
+        "invoice_count",
+        "invoice_q95",
+    ]
+    assert create_invoice_stats_schema(optional_columns=("invoice_count", "invoice_q95")) is schema
+
+
+def test_invoice_stats_optional_columns():
+    columns = ["invoice_mean", "invoice_median", "invoice_std", "invoice_q99.9", "invoice_qx", "a"]
+
+    assert invoice_stats_optional_columns(columns=columns) == ("invoice_std", "invoice_q99.9")
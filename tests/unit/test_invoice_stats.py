@@ -7,7 +7,7 @@ import pytest
 
 from src.invoice_stats import InvoiceStats
 from src.utils.constants import INVOICE_STATS_COLUMN_NAMES
-from tests.constants import INVOICE_STATS_PATH, LIMIT, MAX_VALUE, MIN_VALUE
+from tests.constants import INVOICE_STATS_PATH, INVOICE_VALIDATOR_PATH, LIMIT, MAX_VALUE, MIN_VALUE
 
 
 @pytest.fixture(autouse=True)
@@ -16,12 +16,6 @@ def mock_numpy() -> Generator[MagicMock, None, None]:
         yield mock_numpy
 
 
-@pytest.fixture(autouse=True)
-def mock_math() -> Generator[MagicMock, None, None]:
-    with patch(f"{INVOICE_STATS_PATH}.math") as mock_math:
-        yield mock_math
-
-
 @pytest.fixture(autouse=True)
 def mock_logging() -> Generator[MagicMock, None, None]:
     with patch(f"{INVOICE_STATS_PATH}.LOGGER") as mock_logging:
@@ -58,10 +52,18 @@ def mock_valid_invoice_limit() -> Generator[MagicMock, None, None]:
 
 @pytest.fixture(autouse=True)
 def mock_create_invoice_schema() -> Generator[MagicMock, None, None]:
-    with patch(f"{INVOICE_STATS_PATH}.create_invoice_schema") as mock_create_invoice_schema:
+    with patch(f"{INVOICE_VALIDATOR_PATH}.create_invoice_schema") as mock_create_invoice_schema:
         yield mock_create_invoice_schema
 
 
+@pytest.fixture(autouse=True)
+def mock_create_invoice_cents_schema() -> Generator[MagicMock, None, None]:
+    with patch(
+        f"{INVOICE_VALIDATOR_PATH}.create_invoice_cents_schema"
+    ) as mock_create_invoice_cents_schema:
+        yield mock_create_invoice_cents_schema
+
+
 @pytest.fixture(autouse=True)
 def mock_create_invoice_stats_schema() -> Generator[MagicMock, None, None]:
     with patch(
@@ -70,9 +72,101 @@ def mock_create_invoice_stats_schema() -> Generator[MagicMock, None, None]:
         yield mock_create_invoice_stats_schema
 
 
+@pytest.fixture(autouse=True)
+def mock_invoice_buffer() -> Generator[MagicMock, None, None]:
+    with patch(f"{INVOICE_STATS_PATH}.InvoiceBuffer") as mock_invoice_buffer:
+        mock_invoice_buffer.return_value.__len__.return_value = 0
+        yield mock_invoice_buffer
+
+
+@pytest.fixture(autouse=True)
+def mock_memory_mapped_invoice_buffer() -> Generator[MagicMock, None, None]:
+    with patch(
+        f"{INVOICE_STATS_PATH}.MemoryMappedInvoiceBuffer"
+    ) as mock_memory_mapped_invoice_buffer:
+        mock_memory_mapped_invoice_buffer.return_value.__len__.return_value = 0
+        yield mock_memory_mapped_invoice_buffer
+
+
+@pytest.fixture(autouse=True)
+def mock_parallel_exact_median() -> Generator[MagicMock, None, None]:
+    with patch(f"{INVOICE_STATS_PATH}.parallel_exact_median") as mock_parallel_exact_median:
+        yield mock_parallel_exact_median
+
+
+@pytest.fixture(autouse=True)
+def mock_running_median() -> Generator[MagicMock, None, None]:
+    with patch(f"{INVOICE_STATS_PATH}.RunningMedian") as mock_running_median:
+        yield mock_running_median
+
+
+@pytest.fixture(autouse=True)
+def mock_exact_quantiles() -> Generator[MagicMock, None, None]:
+    with patch(f"{INVOICE_STATS_PATH}.exact_quantiles") as mock_exact_quantiles:
+        yield mock_exact_quantiles
+
+
+@pytest.fixture(autouse=True)
+def mock_group_stats() -> Generator[MagicMock, None, None]:
+    with patch(f"{INVOICE_STATS_PATH}.GroupStats") as mock_group_stats:
+        yield mock_group_stats
+
+
+@pytest.fixture(autouse=True)
+def mock_quantile_sketch() -> Generator[MagicMock, None, None]:
+    with patch(f"{INVOICE_STATS_PATH}.QuantileSketch") as mock_quantile_sketch:
+        yield mock_quantile_sketch
+
+
+@pytest.fixture(autouse=True)
+def mock_running_sum() -> Generator[MagicMock, None, None]:
+    with patch(f"{INVOICE_STATS_PATH}.RunningSum") as mock_running_sum:
+        yield mock_running_sum
+
+
+@pytest.fixture(autouse=True)
+def mock_invoice_window() -> Generator[MagicMock, None, None]:
+    with patch(f"{INVOICE_STATS_PATH}.InvoiceWindow") as mock_invoice_window:
+        yield mock_invoice_window
+
+
+@pytest.fixture(autouse=True)
+def mock_numpy_validator() -> Generator[MagicMock, None, None]:
+    with patch(f"{INVOICE_VALIDATOR_PATH}.NumpyValidator") as mock_numpy_validator:
+        yield mock_numpy_validator
+
+
+@pytest.fixture(autouse=True)
+def mock_partial_aggregate() -> Generator[MagicMock, None, None]:
+    with patch(f"{INVOICE_STATS_PATH}.PartialAggregate") as mock_partial_aggregate:
+        yield mock_partial_aggregate
+
+
+@pytest.fixture(autouse=True)
+def mock_read_invoice_file() -> Generator[MagicMock, None, None]:
+    with patch(f"{INVOICE_STATS_PATH}.read_invoice_file") as mock_read_invoice_file:
+        yield mock_read_invoice_file
+
+
+@pytest.fixture(autouse=True)
+def mock_write_snapshot() -> Generator[MagicMock, None, None]:
+    with patch(f"{INVOICE_STATS_PATH}.write_snapshot") as mock_write_snapshot:
+        yield mock_write_snapshot
+
+
+@pytest.fixture(autouse=True)
+def mock_parallel_validator() -> Generator[MagicMock, None, None]:
+    with patch(f"{INVOICE_VALIDATOR_PATH}.ParallelValidator") as mock_parallel_validator:
+        yield mock_parallel_validator
+
+
 @pytest.fixture(autouse=True)
 def invoice_instance(
+    mock_numpy,
     mock_pandas,
+    mock_invoice_buffer,
+    mock_running_median,
+    mock_running_sum,
     mock_valid_min_invoice_val,
     mock_valid_max_invoice_val,
     mock_valid_invoice_limit,
@@ -97,14 +191,22 @@ class TestInvoiceStats:
         mock_valid_invoice_limit,
         mock_create_invoice_schema,
         mock_create_invoice_stats_schema,
+        mock_invoice_buffer,
+        mock_numpy,
     ):
         # Check Pandas DF logic
-        assert mock_pandas.DataFrame.call_count == 2
+        assert mock_pandas.DataFrame.call_count == 1
         assert mock_pandas.DataFrame.call_args_list == [
-            call(columns=["invoice_name", "invoice_value"]),
             call(columns=["invoice_mean", "invoice_median"]),
         ]
 
+        # Check InvoiceBuffer logic
+        assert mock_invoice_buffer.call_count == 1
+        assert mock_invoice_buffer.call_args_list == [
+            call(capacity_limit=LIMIT, value_dtype=mock_numpy.float64)
+        ]
+        assert invoice_instance.invoices == mock_invoice_buffer.return_value.to_frame.return_value
+
         # Column names for median and mean
         assert invoice_instance.median_col_name == INVOICE_STATS_COLUMN_NAMES.get("invoice_median")
         assert invoice_instance.mean_col_name == INVOICE_STATS_COLUMN_NAMES.get("invoice_mean")
@@ -134,6 +236,170 @@ class TestInvoiceStats:
         assert mock_create_invoice_stats_schema.call_count == 1
         assert mock_create_invoice_stats_schema.call_args_list == [call()]
 
+    def test_constructor_call_fixed_point(
+        self,
+        mock_create_invoice_schema,
+        mock_create_invoice_cents_schema,
+        mock_invoice_buffer,
+        mock_numpy,
+    ):
+        mock_create_invoice_schema.reset_mock()
+        mock_invoice_buffer.reset_mock()
+
+        invoice_stats = InvoiceStats(
+            max_invoice_value=MAX_VALUE,
+            min_invoice_value=MIN_VALUE,
+            invoice_limit=LIMIT,
+            fixed_point=True,
+        )
+
+        # Check cents schema and buffer logic
+        assert mock_create_invoice_schema.call_count == 0
+        assert mock_create_invoice_cents_schema.call_args_list == [
+            call(max_invoice_value=MAX_VALUE, min_invoice_value=MIN_VALUE)
+        ]
+        assert invoice_stats.invoice_schema == mock_create_invoice_cents_schema.return_value
+        assert mock_invoice_buffer.call_args_list == [
+            call(capacity_limit=LIMIT, value_dtype=mock_numpy.int64)
+        ]
+
+    def test_constructor_call_sketch(
+        self, mock_invoice_buffer, mock_running_median, mock_quantile_sketch, mock_numpy
+    ):
+        mock_invoice_buffer.reset_mock()
+        mock_running_median.reset_mock()
+
+        invoice_stats = InvoiceStats(sketch_k=100)
+
+        # Check sketch logic, the invoice buffer holds no invoices
+        assert mock_quantile_sketch.call_args_list == [call(k=100, value_dtype=mock_numpy.float64)]
+        assert invoice_stats._quantile_sketch == mock_quantile_sketch.return_value
+        assert invoice_stats._running_median is None
+        assert mock_running_median.call_count == 0
+        assert mock_invoice_buffer.call_args_list == [
+            call(capacity_limit=0, value_dtype=mock_numpy.float64)
+        ]
+
+    def test_constructor_call_sketch_and_storage_dir(self):
+        with pytest.raises(ValueError):
+            InvoiceStats(storage_dir="invoice_store", sketch_k=100)
+
+    def test_constructor_call_window(
+        self, mock_invoice_buffer, mock_invoice_window, mock_running_median, mock_numpy
+    ):
+        mock_invoice_buffer.reset_mock()
+
+        invoice_stats = InvoiceStats(window_size=100)
+
+        # Check window logic, the invoice buffer holds no invoices
+        assert mock_invoice_window.call_args_list == [
+            call(size=100, value_dtype=mock_numpy.float64)
+        ]
+        assert invoice_stats._invoice_window == mock_invoice_window.return_value
+        assert invoice_stats._running_median == mock_running_median.return_value
+        assert mock_invoice_buffer.call_args_list == [
+            call(capacity_limit=0, value_dtype=mock_numpy.float64)
+        ]
+
+    @pytest.mark.parametrize(
+        "kwargs", [{"storage_dir": "invoice_store"}, {"sketch_k": 100}, {"group_stats": True}]
+    )
+    def test_constructor_call_window_combined(self, kwargs):
+        with pytest.raises(ValueError):
+            InvoiceStats(window_size=100, **kwargs)
+
+    @pytest.mark.parametrize("row_count", [0, 3])
+    def test_constructor_call_storage_dir(
+        self,
+        row_count,
+        mock_invoice_buffer,
+        mock_memory_mapped_invoice_buffer,
+        mock_running_median,
+        mock_running_sum,
+        mock_numpy,
+    ):
+        mock_invoice_buffer.reset_mock()
+        mock_running_median.reset_mock()
+        mock_running_sum.reset_mock()
+        mock_memory_mapped_invoice_buffer.return_value.__len__.return_value = row_count
+
+        invoice_stats = InvoiceStats(
+            max_invoice_value=MAX_VALUE,
+            min_invoice_value=MIN_VALUE,
+            invoice_limit=LIMIT,
+            storage_dir="invoice_store",
+        )
+
+        # Check MemoryMappedInvoiceBuffer logic
+        assert mock_invoice_buffer.call_count == 0
+        assert mock_memory_mapped_invoice_buffer.call_args_list == [
+            call(directory="invoice_store", capacity_limit=LIMIT, value_dtype=mock_numpy.float64)
+        ]
+
+        # No running median is held in memory
+        assert mock_running_median.call_count == 0
+        assert invoice_stats._running_median is None
+
+        # The running sum is initialised from an existing store
+        if row_count > 0:
+            assert mock_running_sum.return_value.extend.call_args_list == [
+                call(values=mock_memory_mapped_invoice_buffer.return_value.values)
+            ]
+        else:
+            assert mock_running_sum.return_value.extend.call_count == 0
+
+    def test_compute_aggregates_without_running_median(
+        self,
+        invoice_instance,
+        mock_parallel_exact_median,
+        mock_invoice_buffer,
+        mock_exact_quantiles,
+    ):
+        invoice_instance._running_median = None
+        invoice_instance.median_workers = 4
+
+        aggregates = invoice_instance._compute_aggregates(columns=["invoice_median"])
+
+        # Check parallel_exact_median logic, selected from the invoice values
+        assert aggregates == {"invoice_median": mock_parallel_exact_median.return_value}
+        assert mock_parallel_exact_median.call_args_list == [
+            call(values=mock_invoice_buffer.return_value.values, scale=1, workers=4)
+        ]
+        assert mock_exact_quantiles.call_count == 0
+
+    def test_compute_aggregates_fused(
+        self,
+        invoice_instance,
+        mock_parallel_exact_median,
+        mock_invoice_buffer,
+        mock_exact_quantiles,
+        mock_running_sum,
+    ):
+        invoice_instance._running_median = None
+        mock_exact_quantiles.return_value = [1.0, 2.0, 3.0, 4.0]
+
+        aggregates = invoice_instance._compute_aggregates(
+            columns=["invoice_mean", "invoice_median", "invoice_min", "invoice_q95", "invoice_max"],
+            quantiles=[0.95],
+        )
+
+        # The median is selected together with the min, quantiles and max, by one partition
+        assert aggregates == {
+            "invoice_mean": mock_running_sum.return_value.mean.return_value,
+            "invoice_min": 1.0,
+            "invoice_q95": 2.0,
+            "invoice_max": 3.0,
+            "invoice_median": 4.0,
+        }
+        assert mock_exact_quantiles.call_args_list == [
+            call(
+                values=mock_invoice_buffer.return_value.values,
+                quantiles=[0.0, 0.95, 1.0, 0.5],
+                scale=1,
+            )
+        ]
+        assert mock_parallel_exact_median.call_count == 0
+
     @pytest.mark.parametrize(
         "invoices",
         [
@@ -164,57 +430,46 @@ class TestInvoiceStats:
         # Check Pandas DF logic
         assert mock_pandas.DataFrame.call_count == 1
         assert mock_pandas.DataFrame.call_args_list == [
-            call(invoices, columns=invoice_instance.invoices.columns)
+            call(invoices, columns=["invoice_name", "invoice_value"])
         ]
 
-    @pytest.mark.parametrize(
-        "invoices, ignore_index",
-        [
-            (
-                [
-                    {"invoice_name": f"company_a", "invoice_value": Decimal(MAX_VALUE / 2)},
-                    {"invoice_name": f"company_b", "invoice_value": Decimal(MAX_VALUE - 2)},
-                ],
-                True,
-            )
-        ],
-    )
-    def test_add_multiple_invoices(
-        self, invoices, ignore_index, invoice_instance, mock_pandas,
-    ):
+    def test_add_multiple_invoices(self, invoice_instance, mock_pandas, mock_running_sum):
         # Reset pandas mock to validate inner calls
         mock_pandas.reset_mock()
 
-        # Set shape and loc logic
-        invoice_instance.invoices.shape.__getitem__.return_value = MIN_VALUE
-        invoice_instance.invoices.loc.__getitem__.return_value = invoices
-        mock_pd = invoice_instance.invoices
+        # Set row count logic
+        mock_running_sum.return_value.__len__.return_value = MIN_VALUE
+        invoices = MagicMock(spec=pd.DataFrame)
+        invoices.shape = (2, 2)
+        invoice_instance._append_invoices = MagicMock()
 
         # Make call
         invoice_instance.add_invoice(invoice=invoices)
 
-        # Concat logic when only 1 row insert
-        assert mock_pandas.concat.call_count == 1
-        assert mock_pandas.concat.call_args_list == [
-            call([invoices, mock_pd], ignore_index=ignore_index,)
-        ]
+        # No DataFrame is created, nor concatenated, for a batch of invoices
+        assert mock_pandas.DataFrame.call_count == 0
+        assert mock_pandas.concat.call_count == 0
 
-        # Check mock_create_invoice_schema logic
+        # Check mock_create_invoice_schema logic, only the new invoices are validated
         assert invoice_instance.invoice_schema.validate.call_count == 1
-        assert invoice_instance.invoice_schema.validate.call_args_list == [
-            call(invoice_instance.invoices)
+        assert invoice_instance.invoice_schema.validate.call_args_list == [call(invoices)]
+
+        # Check _append_invoices logic
+        assert invoice_instance._append_invoices.call_args_list == [
+            call(invoices=invoice_instance.invoice_schema.validate.return_value)
         ]
 
     @pytest.mark.parametrize(
         "invoice", [({"invoice_name": f"company_a", "invoice_value": Decimal(MAX_VALUE / 2)})],
     )
-    def test_add_single_invoice(self, invoice, invoice_instance, mock_pandas):
+    def test_add_single_invoice(self, invoice, invoice_instance, mock_pandas, mock_running_sum):
         # Reset pandas mock to validate inner calls
         mock_pandas.reset_mock()
 
-        # Set shape and loc logic
-        invoice_instance.invoices.shape.__getitem__.return_value = MIN_VALUE
-        invoice_instance.invoices.loc.__getitem__.return_value = invoice
+        # Set row count logic
+        mock_running_sum.return_value.__len__.return_value = MIN_VALUE
+        mock_pandas.DataFrame.return_value.shape = (1, 2)
+        invoice_instance._append_invoices = MagicMock()
 
         # Make call
         invoice_instance.add_invoice(invoice=invoice)
@@ -222,12 +477,48 @@ class TestInvoiceStats:
         # Concat logic when only 1 row insert
         assert mock_pandas.concat.call_count == 0
 
+        # Check Pandas DF logic, the single invoice is validated as a one row DataFrame
+        assert mock_pandas.DataFrame.call_count == 1
+        assert mock_pandas.DataFrame.call_args_list == [
+            call([invoice], columns=["invoice_name", "invoice_value"])
+        ]
+
         # Check mock_create_invoice_schema logic
         assert invoice_instance.invoice_schema.validate.call_count == 1
         assert invoice_instance.invoice_schema.validate.call_args_list == [
-            call(invoice_instance.invoices)
+            call(mock_pandas.DataFrame.return_value)
+        ]
+
+        # Check _append_invoices logic
+        assert invoice_instance._append_invoices.call_args_list == [
+            call(invoices=invoice_instance.invoice_schema.validate.return_value)
         ]
 
+    @pytest.mark.parametrize(
+        "warning_msg",
+        [[call("Maximal limit of invoices reached, only 1 of 3 invoices are added")]],
+    )
+    def test_add_invoice_above_limit(
+        self, warning_msg, invoice_instance, mock_logging, mock_running_sum
+    ):
+        # Set row count logic, room for one more invoice
+        mock_running_sum.return_value.__len__.return_value = LIMIT - 1
+        invoices = MagicMock(spec=pd.DataFrame)
+        invoices.shape = (3, 2)
+        invoice_instance._append_invoices = MagicMock()
+
+        # Make call
+        invoice_instance.add_invoice(invoice=invoices)
+
+        # Check mock_logging logic
+        assert mock_logging.warning.call_args_list == warning_msg
+
+        # Only the invoices within the limit are validated
+        assert invoice_instance.invoice_schema.validate.call_args_list == [
+            call(invoices.iloc.__getitem__.return_value)
+        ]
+        assert invoices.iloc.__getitem__.call_args_list == [call(slice(None, 1, None))]
+
     @pytest.mark.parametrize(
         "warning_msg",
         [
@@ -238,9 +529,11 @@ class TestInvoiceStats:
             ]
         ],
     )
-    def test_add_invoice_warning(self, warning_msg, invoice_instance, mock_logging):
-        # Set shape and loc logic
-        invoice_instance.invoices.shape.__getitem__.return_value = LIMIT + 1
+    def test_add_invoice_warning(
+        self, warning_msg, invoice_instance, mock_logging, mock_running_sum
+    ):
+        # Set row count logic
+        mock_running_sum.return_value.__len__.return_value = LIMIT + 1
 
         # Make call
         invoice_instance.add_invoice(invoice={"a": 0})
@@ -249,31 +542,175 @@ class TestInvoiceStats:
         assert mock_logging.warning.call_count == 1
         assert mock_logging.warning.call_args_list == warning_msg
 
-    def test_clear(self, invoice_instance):
-        invoice_instance.invoices = MagicMock(spec=pd.DataFrame)
+        # Nothing is validated when the limit is reached
+        assert invoice_instance.invoice_schema.validate.call_count == 0
+
+    def test_append_invoices(
+        self,
+        invoice_instance,
+        mock_invoice_buffer,
+        mock_running_median,
+        mock_running_sum,
+        mock_numpy,
+    ):
+        invoices = MagicMock(spec=pd.DataFrame)
+
+        invoice_instance._append_invoices(invoices=invoices)
+
+        # Check RunningMedian and RunningSum logic
+        assert mock_running_median.return_value.extend.call_args_list == [
+            call(values=invoices.__getitem__.return_value.to_numpy.return_value)
+        ]
+        assert mock_running_sum.return_value.extend.call_args_list == [
+            call(values=invoices.__getitem__.return_value.to_numpy.return_value)
+        ]
+
+        # Check InvoiceBuffer logic
+        assert mock_invoice_buffer.return_value.append.call_args_list == [
+            call(
+                names=invoices.__getitem__.return_value.to_numpy.return_value,
+                values=invoices.__getitem__.return_value.to_numpy.return_value,
+            )
+        ]
+        assert invoices.__getitem__.call_args_list == [call("invoice_name"), call("invoice_value")]
+        assert invoices.__getitem__.return_value.to_numpy.call_args_list == [
+            call(dtype=object),
+            call(dtype=mock_invoice_buffer.return_value.value_dtype),
+        ]
+
+        # Group stats are not kept by default
+        assert invoice_instance._group_stats is None
+
+    def test_append_invoices_window(
+        self, mock_invoice_buffer, mock_invoice_window, mock_running_median, mock_running_sum
+    ):
+        invoice_stats = InvoiceStats(window_size=100)
+        invoices = MagicMock(spec=pd.DataFrame)
+        values = invoices.__getitem__.return_value.to_numpy.return_value
+
+        invoice_stats._append_invoices(invoices=invoices)
+
+        # The most recent values of the batch are appended to the window, and the evicted values
+        # are removed from the running aggregates
+        window_values = values.__getitem__.return_value
+        evicted_values = mock_invoice_window.return_value.append.return_value
+
+        assert values.__getitem__.call_args_list == [call(slice(-100, None, None))]
+        assert mock_invoice_window.return_value.append.call_args_list == [
+            call(values=window_values)
+        ]
+        assert mock_invoice_buffer.return_value.append.call_count == 0
+        assert mock_running_sum.return_value.remove.call_args_list == [call(values=evicted_values)]
+        assert mock_running_median.return_value.remove.call_args_list == [
+            call(values=evicted_values)
+        ]
+        assert mock_running_sum.return_value.extend.call_args_list == [call(values=window_values)]
+        assert mock_running_median.return_value.extend.call_args_list == [
+            call(values=window_values)
+        ]
+
+    def test_append_invoices_group_stats(self, mock_group_stats):
+        invoice_stats = InvoiceStats(group_stats=True)
+        invoices = MagicMock(spec=pd.DataFrame)
+
+        invoice_stats._append_invoices(invoices=invoices)
+
+        # Check GroupStats logic, updated on every insert
+        assert mock_group_stats.return_value.extend.call_args_list == [
+            call(
+                names=invoices.__getitem__.return_value.to_numpy.return_value,
+                values=invoices.__getitem__.return_value.to_numpy.return_value,
+            )
+        ]
+
+    def test_get_group_stats(self, mock_group_stats):
+        invoice_stats = InvoiceStats(group_stats=True, fixed_point=True)
+
+        group_stats = invoice_stats.get_group_stats(name="company_a")
+        all_group_stats = invoice_stats.get_all_group_stats()
+
+        assert group_stats == mock_group_stats.return_value.get.return_value
+        assert all_group_stats == mock_group_stats.return_value.to_frame.return_value
+        assert mock_group_stats.return_value.get.call_args_list == [
+            call(name="company_a", scale=100)
+        ]
+        assert mock_group_stats.return_value.to_frame.call_args_list == [call(scale=100)]
+
+    def test_get_group_stats_disabled(self, invoice_instance):
+        with pytest.raises(ValueError):
+            invoice_instance.get_group_stats(name="company_a")
+
+        with pytest.raises(ValueError):
+            invoice_instance.get_all_group_stats()
+
+    @pytest.mark.parametrize(
+        "row_counts, expected_add_invoice_count, expected_accepted_row_count",
+        [([0, 3, 6, 9, 9], 3, 9), ([0, 3, LIMIT, LIMIT], 2, LIMIT)],
+    )
+    def test_add_invoices_from_file(
+        self,
+        row_counts,
+        expected_add_invoice_count,
+        expected_accepted_row_count,
+        invoice_instance,
+        mock_running_sum,
+        mock_read_invoice_file,
+    ):
+        chunks = [MagicMock(spec=pd.DataFrame) for _ in range(3)]
+        mock_read_invoice_file.return_value = iter(chunks)
+        mock_running_sum.return_value.__len__.side_effect = row_counts
+        invoice_instance.add_invoice = MagicMock()
+
+        # Make call
+        accepted_row_count = invoice_instance.add_invoices_from_file(
+            path="invoices.csv", chunksize=3
+        )
+
+        # Check read_invoice_file logic
+        assert mock_read_invoice_file.call_args_list == [
+            call(path="invoices.csv", chunksize=3, file_format=None)
+        ]
+
+        # Every chunk is added until the limit is reached
+        assert invoice_instance.add_invoice.call_args_list == [
+            call(invoice=chunk) for chunk in chunks[:expected_add_invoice_count]
+        ]
+        assert accepted_row_count == expected_accepted_row_count
+
+    def test_validate_all(self, invoice_instance):
+        invoice_instance.validate_all()
+
+        # Check mock_create_invoice_schema logic, the whole invoice table is validated
+        assert invoice_instance.invoice_schema.validate.call_count == 1
+        assert invoice_instance.invoice_schema.validate.call_args_list == [
+            call(invoice_instance.invoices)
+        ]
+
+    def test_clear(
+        self, invoice_instance, mock_invoice_buffer, mock_running_median, mock_running_sum
+    ):
         invoice_instance.invoice_stats = MagicMock(spec=pd.DataFrame)
 
         # Set shape and loc logic
-        invoice_instance.invoices.shape.__getitem__.return_value = MIN_VALUE
+        mock_running_sum.return_value.__len__.return_value = MIN_VALUE
         invoice_instance.invoice_stats.shape.__getitem__.return_value = MIN_VALUE
 
         # Make call
         invoice_instance.clear()
 
-        # Check drop logic
-        assert invoice_instance.invoices.drop.call_count == 1
-        assert invoice_instance.invoices.drop.call_args_list == [
-            call(invoice_instance.invoices.index, inplace=True)
-        ]
+        # Check clear logic
+        assert mock_invoice_buffer.return_value.clear.call_count == 1
+        assert mock_running_median.return_value.clear.call_count == 1
+        assert mock_running_sum.return_value.clear.call_count == 1
         assert invoice_instance.invoice_stats.drop.call_count == 1
         assert invoice_instance.invoice_stats.drop.call_args_list == [
             call(invoice_instance.invoice_stats.index, inplace=True)
         ]
 
     @pytest.mark.parametrize("warning_msg", [[call("Warning! There is no data to delete!")]])
-    def test_clear_warning(self, warning_msg, invoice_instance, mock_logging):
+    def test_clear_warning(self, warning_msg, invoice_instance, mock_logging, mock_running_sum):
         # Set shape and loc logic
-        invoice_instance.invoices.shape.__getitem__.return_value = 0
+        mock_running_sum.return_value.__len__.return_value = 0
         invoice_instance.invoice_stats.shape.__getitem__.return_value = 0
 
         # Make call
@@ -283,82 +720,450 @@ class TestInvoiceStats:
         assert mock_logging.warning.call_count == 1
         assert mock_logging.warning.call_args_list == warning_msg
 
+    def test_remove_invoices(
+        self,
+        invoice_instance,
+        mock_numpy,
+        mock_invoice_buffer,
+        mock_running_median,
+        mock_running_sum,
+    ):
+        removed_names, removed_values = MagicMock(), MagicMock()
+        mock_invoice_buffer.return_value.delete.return_value = (removed_names, removed_values)
+
+        removed_count = invoice_instance.remove_invoices(invoice_ids=[1, 2])
+
+        # Deleted from the invoice buffer by id, the running aggregates are updated in place
+        assert removed_count == removed_values.shape.__getitem__.return_value
+        assert mock_numpy.union1d.call_count == 0
+        assert mock_invoice_buffer.return_value.delete.call_args_list == [
+            call(ids=mock_numpy.asarray.return_value)
+        ]
+        assert mock_running_sum.return_value.remove.call_args_list == [call(values=removed_values)]
+        assert mock_running_median.return_value.remove.call_args_list == [
+            call(values=removed_values)
+        ]
+
+    def test_remove_invoices_by_name(self, mock_numpy, mock_invoice_buffer, mock_group_stats):
+        invoice_stats = InvoiceStats(group_stats=True)
+        removed_names, removed_values = MagicMock(), MagicMock()
+        mock_invoice_buffer.return_value.delete.return_value = (removed_names, removed_values)
+
+        invoice_stats.remove_invoices(names=["company_a"])
+
+        # The ids of the names are looked up in the invoice buffer
+        assert mock_invoice_buffer.return_value.find.call_args_list == [call(names=["company_a"])]
+        assert mock_numpy.union1d.call_args_list == [
+            call(
+                mock_numpy.asarray.return_value, mock_invoice_buffer.return_value.find.return_value,
+            )
+        ]
+        assert mock_invoice_buffer.return_value.delete.call_args_list == [
+            call(ids=mock_numpy.union1d.return_value)
+        ]
+        assert mock_group_stats.return_value.remove.call_args_list == [
+            call(names=removed_names, values=removed_values)
+        ]
+
+    def test_remove_invoice(self, invoice_instance):
+        invoice_instance.remove_invoices = MagicMock()
+
+        invoice_instance.remove_invoice(invoice_id=3)
+
+        assert invoice_instance.remove_invoices.call_args_list == [call(invoice_ids=[3])]
+
+    def test_remove_invoices_without_ids_or_names(self, invoice_instance, mock_invoice_buffer):
+        with pytest.raises(ValueError):
+            invoice_instance.remove_invoices()
+
+        assert mock_invoice_buffer.return_value.delete.call_count == 0
+
     @pytest.mark.parametrize(
-        "expected_agg_input, expected_round_down_input",
-        [([call(agg_type="mean", column="invoice_mean", row=0)], [call(column="invoice_mean")],)],
+        "kwargs", [{"sketch_k": 200}, {"storage_dir": "invoice_store"}, {"window_size": 10}]
     )
-    def test_get_mean(self, expected_agg_input, expected_round_down_input, invoice_instance):
-        invoice_instance._set_agg_value_invoice_values = MagicMock()
+    def test_remove_invoices_not_held_in_memory(self, kwargs):
+        invoice_stats = InvoiceStats(**kwargs)
+
+        with pytest.raises(ValueError):
+            invoice_stats.remove_invoices(invoice_ids=[0])
+
+    def test_validate_all_with_validation_workers(
+        self, mock_parallel_validator, mock_create_invoice_schema
+    ):
+        invoice_stats = InvoiceStats(validation_workers=4)
+        invoice_stats.validate_all()
+        invoice_stats.close()
+
+        # Validated by the worker processes, not by the schema directly
+        assert invoice_stats.invoice_schema.validate.call_count == 0
+        assert mock_parallel_validator.call_args_list == [
+            call(
+                schema_factory=mock_create_invoice_schema,
+                schema_arguments={"max_invoice_value": MAX_VALUE, "min_invoice_value": MIN_VALUE},
+                validation_backend="pandera",
+                workers=4,
+            )
+        ]
+        assert mock_parallel_validator.return_value.validate.call_args_list == [
+            call(invoices=invoice_stats.invoices)
+        ]
+        assert mock_parallel_validator.return_value.close.call_count == 1
+
+    def test_numpy_validation_backend(
+        self, mock_numpy_validator, mock_create_invoice_schema, mock_running_sum
+    ):
+        mock_running_sum.return_value.__len__.return_value = MIN_VALUE
+        invoice_stats = InvoiceStats(validation_backend="numpy")
+        invoice_stats._append_invoices = MagicMock()
+        invoices = MagicMock(spec=pd.DataFrame)
+        invoices.shape = (2, 2)
+
+        invoice_stats.add_invoice(invoice=invoices)
+
+        # The validator is compiled from the invoice schema, and validates instead of it
+        assert mock_numpy_validator.call_args_list == [
+            call(schema=mock_create_invoice_schema.return_value)
+        ]
+        assert invoice_stats.invoice_validator == mock_numpy_validator.return_value
+        assert mock_numpy_validator.return_value.validate.call_args_list == [call(invoices)]
+        assert invoice_stats.invoice_schema.validate.call_count == 0
+        assert invoice_stats._append_invoices.call_args_list == [
+            call(invoices=mock_numpy_validator.return_value.validate.return_value)
+        ]
+
+    def test_numpy_validation_backend_with_validation_workers(
+        self, mock_parallel_validator, mock_create_invoice_cents_schema
+    ):
+        invoice_stats = InvoiceStats(
+            fixed_point=True, validation_backend="numpy", validation_workers=4
+        )
+        invoice_stats.validate_all()
+
+        # The workers build the same NumPy validator from the schema factory
+        assert mock_parallel_validator.call_args_list == [
+            call(
+                schema_factory=mock_create_invoice_cents_schema,
+                schema_arguments={"max_invoice_value": MAX_VALUE, "min_invoice_value": MIN_VALUE},
+                validation_backend="numpy",
+                workers=4,
+            )
+        ]
+        assert mock_parallel_validator.return_value.validate.call_args_list == [
+            call(invoices=invoice_stats.invoices)
+        ]
+
+    def test_unknown_validation_backend(self, mock_numpy_validator):
+        with pytest.raises(ValueError):
+            InvoiceStats(validation_backend="cerberus")
+
+        assert mock_numpy_validator.call_count == 0
+
+    def test_get_quantiles(self, invoice_instance, mock_exact_quantiles, mock_invoice_buffer):
+        mock_exact_quantiles.return_value = [1.0, 2.0, 3.0, 4.0]
         invoice_instance._round_down = MagicMock()
 
+        invoice_instance.get_quantiles(quantiles=[0.5, 0.95])
+
+        # Min, quantiles and max are selected at once
+        assert mock_exact_quantiles.call_args_list == [
+            call(
+                values=mock_invoice_buffer.return_value.values,
+                quantiles=[0.0, 0.5, 0.95, 1.0],
+                scale=1,
+            )
+        ]
+        # Every column but the count is rounded
+        assert invoice_instance._round_down.call_args_list == [
+            call(column="invoice_min"),
+            call(column="invoice_max"),
+            call(column="invoice_std"),
+            call(column="invoice_q50"),
+            call(column="invoice_q95"),
+        ]
+        assert invoice_instance.invoice_stats_schema.validate.call_count == 1
+
+    def test_get_quantiles_after_snapshot(self, invoice_instance, mock_running_sum):
+        mock_running_sum.return_value.__len__.return_value = 3
+
+        # The restored invoices are not held in the invoice buffer
+        with pytest.raises(ValueError):
+            invoice_instance.get_quantiles()
+
+    def test_get_quantile_sketch(self, mock_quantile_sketch):
+        invoice_stats = InvoiceStats(sketch_k=100, fixed_point=True)
+        mock_quantile_sketch.return_value.quantile.return_value = 9500
+
+        # Approximated by the sketch, in units
+        assert invoice_stats.get_quantile(q=0.95) == 95.0
+        assert mock_quantile_sketch.return_value.quantile.call_args_list == [call(q=0.95)]
+
+    def test_compute_aggregates_sketch(self, mock_quantile_sketch):
+        invoice_stats = InvoiceStats(sketch_k=100)
+
+        aggregates = invoice_stats._compute_aggregates(columns=["invoice_median"])
+
+        # Check sketch logic, the median is approximated by the sketch
+        assert aggregates == {
+            "invoice_median": mock_quantile_sketch.return_value.median.return_value
+        }
+        assert mock_quantile_sketch.return_value.median.call_args_list == [call(scale=1)]
+
+    def test_metrics(self, invoice_instance, mock_invoice_buffer, mock_running_sum):
+        mock_running_sum.return_value.__len__.return_value = 3
+        mock_invoice_buffer.return_value.nbytes = 24
+
+        # Metrics are disabled by default, only the gauges are reported
+        assert invoice_instance.metrics() == {
+            "counters": {},
+            "timings": {},
+            "gauges": {"rows_held": 3, "bytes_held": 24},
+        }
+
+    @pytest.mark.parametrize("exact", [False, True])
+    def test_to_partial_aggregate(
+        self,
+        exact,
+        invoice_instance,
+        mock_invoice_buffer,
+        mock_running_sum,
+        mock_quantile_sketch,
+        mock_partial_aggregate,
+    ):
+        values = mock_invoice_buffer.return_value.values
+
+        partial_aggregate = invoice_instance.to_partial_aggregate(exact=exact)
+
+        # The invoice values are sketched, and only held by an exact partial aggregate
+        assert partial_aggregate == mock_partial_aggregate.return_value
+        assert mock_quantile_sketch.call_args_list == [call(k=200, value_dtype=values.dtype.type)]
+        assert mock_quantile_sketch.return_value.extend.call_args_list == [call(values=values)]
+        assert mock_running_sum.return_value.set_state.call_args_list == [
+            call(state=mock_running_sum.return_value.get_state.return_value)
+        ]
+        assert mock_partial_aggregate.call_args_list == [
+            call(
+                fixed_point=False,
+                running_sum=mock_running_sum.return_value,
+                quantile_sketch=mock_quantile_sketch.return_value,
+                values=values.copy.return_value if exact else None,
+            )
+        ]
+
+    def test_to_partial_aggregate_sketch(self, mock_quantile_sketch, mock_partial_aggregate):
+        invoice_stats = InvoiceStats(sketch_k=100)
+
+        invoice_stats.to_partial_aggregate()
+
+        # The sketch of the instance is copied
+        assert mock_quantile_sketch.return_value.merge.call_args_list == [
+            call(other=mock_quantile_sketch.return_value)
+        ]
+        assert mock_quantile_sketch.return_value.extend.call_count == 0
+
+        with pytest.raises(ValueError):
+            invoice_stats.to_partial_aggregate(exact=True)
+
+    @pytest.mark.parametrize("exact", [False, True])
+    def test_from_partial_aggregate(
+        self, exact, mock_running_median, mock_running_sum, mock_quantile_sketch
+    ):
+        partial_aggregate = MagicMock()
+        partial_aggregate.exact = exact
+        partial_aggregate.fixed_point = True
+        partial_aggregate.quantile_sketch.k = 100
+
+        invoice_stats = InvoiceStats.from_partial_aggregate(partial_aggregate=partial_aggregate)
+
+        assert invoice_stats.fixed_point
+        assert invoice_stats.sketch_k == (None if exact else 100)
+        assert mock_running_sum.return_value.set_state.call_args_list == [
+            call(state=partial_aggregate.running_sum.get_state.return_value)
+        ]
+
+        if exact:
+            assert mock_running_median.return_value.rebuild.call_args_list == [
+                call(values=partial_aggregate.values)
+            ]
+        else:
+            assert mock_quantile_sketch.return_value.merge.call_args_list == [
+                call(other=partial_aggregate.quantile_sketch)
+            ]
+
+    def test_save_snapshot(
+        self, invoice_instance, mock_write_snapshot, mock_running_median, mock_running_sum
+    ):
+        invoice_instance.save_snapshot(path="invoice_stats.snapshot")
+
+        # Check write_snapshot logic
+        assert mock_write_snapshot.call_args_list == [
+            call(
+                path="invoice_stats.snapshot",
+                header={
+                    "max_invoice_value": str(MAX_VALUE),
+                    "min_invoice_value": str(MIN_VALUE),
+                    "invoice_limit": str(LIMIT),
+                    "fixed_point": False,
+                    "sketch_k": None,
+                    "running_sum": mock_running_sum.return_value.get_state.return_value,
+                },
+                arrays=mock_running_median.return_value.get_state.return_value,
+            )
+        ]
+
+    def test_save_snapshot_without_running_median(self, invoice_instance, mock_write_snapshot):
+        invoice_instance._running_median = None
+
+        with pytest.raises(ValueError):
+            invoice_instance.save_snapshot(path="invoice_stats.snapshot")
+
+        assert mock_write_snapshot.call_count == 0
+
+    def test_get_mean(self, invoice_instance):
+        invoice_instance._get_stats = MagicMock()
+
         invoice_instance.get_mean()
 
-        # Check _set_agg_value_invoice_values logic
-        assert invoice_instance._set_agg_value_invoice_values.call_count == 1
-        assert invoice_instance._set_agg_value_invoice_values.call_args_list == expected_agg_input
+        assert invoice_instance._get_stats.call_args_list == [call(columns=["invoice_mean"], row=0)]
 
-        # Check _round_down logic
-        assert invoice_instance._round_down.call_count == 1
-        assert invoice_instance._round_down.call_args_list == expected_round_down_input
+    def test_get_median(self, invoice_instance):
+        invoice_instance._get_stats = MagicMock()
 
-        # Check stats schema
-        assert invoice_instance.invoice_stats_schema.validate.call_count == 1
-        assert invoice_instance.invoice_stats_schema.validate.call_args_list == [
-            call(invoice_instance.invoice_stats)
+        invoice_instance.get_median(row=1)
+
+        assert invoice_instance._get_stats.call_args_list == [
+            call(columns=["invoice_median"], row=1)
         ]
 
     @pytest.mark.parametrize(
-        "expected_agg_input, expected_round_down_input",
+        "quantiles, expected_columns",
         [
+            ((), ["invoice_mean", "invoice_median"]),
             (
-                [call(agg_type="median", column="invoice_median", row=0)],
-                [call(column="invoice_median")],
-            )
+                [0.95],
+                [
+                    "invoice_mean",
+                    "invoice_median",
+                    "invoice_count",
+                    "invoice_min",
+                    "invoice_max",
+                    "invoice_std",
+                    "invoice_q95",
+                ],
+            ),
         ],
     )
-    def test_get_median(self, expected_agg_input, expected_round_down_input, invoice_instance):
-        invoice_instance._set_agg_value_invoice_values = MagicMock()
-        invoice_instance._round_down = MagicMock()
+    def test_get_stats(self, quantiles, expected_columns, invoice_instance):
+        invoice_instance._get_stats = MagicMock()
 
-        invoice_instance.get_median()
+        invoice_instance.get_stats(quantiles=quantiles)
 
-        # Check _set_agg_value_invoice_values logic
-        assert invoice_instance._set_agg_value_invoice_values.call_count == 1
-        assert invoice_instance._set_agg_value_invoice_values.call_args_list == expected_agg_input
+        # All stats are fetched at once
+        assert invoice_instance._get_stats.call_args_list == [
+            call(columns=expected_columns, row=0, quantiles=quantiles)
+        ]
 
-        # Check _round_down logic
-        assert invoice_instance._round_down.call_count == 1
-        assert invoice_instance._round_down.call_args_list == expected_round_down_input
+    def test_get_stats_cached(self, invoice_instance):
+        invoice_instance._get_aggregates = MagicMock(
+            return_value={"invoice_mean": 1.5, "invoice_median": 2.5}
+        )
+        invoice_instance._round_down = MagicMock()
 
-        # Check stats schema
-        assert invoice_instance.invoice_stats_schema.validate.call_count == 1
+        invoice_instance._get_stats(columns=["invoice_mean", "invoice_median"], row=0)
+
+        # Assigned, rounded and validated once
+        assert invoice_instance._get_aggregates.call_args_list == [
+            call(columns=["invoice_mean", "invoice_median"], quantiles=())
+        ]
+        assert invoice_instance.invoice_stats.at.__setitem__.call_args_list == [
+            call((0, "invoice_mean"), 1.5),
+            call((0, "invoice_median"), 2.5),
+        ]
+        assert invoice_instance._round_down.call_args_list == [
+            call(column="invoice_mean"),
+            call(column="invoice_median"),
+        ]
         assert invoice_instance.invoice_stats_schema.validate.call_args_list == [
             call(invoice_instance.invoice_stats)
         ]
 
-    def test_round_down(self, invoice_instance, mock_numpy, mock_math):
+        # Nothing is done again until the invoices change
+        invoice_instance.invoice_stats.index.__contains__.return_value = True
+        invoice_instance._get_stats(columns=["invoice_mean", "invoice_median"], row=0)
+
+        assert invoice_instance._get_aggregates.call_count == 1
+        assert invoice_instance.invoice_stats_schema.validate.call_count == 1
+
+        invoice_instance._mark_changed()
+        invoice_instance._get_stats(columns=["invoice_mean"], row=0)
+
+        assert invoice_instance._get_aggregates.call_args_list[-1] == call(
+            columns=["invoice_mean"], quantiles=()
+        )
+        assert invoice_instance.invoice_stats_schema.validate.call_count == 2
+
+    def test_get_aggregates_cached(self, invoice_instance):
+        invoice_instance._compute_aggregates = MagicMock(
+            side_effect=lambda columns, quantiles: {column: 1.0 for column in columns}
+        )
+
+        invoice_instance._get_aggregates(columns=["invoice_mean"])
+        invoice_instance._get_aggregates(columns=["invoice_mean", "invoice_median"])
+
+        # Only aggregates that are not cached are computed
+        assert invoice_instance._compute_aggregates.call_args_list == [
+            call(columns=["invoice_mean"], quantiles=()),
+            call(columns=["invoice_median"], quantiles=()),
+        ]
+
+        invoice_instance._mark_changed()
+
+        assert invoice_instance._get_aggregates(columns=["invoice_mean"]) == {"invoice_mean": 1.0}
+        assert invoice_instance._compute_aggregates.call_count == 3
+
+    def test_changes_mark_version(self, invoice_instance, mock_invoice_buffer):
+        mock_invoice_buffer.return_value.delete.return_value = (MagicMock(), MagicMock())
+
+        invoice_instance._append_invoices(invoices=MagicMock())
+        invoice_instance.remove_invoice(invoice_id=0)
+
+        assert invoice_instance._version == 2
+
+    def test_round_down(self, invoice_instance, mock_numpy):
+        fractions = MagicMock()
+        fractions.__gt__.return_value = MagicMock()
+        mock_numpy.modf.return_value = (fractions, MagicMock())
+
         invoice_instance._round_down(column=invoice_instance.mean_col_name)
-        assert invoice_instance.invoice_stats[invoice_instance.mean_col_name].apply.call_count == 1
 
-    @pytest.mark.parametrize(
-        "row, column, agg_type", [(0, "col1", "mean"), (0, "col2", "median"), (0, "col2", "max")]
-    )
-    def test_set_agg_value_invoice_values(
-        self, invoice_instance, row, column, agg_type, mock_logging
+        column = invoice_instance.invoice_stats[invoice_instance.mean_col_name]
+        values = column.to_numpy.return_value
+
+        # Check vectorized rounding logic, no per element apply
+        assert column.apply.call_count == 0
+        assert mock_numpy.modf.call_args_list == [call(values)]
+        assert mock_numpy.floor.call_args_list == [call(values)]
+        assert mock_numpy.add.call_args_list == [
+            call(
+                mock_numpy.floor.return_value,
+                1.0,
+                out=mock_numpy.floor.return_value,
+                where=fractions.__gt__.return_value,
+            )
+        ]
+        assert fractions.__gt__.call_args_list == [call(0.5)]
+
+    @pytest.mark.parametrize("column", ["invoice_mean", "invoice_median"])
+    def test_compute_aggregates(
+        self, invoice_instance, column, mock_running_median, mock_running_sum
     ):
-        invoice_instance._set_agg_value_invoice_values(row=row, column=column, agg_type=agg_type)
+        aggregates = invoice_instance._compute_aggregates(columns=[column])
 
-        if agg_type == "mean":
-            # Check mean logic
-            assert invoice_instance.invoices["invoice_value"].mean.call_count == 1
-            assert invoice_instance.invoices["invoice_value"].median.call_count == 0
+        if column == "invoice_mean":
+            # Check mean logic, read from the running sum
+            assert aggregates == {column: mock_running_sum.return_value.mean.return_value}
+            assert mock_running_median.return_value.median.call_count == 0
 
-        elif agg_type == "median":
-            # Check median logic
-            assert invoice_instance.invoices["invoice_value"].median.call_count == 1
-            assert invoice_instance.invoices["invoice_value"].mean.call_count == 0
         else:
-            warning_message = [call("Warning! agg_type not supported: max")]
-            # Check with not supported agg_type
-            assert mock_logging.warning.call_count == 1
-            assert mock_logging.warning.call_args_list == warning_message
+            # Check median logic, read from the running median
+            assert aggregates == {column: mock_running_median.return_value.median.return_value}
+            assert mock_running_sum.return_value.mean.call_count == 0
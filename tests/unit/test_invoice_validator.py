@@ -0,0 +1,75 @@
+from decimal import Decimal
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+from pandera.errors import SchemaError
+
+from src.utils.constants import MAX_INVOICE_VALUE, MIN_INVOICE_VALUE
+from src.utils.invoice_validator import InvoiceValidator
+from src.utils.schemas.invoice import create_invoice_cents_schema
+from src.utils.schemas.numpy_validator import NumpyValidator
+from tests.constants import INVOICE_VALIDATOR_PATH
+
+
+def invoices(values: list) -> pd.DataFrame:
+    return pd.DataFrame(
+        {"invoice_name": [f"company_{x}" for x in range(len(values))], "invoice_value": values}
+    )
+
+
+class TestInvoiceValidator:
+    @pytest.mark.parametrize("validation_backend", ["pandera", "numpy"])
+    def test_validate(self, validation_backend):
+        invoice_validator = InvoiceValidator(
+            max_invoice_value=MAX_INVOICE_VALUE,
+            min_invoice_value=MIN_INVOICE_VALUE,
+            validation_backend=validation_backend,
+        )
+
+        batch = invoices([1.5])
+        is_numpy_validator = isinstance(invoice_validator.validator, NumpyValidator)
+
+        # Only fixed point invoices are converted
+        assert is_numpy_validator == (validation_backend == "numpy")
+        assert invoice_validator.convert(invoices=batch) is batch
+        assert invoice_validator.validate(invoices=batch)["invoice_value"].tolist() == [1.5]
+
+        with pytest.raises(SchemaError):
+            invoice_validator.validate(invoices=invoices([1.5, 0.0]))
+
+    def test_fixed_point(self):
+        invoice_validator = InvoiceValidator(
+            max_invoice_value=MAX_INVOICE_VALUE,
+            min_invoice_value=MIN_INVOICE_VALUE,
+            fixed_point=True,
+        )
+        converted = invoice_validator.convert(invoices=invoices([Decimal("1.10"), "2.205"]))
+        validated = invoice_validator.validate(invoices=converted)
+
+        # The values are converted to cents, and validated against the cents schema
+        assert invoice_validator.invoice_schema == create_invoice_cents_schema(
+            max_invoice_value=MAX_INVOICE_VALUE, min_invoice_value=MIN_INVOICE_VALUE
+        )
+        assert validated["invoice_value"].tolist() == [110, 221]
+
+    def test_validation_workers(self):
+        with patch(f"{INVOICE_VALIDATOR_PATH}.ParallelValidator") as mock_parallel_validator:
+            invoice_validator = InvoiceValidator(
+                max_invoice_value=MAX_INVOICE_VALUE,
+                min_invoice_value=MIN_INVOICE_VALUE,
+                validation_workers=4,
+            )
+            validated = invoice_validator.validate(invoices=invoices([1.5]))
+            invoice_validator.close()
+
+        assert validated == mock_parallel_validator.return_value.validate.return_value
+        assert mock_parallel_validator.return_value.close.call_count == 1
+
+    def test_unknown_validation_backend(self):
+        with pytest.raises(ValueError):
+            InvoiceValidator(
+                max_invoice_value=MAX_INVOICE_VALUE,
+                min_invoice_value=MIN_INVOICE_VALUE,
+                validation_backend="cerberus",
+            )
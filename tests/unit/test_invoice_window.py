@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from src.utils.invoice_window import InvoiceWindow
+
+
+@pytest.fixture()
+def invoice_window() -> InvoiceWindow:
+    """PyTest fixture to create an invoice window to use in tests"""
+    return InvoiceWindow(size=4)
+
+
+class TestInvoiceWindow:
+    def test_append(self, invoice_window):
+        evicted_values = invoice_window.append(values=np.array([1.0, 2.0, 3.0]))
+
+        assert evicted_values.tolist() == []
+        assert len(invoice_window) == 3
+        assert invoice_window.values.tolist() == [1.0, 2.0, 3.0]
+
+    @pytest.mark.parametrize(
+        "batches, expected_evicted_values, expected_values",
+        [
+            ([[1.0, 2.0, 3.0], [4.0, 5.0]], [1.0], [2.0, 3.0, 4.0, 5.0]),
+            ([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0, 7.0]], [1.0, 2.0, 3.0], [4.0, 5.0, 6.0, 7.0]),
+            ([[1.0, 2.0, 3.0], [4.0, 5.0], [6.0, 7.0, 8.0]], [2.0, 3.0, 4.0], [5.0, 6.0, 7.0, 8.0]),
+        ],
+    )
+    def test_append_evicts_oldest_values(
+        self, invoice_window, batches, expected_evicted_values, expected_values
+    ):
+        for batch in batches:
+            evicted_values = invoice_window.append(values=np.array(batch))
+
+        # The oldest values are evicted, also when the batch wraps around the ring buffer
+        assert evicted_values.tolist() == expected_evicted_values
+        assert invoice_window.values.tolist() == expected_values
+        assert len(invoice_window) == 4
+
+    def test_append_above_size(self, invoice_window):
+        with pytest.raises(ValueError):
+            invoice_window.append(values=np.ones(5))
+
+    def test_size_below_one(self):
+        with pytest.raises(ValueError):
+            InvoiceWindow(size=0)
+
+    def test_clear(self, invoice_window):
+        invoice_window.append(values=np.array([1.0, 2.0, 3.0]))
+        invoice_window.clear()
+
+        assert len(invoice_window) == 0
+        assert invoice_window.values.tolist() == []
+        assert invoice_window.nbytes == 32
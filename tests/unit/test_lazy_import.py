@@ -0,0 +1,56 @@
+import sys
+import threading
+
+import pytest
+
+from src.utils.lazy_import import lazy_import
+
+
+def test_lazy_import_imported():
+    assert lazy_import("json") is sys.modules["json"]
+
+
+def test_lazy_import(monkeypatch):
+    monkeypatch.delitem(sys.modules, "colorsys", raising=False)
+
+    colorsys = lazy_import("colorsys")
+
+    # The module is only loaded on the first attribute access
+    assert "colorsys" not in sys.modules
+
+    assert colorsys.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+
+    import colorsys as imported_colorsys
+
+    # The proxy uses the module of the regular import system
+    assert colorsys.rgb_to_hsv is imported_colorsys.rgb_to_hsv
+    assert "rgb_to_hsv" in dir(colorsys)
+
+
+def test_lazy_import_threads(monkeypatch):
+    monkeypatch.delitem(sys.modules, "colorsys", raising=False)
+
+    colorsys = lazy_import("colorsys")
+    barrier = threading.Barrier(8)
+    functions = []
+
+    def _access():
+        barrier.wait()
+        functions.append(colorsys.hsv_to_rgb)
+
+    threads = [threading.Thread(target=_access) for _ in range(8)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    # Every thread sees the same, fully loaded module
+    assert len(functions) == 8
+    assert all(function is sys.modules["colorsys"].hsv_to_rgb for function in functions)
+
+
+def test_lazy_import_not_installed():
+    with pytest.raises(ModuleNotFoundError):
+        lazy_import("not_an_installed_module")
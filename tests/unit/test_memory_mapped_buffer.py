@@ -0,0 +1,136 @@
+import json
+import os
+from unittest.mock import MagicMock, call, patch
+
+import numpy as np
+import pytest
+
+from src.utils.memory_mapped_buffer import MemoryMappedInvoiceBuffer
+from tests.constants import LIMIT
+
+
+@pytest.fixture()
+def store_dir(tmp_path) -> str:
+    """PyTest fixture with a directory for the memory-mapped store"""
+    return str(tmp_path / "invoice_store")
+
+
+class TestMemoryMappedInvoiceBuffer:
+    def test_append(self, store_dir):
+        invoice_buffer = MemoryMappedInvoiceBuffer(
+            directory=store_dir, capacity_limit=LIMIT, initial_capacity=2
+        )
+        invoice_buffer.append(
+            names=np.array(["company_a", "company_b"], dtype=object), values=np.array([1.0, 2.0]),
+        )
+        invoice_buffer.append(
+            names=np.array(["company_b", "company_c", "company_a"], dtype=object),
+            values=np.array([3.0, 4.0, 5.0]),
+        )
+
+        assert len(invoice_buffer) == 5
+        assert invoice_buffer.capacity == 8
+        assert invoice_buffer.values.tolist() == [1.0, 2.0, 3.0, 4.0, 5.0]
+        assert invoice_buffer.names.tolist() == [
+            "company_a",
+            "company_b",
+            "company_b",
+            "company_c",
+            "company_a",
+        ]
+
+        # Names are stored once in the name index, and as codes in the mapped file
+        assert invoice_buffer.name_codes.tolist() == [0, 1, 1, 2, 0]
+        assert os.path.getsize(os.path.join(store_dir, "invoice_value.bin")) == 8 * 8
+        assert os.path.getsize(os.path.join(store_dir, "invoice_name.bin")) == 8 * 4
+
+    def test_append_flushes_before_metadata(self, store_dir):
+        invoice_buffer = MemoryMappedInvoiceBuffer(directory=store_dir, capacity_limit=LIMIT)
+        mock_manager = MagicMock()
+
+        flush = patch.object(invoice_buffer, "flush", wraps=invoice_buffer.flush)
+        write_metadata = patch.object(
+            invoice_buffer, "_write_metadata", wraps=invoice_buffer._write_metadata
+        )
+
+        with flush as mock_flush, write_metadata as mock_write_metadata:
+            mock_manager.attach_mock(mock_flush, "flush")
+            mock_manager.attach_mock(mock_write_metadata, "write_metadata")
+
+            invoice_buffer.append(
+                names=np.array(["company_a"], dtype=object), values=np.array([1.0])
+            )
+
+        # The rows are on disk before the size that points at them
+        assert mock_manager.mock_calls == [call.flush(), call.write_metadata()]
+
+        with open(os.path.join(store_dir, "metadata.json")) as metadata_file:
+            assert json.load(metadata_file)["size"] == 1
+
+    def test_reopen(self, store_dir):
+        invoice_buffer = MemoryMappedInvoiceBuffer(directory=store_dir, capacity_limit=LIMIT)
+        invoice_buffer.append(
+            names=np.array(["company_a", 'company "b"\n'], dtype=object),
+            values=np.array([1.0, 2.0]),
+        )
+        invoice_buffer.flush()
+
+        reopened_buffer = MemoryMappedInvoiceBuffer(directory=store_dir, capacity_limit=LIMIT)
+
+        assert len(reopened_buffer) == 2
+        assert reopened_buffer.values.tolist() == [1.0, 2.0]
+        assert reopened_buffer.names.tolist() == ["company_a", 'company "b"\n']
+
+        # Appends continue after the stored invoices
+        reopened_buffer.append(names=np.array(["company_a"], dtype=object), values=np.array([3.0]))
+
+        assert reopened_buffer.name_codes.tolist() == [0, 1, 0]
+        assert reopened_buffer.to_frame().values.tolist() == [
+            ["company_a", 1.0],
+            ['company "b"\n', 2.0],
+            ["company_a", 3.0],
+        ]
+
+    @pytest.mark.parametrize(
+        "value_dtype, capacity_limit", [(np.int64, LIMIT), (np.float64, 1)],
+    )
+    def test_reopen_failure(self, store_dir, value_dtype, capacity_limit):
+        invoice_buffer = MemoryMappedInvoiceBuffer(directory=store_dir, capacity_limit=LIMIT)
+        invoice_buffer.append(
+            names=np.array(["company_a", "company_b"], dtype=object), values=np.array([1.0, 2.0]),
+        )
+
+        with pytest.raises(ValueError):
+            MemoryMappedInvoiceBuffer(
+                directory=store_dir, capacity_limit=capacity_limit, value_dtype=value_dtype
+            )
+
+    def test_append_above_capacity_limit(self, store_dir):
+        invoice_buffer = MemoryMappedInvoiceBuffer(directory=store_dir, capacity_limit=2)
+
+        with pytest.raises(ValueError):
+            invoice_buffer.append(
+                names=np.full(3, "company_a", dtype=object), values=np.ones(3),
+            )
+
+        assert len(invoice_buffer) == 0
+
+    def test_clear(self, store_dir):
+        invoice_buffer = MemoryMappedInvoiceBuffer(
+            directory=store_dir, capacity_limit=LIMIT, initial_capacity=2
+        )
+        invoice_buffer.append(
+            names=np.full(5, "company_a", dtype=object), values=np.ones(5),
+        )
+
+        invoice_buffer.clear()
+
+        assert len(invoice_buffer) == 0
+        assert invoice_buffer.capacity == 2
+        assert invoice_buffer.to_frame().empty
+        assert os.path.getsize(os.path.join(store_dir, "invoice_value.bin")) == 2 * 8
+
+        with open(os.path.join(store_dir, "metadata.json")) as metadata_file:
+            assert json.load(metadata_file)["size"] == 0
+
+        assert len(MemoryMappedInvoiceBuffer(directory=store_dir, capacity_limit=LIMIT)) == 0
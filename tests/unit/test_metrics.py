@@ -0,0 +1,76 @@
+from unittest.mock import MagicMock, call, patch
+
+import pytest
+
+from src.utils.metrics import InvoiceMetrics, MetricsSink
+
+METRICS_PATH = "src.utils.metrics"
+
+
+class TestInvoiceMetrics:
+    def test_disabled(self):
+        invoice_metrics = InvoiceMetrics()
+
+        with invoice_metrics.timer(name="validation"):
+            pass
+
+        invoice_metrics.increment(name="rows_accepted", value=10)
+        invoice_metrics.gauge(name="bytes_held", value=100)
+
+        assert not invoice_metrics.enabled
+        assert invoice_metrics.snapshot() == {"counters": {}, "timings": {}, "gauges": {}}
+
+    def test_disabled_timer_is_shared(self):
+        invoice_metrics = InvoiceMetrics()
+
+        assert invoice_metrics.timer(name="validation") is invoice_metrics.timer(name="append")
+
+    @patch(f"{METRICS_PATH}.time")
+    def test_enabled(self, mock_time):
+        mock_time.perf_counter.side_effect = [1.0, 1.5, 2.0, 2.25]
+        invoice_metrics = InvoiceMetrics(enabled=True)
+
+        for _ in range(2):
+            with invoice_metrics.timer(name="validation"):
+                pass
+
+        invoice_metrics.increment(name="rows_accepted", value=10)
+        invoice_metrics.increment(name="rows_accepted", value=5)
+        invoice_metrics.increment(name="rows_rejected")
+        invoice_metrics.gauge(name="bytes_held", value=100)
+        invoice_metrics.gauge(name="bytes_held", value=200)
+
+        assert invoice_metrics.snapshot() == {
+            "counters": {"rows_accepted": 15, "rows_rejected": 1},
+            "timings": {"validation": {"count": 2, "seconds": 0.75}},
+            "gauges": {"bytes_held": 200},
+        }
+
+        invoice_metrics.clear()
+
+        assert invoice_metrics.snapshot() == {"counters": {}, "timings": {}, "gauges": {}}
+
+    @patch(f"{METRICS_PATH}.time")
+    def test_timer_records_on_error(self, mock_time):
+        mock_time.perf_counter.side_effect = [1.0, 3.0]
+        invoice_metrics = InvoiceMetrics(enabled=True)
+
+        with pytest.raises(ValueError):
+            with invoice_metrics.timer(name="validation"):
+                raise ValueError("invalid invoice")
+
+        assert invoice_metrics.snapshot()["timings"] == {"validation": {"count": 1, "seconds": 2.0}}
+
+    def test_sink(self):
+        mock_sink = MagicMock(spec=MetricsSink)
+        invoice_metrics = InvoiceMetrics(sink=mock_sink)
+
+        invoice_metrics.record_timing(name="aggregation", seconds=0.5)
+        invoice_metrics.increment(name="rows_accepted", value=10)
+        invoice_metrics.gauge(name="rows_held", value=10)
+
+        # A sink enables the metrics
+        assert invoice_metrics.enabled
+        assert mock_sink.record_timing.call_args_list == [call(name="aggregation", seconds=0.5)]
+        assert mock_sink.increment.call_args_list == [call(name="rows_accepted", value=10)]
+        assert mock_sink.gauge.call_args_list == [call(name="rows_held", value=10)]
@@ -0,0 +1,167 @@
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import pandera as pa
+import pytest
+from pandera.errors import SchemaError, SchemaErrors
+
+from src.utils.constants import MAX_INVOICE_VALUE, MIN_INVOICE_VALUE
+from src.utils.fixed_point import to_cents
+from src.utils.schemas.invoice import create_invoice_cents_schema, create_invoice_schema
+from src.utils.schemas.numpy_validator import NumpyValidator
+
+INVOICES = [
+    pd.DataFrame({"invoice_name": ["a", "b"], "invoice_value": [1, 2.5]}),
+    pd.DataFrame({"invoice_name": ["a", "b"], "invoice_value": ["1", "2.5"]}),
+    pd.DataFrame({"invoice_name": ["a"], "invoice_value": [Decimal("2.5")]}),
+    pd.DataFrame({"invoice_name": ["a"], "invoice_value": [True]}),
+    pd.DataFrame({"invoice_name": [1, "b"], "invoice_value": [2, 3]}),
+    pd.DataFrame({"invoice_value": [2], "invoice_name": ["a"]}),
+    pd.DataFrame({"invoice_name": ["a"], "invoice_value": [2]}, index=[1.5]),
+    pd.DataFrame({"invoice_name": ["a", "b", "c"], "invoice_value": [1, 2, 3]}, index=[0, 1, 1]),
+    pd.DataFrame(columns=["invoice_name", "invoice_value"]),
+    # Invalid invoices
+    pd.DataFrame({"invoice_name": ["a", "b"], "invoice_value": [1, 3e8]}),
+    pd.DataFrame({"invoice_name": ["a", "b", "c"], "invoice_value": [0.5, 3, -1]}),
+    pd.DataFrame({"invoice_name": ["a", "b"], "invoice_value": [Decimal("2.5"), Decimal(-1)]}),
+    pd.DataFrame({"invoice_name": ["a", "b"], "invoice_value": [np.inf, 3]}),
+    pd.DataFrame({"invoice_name": ["a", "b"], "invoice_value": [None, 3]}),
+    pd.DataFrame({"invoice_name": [None, "b"], "invoice_value": [2, 3]}),
+    pd.DataFrame({"invoice_name": [None, "b"], "invoice_value": [None, 0]}),
+    pd.DataFrame({"invoice_name": ["a", "b"], "invoice_value": [None, 3e9]}),
+    pd.DataFrame({"invoice_name": ["a", "b"], "invoice_value": ["x", "2.5"]}),
+    pd.DataFrame(
+        {"invoice_name": ["a", "b"], "invoice_value": pd.Series([None, "x"], dtype=object)}
+    ),
+    pd.DataFrame({"invoice_name": ["a"], "invoice_value": [2]}, index=["z"]),
+    pd.DataFrame({"invoice_name": ["a"], "invoice_value": ["x"]}, index=["z"]),
+    pd.DataFrame({"invoice_name": ["a"], "invoice_value": [2], "invoice_date": ["2020-01-01"]}),
+    pd.DataFrame({"invoice_name": ["a"]}),
+]
+
+
+def _validate(schema, invoices):
+    try:
+        return schema.validate(invoices), None
+    except (SchemaError, SchemaErrors, TypeError, ValueError) as validation_error:
+        return None, validation_error
+
+
+def _error_key(validation_error):
+    """The failing column, check and row indexes of a validation error, they are the same for
+    every pandera version, unlike the error messages"""
+    if isinstance(validation_error, SchemaErrors):
+        validation_error = validation_error.schema_errors[0]
+
+    check = getattr(validation_error.check, "name", validation_error.check)
+
+    if str(check).startswith("coerce_dtype"):
+        # The invalid values, newer pandera versions report them per column
+        return "coerce_dtype", None, None
+
+    failure_cases = validation_error.failure_cases
+
+    if isinstance(failure_cases, str):
+        return check, failure_cases, None
+
+    if isinstance(validation_error.schema, pa.DataFrameSchema):
+        return check, str(failure_cases["failure_case"][0]), None
+
+    return check, validation_error.schema.name, failure_cases["index"].astype(str).tolist()
+
+
+class TestNumpyValidator:
+    @pytest.mark.parametrize("invoices", INVOICES)
+    @pytest.mark.parametrize("fixed_point", [False, True])
+    @pytest.mark.parametrize("nullable", [False, True])
+    def test_parity(self, invoices, fixed_point, nullable):
+        create_schema = create_invoice_cents_schema if fixed_point else create_invoice_schema
+        schema = create_schema(
+            max_invoice_value=MAX_INVOICE_VALUE,
+            min_invoice_value=MIN_INVOICE_VALUE,
+            nullable=nullable,
+        )
+
+        if fixed_point and "invoice_value" in invoices.columns:
+            try:
+                cents = to_cents(values=invoices["invoice_value"], schema=schema)
+            except SchemaError:
+                # Values that are not numbers are rejected before they reach a backend
+                return
+
+            invoices = invoices.assign(invoice_value=cents)
+
+        validated, validation_error = _validate(schema=schema, invoices=invoices)
+        numpy_validated, numpy_validation_error = _validate(
+            schema=NumpyValidator(schema=schema), invoices=invoices
+        )
+
+        # Both backends accept the same invoices, coerced to the same dtypes
+        if validation_error is None:
+            assert numpy_validation_error is None
+            pd.testing.assert_frame_equal(numpy_validated, validated)
+            return
+
+        # and reject the same invoices, for the same column, check and rows
+        assert isinstance(numpy_validation_error, SchemaError)
+
+        if isinstance(validation_error, (TypeError, ValueError)):
+            # Older pandera versions raise the error of pandas for values that cannot be coerced
+            assert _error_key(numpy_validation_error)[0] == "coerce_dtype"
+        else:
+            assert _error_key(numpy_validation_error) == _error_key(validation_error)
+
+    def test_null_names_are_kept(self):
+        schema = create_invoice_schema(
+            max_invoice_value=MAX_INVOICE_VALUE, min_invoice_value=MIN_INVOICE_VALUE, nullable=True
+        )
+        invoices = pd.DataFrame(
+            {
+                "invoice_name": pd.Series([None, 1, np.nan], dtype=object),
+                "invoice_value": [1, 2, 3],
+            }
+        )
+
+        validated = NumpyValidator(schema=schema).validate(invoices)
+
+        # Only the names that are not null are converted to str
+        assert validated["invoice_name"].isna().tolist() == [True, False, True]
+        assert validated["invoice_name"][1] == "1"
+
+    def test_not_coerced(self):
+        schema = create_invoice_schema(
+            max_invoice_value=MAX_INVOICE_VALUE, min_invoice_value=MIN_INVOICE_VALUE, coerce=False
+        )
+        numpy_validator = NumpyValidator(schema=schema)
+        invoices = pd.DataFrame({"invoice_name": ["a", "b"], "invoice_value": [1, 2]})
+
+        with pytest.raises((SchemaError, SchemaErrors)):
+            schema.validate(invoices)
+
+        with pytest.raises(SchemaError):
+            numpy_validator.validate(invoices)
+
+        invoices = invoices.astype({"invoice_value": np.float64})
+
+        pd.testing.assert_frame_equal(numpy_validator.validate(invoices), schema.validate(invoices))
+
+    def test_not_strict(self):
+        schema = create_invoice_schema(
+            max_invoice_value=MAX_INVOICE_VALUE, min_invoice_value=MIN_INVOICE_VALUE, strict=False
+        )
+        invoices = pd.DataFrame(
+            {"invoice_name": ["a"], "invoice_value": ["2"], "invoice_date": ["2020-01-01"]}
+        )
+
+        pd.testing.assert_frame_equal(
+            NumpyValidator(schema=schema).validate(invoices), schema.validate(invoices)
+        )
+
+    def test_check_not_compiled(self):
+        schema = pa.DataFrameSchema(
+            {"invoice_value": pa.Column(pa.Float64, checks=pa.Check(lambda values: values > 0))}
+        )
+
+        with pytest.raises(ValueError):
+            NumpyValidator(schema=schema)
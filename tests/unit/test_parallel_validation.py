@@ -0,0 +1,121 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Generator
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandera.errors import SchemaError, SchemaErrors
+
+from src.utils.constants import MAX_INVOICE_VALUE, MIN_INVOICE_VALUE
+from src.utils.parallel_validation import ParallelValidator
+from src.utils.schemas.invoice import create_invoice_schema
+
+PARALLEL_VALIDATION_PATH = "src.utils.parallel_validation"
+
+pytestmark = pytest.mark.usefixtures("timeout")
+
+
+@pytest.fixture()
+def parallel_validator() -> Generator[ParallelValidator, None, None]:
+    """PyTest fixture to create a parallel validator of the invoice schema, with 3 workers"""
+    parallel_validator = ParallelValidator(
+        schema_factory=create_invoice_schema,
+        schema_arguments={
+            "max_invoice_value": MAX_INVOICE_VALUE,
+            "min_invoice_value": MIN_INVOICE_VALUE,
+        },
+        validation_backend="pandera",
+        workers=3,
+        min_row_count=2,
+    )
+
+    try:
+        yield parallel_validator
+
+    finally:
+        parallel_validator.close()
+
+
+def _invoices(values) -> pd.DataFrame:
+    return pd.DataFrame(
+        {"invoice_name": [f"company_{x}" for x in range(len(values))], "invoice_value": values}
+    )
+
+
+class TestParallelValidator:
+    @patch(f"{PARALLEL_VALIDATION_PATH}.ProcessPoolExecutor")
+    @pytest.mark.parametrize("workers, row_count", [(1, 10), (4, 9)])
+    def test_serial(self, mock_process_pool_executor, workers, row_count):
+        parallel_validator = ParallelValidator(
+            schema_factory=MagicMock(),
+            schema_arguments={},
+            validation_backend="pandera",
+            workers=workers,
+            min_row_count=10,
+        )
+        invoices = _invoices(values=np.ones(row_count))
+
+        validated = parallel_validator.validate(invoices=invoices)
+
+        # Small batches, or a single worker, are validated serially
+        mock_schema = parallel_validator.schema_factory.return_value
+        assert validated == mock_schema.validate.return_value
+        assert mock_schema.validate.call_count == 1
+        assert mock_process_pool_executor.call_count == 0
+
+    def test_parallel(self, parallel_validator):
+        invoices = _invoices(values=np.arange(1, 11).astype(str))
+
+        with patch(
+            f"{PARALLEL_VALIDATION_PATH}.ProcessPoolExecutor", wraps=ProcessPoolExecutor
+        ) as mock_process_pool_executor:
+            validated = parallel_validator.validate(invoices=invoices)
+            parallel_validator.validate(invoices=invoices)
+
+        pd.testing.assert_frame_equal(validated, parallel_validator.validator.validate(invoices))
+
+        # The chunks are validated by one pool, kept between the batches
+        assert mock_process_pool_executor.call_count == 1
+        assert parallel_validator._executor is not None
+
+        parallel_validator.close()
+        assert parallel_validator._executor is None
+
+    @pytest.mark.parametrize(
+        "values", [[1.0, 2.0, 3.0, 4.0, 0.0, 6.0], [1.0, 2.0, 3.0, 4.0, 5.0, "abc"]]
+    )
+    def test_parallel_error(self, parallel_validator, values):
+        invoices = _invoices(values=values)
+
+        with pytest.raises((SchemaError, SchemaErrors, ValueError)) as serial_error:
+            parallel_validator.validator.validate(invoices)
+
+        with pytest.raises((SchemaError, SchemaErrors, ValueError)) as parallel_error:
+            parallel_validator.validate(invoices=invoices)
+
+        # Same error as the serial validation, raised for the invalid chunk
+        assert parallel_error.type == serial_error.type
+        assert str(parallel_error.value) == str(serial_error.value)
+
+    @patch(f"{PARALLEL_VALIDATION_PATH}.LOGGER")
+    @patch(f"{PARALLEL_VALIDATION_PATH}.ProcessPoolExecutor")
+    def test_pool_error(self, mock_process_pool_executor, mock_logger, parallel_validator):
+        mock_process_pool_executor.return_value.submit.side_effect = BrokenProcessPool()
+        invoices = _invoices(values=np.arange(1, 11).astype(str))
+
+        validated = parallel_validator.validate(invoices=invoices)
+
+        # A failing pool is logged, and the invoices are validated serially
+        pd.testing.assert_frame_equal(validated, parallel_validator.validator.validate(invoices))
+        assert mock_logger.warning.call_count == 1
+        assert mock_process_pool_executor.return_value.shutdown.call_count == 1
+
+    @patch(f"{PARALLEL_VALIDATION_PATH}.ProcessPoolExecutor")
+    def test_other_errors_are_raised(self, mock_process_pool_executor, parallel_validator):
+        mock_process_pool_executor.return_value.submit.side_effect = RuntimeError()
+        invoices = _invoices(values=np.arange(1, 11).astype(str))
+
+        with pytest.raises(RuntimeError):
+            parallel_validator.validate(invoices=invoices)
@@ -0,0 +1,126 @@
+import math
+
+import numpy as np
+import pytest
+
+from src.utils.partial_aggregate import PartialAggregate, merge_partial_aggregates
+from src.utils.quantile_sketch import QuantileSketch
+from src.utils.running_sum import RunningSum
+
+
+def create_partial_aggregate(
+    values: np.ndarray, exact: bool = False, fixed_point: bool = False, k: int = 200
+) -> PartialAggregate:
+    running_sum = RunningSum()
+    running_sum.extend(values=values)
+    quantile_sketch = QuantileSketch(k=k, value_dtype=values.dtype.type, seed=0)
+    quantile_sketch.extend(values=values)
+
+    return PartialAggregate(
+        fixed_point=fixed_point,
+        running_sum=running_sum,
+        quantile_sketch=quantile_sketch,
+        values=values if exact else None,
+    )
+
+
+class TestPartialAggregate:
+    @pytest.mark.parametrize("exact", [False, True])
+    def test_stats(self, exact):
+        partial_aggregate = create_partial_aggregate(
+            values=np.array([1.5, 10.0, 3.0, 7.5]), exact=exact
+        )
+
+        assert len(partial_aggregate) == 4
+        assert partial_aggregate.exact == exact
+        assert partial_aggregate.total() == 22.0
+        assert partial_aggregate.mean() == 5.5
+        assert partial_aggregate.min_value == 1.5
+        assert partial_aggregate.max_value == 10.0
+
+    def test_fixed_point(self):
+        partial_aggregate = create_partial_aggregate(
+            values=np.array([110, 225, 330], dtype=np.int64), exact=True, fixed_point=True
+        )
+
+        assert partial_aggregate.mean() == pytest.approx(6.65 / 3, rel=1e-15)
+        assert partial_aggregate.median() == 2.25
+        assert partial_aggregate.min_value == 1.1
+
+    def test_merge_exact(self):
+        random_state = np.random.RandomState(seed=0)
+        values = np.round(random_state.uniform(1, 1000, size=10001), 2)
+
+        merged = merge_partial_aggregates(
+            partial_aggregates=[
+                create_partial_aggregate(values=part, exact=True)
+                for part in np.array_split(values, 3)
+            ]
+        )
+
+        assert merged.exact
+        assert len(merged) == 10001
+        assert merged.median() == np.median(values)
+        assert merged.mean() == pytest.approx(values.mean(), rel=1e-14)
+        assert (merged.min_value, merged.max_value) == (values.min(), values.max())
+
+    def test_merge_approximate(self):
+        random_state = np.random.RandomState(seed=1)
+        values = random_state.uniform(1, 1000, size=30000)
+        partial_aggregates = [
+            create_partial_aggregate(values=part, exact=index == 0)
+            for index, part in enumerate(np.array_split(values, 3))
+        ]
+
+        merged = merge_partial_aggregates(partial_aggregates=partial_aggregates)
+
+        # One partial aggregate is not exact, so the merged median is the approximate one
+        median_rank = np.searchsorted(np.sort(values), merged.median()) / values.shape[0]
+
+        assert not merged.exact
+        assert abs(median_rank - 0.5) <= QuantileSketch.normalized_rank_error(k=200)
+        assert merged.mean() == pytest.approx(values.mean(), rel=1e-14)
+        # The given partial aggregates are not changed by the merge
+        assert [len(partial_aggregate) for partial_aggregate in partial_aggregates] == [
+            10000,
+            10000,
+            10000,
+        ]
+        assert partial_aggregates[0].exact
+
+    @pytest.mark.parametrize("other_kwargs", [{"fixed_point": True}, {"k": 100}])
+    def test_merge_incompatible(self, other_kwargs):
+        partial_aggregate = create_partial_aggregate(values=np.array([1.0, 2.0]))
+        other = create_partial_aggregate(values=np.array([3.0]), **other_kwargs)
+
+        with pytest.raises(ValueError):
+            partial_aggregate.merge(other=other)
+
+        assert len(partial_aggregate) == 2
+
+    def test_merge_nothing(self):
+        with pytest.raises(ValueError):
+            merge_partial_aggregates(partial_aggregates=[])
+
+    @pytest.mark.parametrize("exact", [False, True])
+    def test_save_and_load(self, tmp_path, exact):
+        partial_aggregate = create_partial_aggregate(
+            values=np.array([110, 225, 330, 440], dtype=np.int64), exact=exact, fixed_point=True
+        )
+        path = str(tmp_path / "partial_aggregate.snapshot")
+
+        partial_aggregate.save(path=path)
+        loaded = PartialAggregate.load(path=path)
+
+        assert loaded.exact == exact
+        assert loaded.fixed_point
+        assert len(loaded) == 4
+        assert loaded.mean() == partial_aggregate.mean()
+        assert loaded.median() == partial_aggregate.median()
+        assert (loaded.min_value, loaded.max_value) == (1.1, 4.4)
+
+    def test_empty(self):
+        partial_aggregate = create_partial_aggregate(values=np.array([]))
+
+        assert math.isnan(partial_aggregate.mean())
+        assert math.isnan(partial_aggregate.median())
@@ -0,0 +1,114 @@
+import math
+
+import numpy as np
+import pytest
+
+from src.utils.quantile_sketch import QuantileSketch
+
+
+@pytest.fixture()
+def quantile_sketch() -> QuantileSketch:
+    """PyTest fixture to create a quantile sketch to use in tests"""
+    return QuantileSketch(k=200, seed=0)
+
+
+class TestQuantileSketch:
+    def test_empty(self, quantile_sketch):
+        assert math.isnan(quantile_sketch.median())
+        assert len(quantile_sketch) == 0
+
+    def test_invalid_k(self):
+        with pytest.raises(ValueError):
+            QuantileSketch(k=4)
+
+    @pytest.mark.parametrize("q", [-0.1, 1.1])
+    def test_invalid_quantile(self, quantile_sketch, q):
+        with pytest.raises(ValueError):
+            quantile_sketch.quantile(q=q)
+
+    def test_exact_below_capacity(self, quantile_sketch):
+        quantile_sketch.extend(values=np.array([5.0, 1.0, 3.0, 4.0, 2.0]))
+
+        # Nothing is compacted yet, so the quantiles are exact
+        assert quantile_sketch.quantiles(qs=[0.0, 0.5, 1.0]) == [1.0, 3.0, 5.0]
+
+    @pytest.mark.parametrize("batch_count", [1, 100])
+    @pytest.mark.parametrize("q", [0.01, 0.25, 0.5, 0.95, 0.99])
+    def test_error_bound(self, quantile_sketch, rank_error, batch_count, q):
+        values = np.random.RandomState(seed=1).uniform(1, 200000000, size=200000)
+
+        for batch in np.array_split(values, batch_count):
+            quantile_sketch.extend(values=batch)
+
+        assert len(quantile_sketch) == values.shape[0]
+        assert rank_error(
+            values=values, value=quantile_sketch.quantile(q=q), q=q
+        ) <= QuantileSketch.normalized_rank_error(k=200)
+
+    def test_constant_memory(self, quantile_sketch):
+        random_state = np.random.RandomState(seed=2)
+        quantile_sketch.extend(values=random_state.uniform(size=10000))
+        nbytes = quantile_sketch.nbytes
+
+        quantile_sketch.extend(values=random_state.uniform(size=1000000))
+
+        # About 3k values, and a few more for every doubling of the number of values
+        assert quantile_sketch.nbytes < 8 * 4 * 200
+        assert quantile_sketch.nbytes < 2 * nbytes
+
+    def test_integer_values(self):
+        quantile_sketch = QuantileSketch(value_dtype=np.int64)
+        quantile_sketch.extend(values=np.array([1100, 2200, 3300], dtype=np.int64))
+
+        assert quantile_sketch.median(scale=100) == 22.0
+        assert isinstance(quantile_sketch.quantile(q=0.5), int)
+
+    def test_merge(self, rank_error):
+        values = np.random.RandomState(seed=3).uniform(1, 1000, size=100000)
+        quantile_sketch, other = QuantileSketch(seed=0), QuantileSketch(seed=1)
+
+        quantile_sketch.extend(values=values[:30000])
+        other.extend(values=values[30000:])
+        quantile_sketch.merge(other=other)
+
+        assert len(quantile_sketch) == values.shape[0]
+        assert rank_error(
+            values=values, value=quantile_sketch.median(), q=0.5
+        ) <= QuantileSketch.normalized_rank_error(k=200)
+
+    def test_exact_moments(self):
+        values = np.random.RandomState(seed=5).uniform(1, 1000, size=100000)
+        quantile_sketch, other = QuantileSketch(seed=0), QuantileSketch(seed=1)
+
+        for batch in np.array_split(values[:50000], 10):
+            quantile_sketch.extend(values=batch)
+
+        other.extend(values=values[50000:])
+        quantile_sketch.merge(other=other)
+
+        # The minimum, maximum and standard deviation are exact
+        assert quantile_sketch.quantiles(qs=[0.0, 1.0]) == [values.min(), values.max()]
+        assert quantile_sketch.std() == pytest.approx(np.std(values, ddof=1), rel=1e-12)
+
+    def test_merge_different_k(self, quantile_sketch):
+        with pytest.raises(ValueError):
+            quantile_sketch.merge(other=QuantileSketch(k=100))
+
+    def test_state(self, quantile_sketch):
+        quantile_sketch.extend(values=np.random.RandomState(seed=4).uniform(size=10000))
+
+        restored_sketch = QuantileSketch(k=200)
+        restored_sketch.set_state(state=quantile_sketch.get_state())
+
+        assert len(restored_sketch) == len(quantile_sketch)
+        assert restored_sketch.quantiles(qs=[0.0, 0.5, 1.0]) == quantile_sketch.quantiles(
+            qs=[0.0, 0.5, 1.0]
+        )
+        assert restored_sketch.std() == quantile_sketch.std()
+
+    def test_clear(self, quantile_sketch):
+        quantile_sketch.extend(values=np.arange(1000, dtype=np.float64))
+        quantile_sketch.clear()
+
+        assert len(quantile_sketch) == 0
+        assert math.isnan(quantile_sketch.median())
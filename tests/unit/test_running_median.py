@@ -0,0 +1,97 @@
+import math
+
+import numpy as np
+import pytest
+
+from src.utils.running_median import RunningMedian
+
+
+@pytest.fixture()
+def running_median() -> RunningMedian:
+    """PyTest fixture to create a running median to use in tests"""
+    return RunningMedian()
+
+
+class TestRunningMedian:
+    def test_empty_median(self, running_median):
+        assert math.isnan(running_median.median())
+        assert len(running_median) == 0
+
+    @pytest.mark.parametrize(
+        "values, expected_median",
+        [([3.0], 3.0), ([3.0, 1.0], 2.0), ([5.0, 1.0, 3.0], 3.0), ([4.0, 1.0, 3.0, 2.0], 2.5)],
+    )
+    def test_push(self, running_median, values, expected_median):
+        for value in values:
+            running_median.push(value)
+
+        assert running_median.median() == expected_median
+        assert len(running_median) == len(values)
+
+    @pytest.mark.parametrize("batch_sizes", [[1000], [1, 2, 3, 500], [1000, 1, 1, 2, 10, 999]])
+    def test_extend(self, running_median, batch_sizes):
+        random_state = np.random.RandomState(seed=len(batch_sizes))
+        all_values = []
+
+        for batch_size in batch_sizes:
+            values = random_state.randint(1, 100, size=batch_size).astype(np.float64)
+            all_values.append(values)
+
+            running_median.extend(values=values)
+
+            # Matches the pandas/NumPy median after every batch
+            assert running_median.median() == np.median(np.concatenate(all_values))
+
+        assert len(running_median) == sum(batch_sizes)
+
+    def test_rebuild(self, running_median):
+        running_median.extend(values=np.array([1.0, 2.0, 3.0]))
+        running_median.rebuild(values=np.array([10.0, 40.0, 20.0, 30.0]))
+
+        assert running_median.median() == 25.0
+        assert len(running_median) == 4
+
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_remove(self, running_median, seed):
+        random_state = np.random.RandomState(seed=seed)
+        values = random_state.randint(1, 20, size=500).astype(np.float64)
+        running_median.extend(values=values)
+
+        held_values = values.tolist()
+
+        for batch_size in [1, 3, 50, 1, 200, 240]:
+            removed_values = random_state.choice(held_values, size=batch_size, replace=False)
+
+            for value in removed_values.tolist():
+                held_values.remove(value)
+
+            running_median.remove(values=removed_values)
+
+            # Matches the NumPy median of the held values after every batch
+            assert running_median.median() == np.median(held_values)
+            assert len(running_median) == len(held_values)
+
+        running_median.remove(values=np.array(held_values))
+
+        assert len(running_median) == 0
+        assert math.isnan(running_median.median())
+
+    def test_remove_then_push(self, running_median):
+        running_median.extend(values=np.array([1.0, 2.0, 3.0, 4.0]))
+        running_median.discard(value=4.0)
+        running_median.discard(value=3.0)
+        running_median.push(value=10.0)
+
+        assert running_median.median() == 2.0
+
+        # Removed values are not part of the state
+        state = running_median.get_state()
+
+        assert sorted((-state["lower"]).tolist() + state["upper"].tolist()) == [1.0, 2.0, 10.0]
+
+    def test_clear(self, running_median):
+        running_median.extend(values=np.array([1.0, 2.0, 3.0]))
+        running_median.clear()
+
+        assert len(running_median) == 0
+        assert math.isnan(running_median.median())
@@ -0,0 +1,77 @@
+import math
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from src.utils.running_sum import RunningSum
+
+
+@pytest.fixture()
+def running_sum() -> RunningSum:
+    """PyTest fixture to create a running sum to use in tests"""
+    return RunningSum()
+
+
+class TestRunningSum:
+    def test_empty_mean(self, running_sum):
+        assert math.isnan(running_sum.mean())
+        assert running_sum.total() == 0.0
+        assert len(running_sum) == 0
+
+    @pytest.mark.parametrize(
+        "batches, expected_mean",
+        [
+            ([[11.0, 123333.123, 100000200.23, 200000000.0]], 75030886.08825),
+            ([[11.0], [123333.123, 100000200.23], [200000000.0]], 75030886.08825),
+            ([[0.1] * 10, [0.2] * 10], 0.15),
+        ],
+    )
+    def test_extend(self, running_sum, batches, expected_mean):
+        for batch in batches:
+            running_sum.extend(values=np.array(batch))
+
+        assert running_sum.mean() == pytest.approx(expected_mean, rel=1e-15)
+        assert len(running_sum) == sum(len(batch) for batch in batches)
+
+    def test_no_drift(self, running_sum):
+        random_state = np.random.RandomState(seed=1)
+        values = np.round(random_state.uniform(1, 200000000, size=100000), 2)
+
+        for batch in np.array_split(values, 1000):
+            running_sum.extend(values=batch)
+
+        # Compare against the exact Decimal mean of the float values
+        expected_mean = sum(Decimal(value) for value in values.tolist()) / len(values)
+
+        assert running_sum.mean() == float(expected_mean)
+
+    def test_remove(self, running_sum):
+        running_sum.extend(values=np.array([0.1, 0.2, 0.3, 200000000.25]))
+        running_sum.remove(values=np.array([200000000.25, 0.2]))
+
+        assert running_sum.mean() == pytest.approx(0.2, rel=1e-15)
+        assert len(running_sum) == 2
+
+    def test_remove_integer_values(self, running_sum):
+        running_sum.extend(values=np.array([1100, 2250, 3300], dtype=np.int64))
+        running_sum.remove(values=np.array([2250], dtype=np.int64))
+
+        assert running_sum.mean(scale=100) == 22.0
+
+    def test_merge(self, running_sum):
+        other_running_sum = RunningSum()
+        running_sum.extend(values=np.array([0.1, 0.2]))
+        other_running_sum.extend(values=np.array([200000000.25, 0.3]))
+
+        running_sum.merge(other=other_running_sum)
+
+        assert running_sum.mean() == pytest.approx((0.6 + 200000000.25) / 4, rel=1e-15)
+        assert len(running_sum) == 4
+
+    def test_clear(self, running_sum):
+        running_sum.extend(values=np.array([1.5, 2.5]))
+        running_sum.clear()
+
+        assert len(running_sum) == 0
+        assert math.isnan(running_sum.mean())
@@ -0,0 +1,100 @@
+import math
+from unittest.mock import call, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.selection import exact_median, exact_quantiles, parallel_exact_median
+
+SELECTION_PATH = "src.utils.selection"
+
+
+@pytest.mark.parametrize(
+    "values, scale, expected_median",
+    [
+        (np.array([3.0]), 1, 3.0),
+        (np.array([5.0, 1.0, 3.0]), 1, 3.0),
+        (np.array([4.0, 1.0, 3.0, 2.0]), 1, 2.5),
+        (np.array([1100, 12333312, 10000020023, 20000000000], dtype=np.int64), 100, 50061766.675),
+        (np.array([2 ** 62, 2 ** 62], dtype=np.int64), 1, float(2 ** 62)),
+    ],
+)
+def test_exact_median(values, scale, expected_median):
+    assert exact_median(values=values, scale=scale) == expected_median
+
+
+def test_exact_median_empty():
+    assert math.isnan(exact_median(values=np.array([])))
+
+
+@pytest.mark.parametrize("value_count", [1, 2, 101, 1000])
+def test_exact_median_matches_numpy(value_count):
+    values = np.random.RandomState(seed=value_count).uniform(1, 1000, size=value_count)
+    assert exact_median(values=values) == np.median(values)
+
+
+@pytest.mark.parametrize("value_count", [1, 2, 101, 1000, 10001])
+@pytest.mark.parametrize("dtype", [np.float64, np.int64])
+@pytest.mark.parametrize("workers", [2, 3])
+def test_parallel_exact_median(value_count, dtype, workers):
+    random_state = np.random.RandomState(seed=value_count)
+    values = (random_state.uniform(1, 1000, size=value_count) * 100).astype(dtype)
+
+    assert parallel_exact_median(
+        values=values, scale=100, workers=workers, min_row_count=1, sample_size=64
+    ) == exact_median(values=values, scale=100)
+
+
+def test_parallel_exact_median_duplicates():
+    values = np.repeat(np.arange(10, dtype=np.int64), 1000)
+
+    assert parallel_exact_median(values=values, workers=4, min_row_count=1, sample_size=16) == 4.5
+
+
+@patch(f"{SELECTION_PATH}.exact_median")
+@pytest.mark.parametrize("workers, min_row_count", [(1, 1), (4, 10000)])
+def test_parallel_exact_median_serial(mock_exact_median, workers, min_row_count):
+    values = np.arange(100, dtype=np.float64)
+
+    median = parallel_exact_median(values=values, workers=workers, min_row_count=min_row_count)
+
+    # A single worker, or few values, are selected serially
+    assert median == mock_exact_median.return_value
+    assert mock_exact_median.call_args_list == [call(values=values, scale=1)]
+
+
+@patch(f"{SELECTION_PATH}._sample_band")
+def test_parallel_exact_median_band_miss(mock_sample_band):
+    # A band that does not hold the median ranks falls back to exact_median
+    mock_sample_band.return_value = (90.0, 99.0)
+    values = np.arange(100, dtype=np.float64)
+
+    assert parallel_exact_median(values=values, workers=2, min_row_count=1) == 49.5
+
+
+@pytest.mark.parametrize("value_count", [1, 2, 101, 1000])
+def test_exact_quantiles_matches_pandas(value_count):
+    values = np.random.RandomState(seed=value_count).uniform(1, 1000, size=value_count)
+    quantiles = [0.0, 0.25, 0.5, 0.95, 0.99, 1.0]
+
+    expected_quantiles = pd.Series(values).quantile(quantiles).tolist()
+
+    assert exact_quantiles(values=values, quantiles=quantiles) == expected_quantiles
+
+
+def test_exact_quantiles_scale():
+    values = np.array([1100, 2200, 3300, 4400], dtype=np.int64)
+
+    quantiles = exact_quantiles(values=values, quantiles=[0.0, 0.5, 1.0], scale=100)
+
+    assert quantiles == [11.0, 27.5, 44.0]
+
+
+def test_exact_quantiles_empty():
+    assert all(math.isnan(value) for value in exact_quantiles(values=np.array([]), quantiles=[0.5]))
+
+
+def test_exact_quantiles_invalid():
+    with pytest.raises(ValueError):
+        exact_quantiles(values=np.arange(10), quantiles=[1.5])
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from src.utils.snapshot import read_snapshot, write_snapshot
+
+
+def test_write_and_read_snapshot(tmp_path):
+    path = str(tmp_path / "invoice_stats.snapshot")
+    arrays = {
+        "lower": np.array([-3.5, -1.0]),
+        "upper": np.array([4, 2 ** 40], dtype=np.int64),
+        "empty": np.array([], dtype=np.float64),
+    }
+
+    write_snapshot(path=path, header={"count": 2 ** 70, "name": "invoices"}, arrays=arrays)
+    header, read_arrays = read_snapshot(path=path)
+
+    assert header == {"count": 2 ** 70, "name": "invoices"}
+    assert list(read_arrays) == list(arrays)
+
+    for name, array in arrays.items():
+        assert read_arrays[name].dtype == array.dtype
+        assert read_arrays[name].tolist() == array.tolist()
+
+
+@pytest.mark.parametrize("content", [b"not a snapshot", b"GEOMSAGI\x02\x00\x00\x00\x00\x00"])
+def test_read_snapshot_failure(tmp_path, content):
+    path = tmp_path / "invoice_stats.snapshot"
+    path.write_bytes(content.ljust(14, b"\x00"))
+
+    with pytest.raises(ValueError):
+        read_snapshot(path=str(path))
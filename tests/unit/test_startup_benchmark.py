@@ -0,0 +1,35 @@
+from benchmarks.startup_benchmark import main, run_startup_benchmarks
+
+
+def test_run_startup_benchmarks():
+    results = run_startup_benchmarks(
+        import_runs=1, constructions=5, validation_backends=["pandera", "numpy"]
+    )
+
+    assert [result["validation_backend"] for result in results] == ["pandera", "numpy"]
+
+    for result in results:
+        assert result["import_time"] > 0
+        assert result["first_construction_time"] > 0
+        assert result["construction_time"] > 0
+
+
+def test_main(tmp_path):
+    output = tmp_path / "startup.json"
+
+    assert (
+        main(
+            [
+                "--import-runs",
+                "1",
+                "--constructions",
+                "1",
+                "--validation-backends",
+                "numpy",
+                "--output",
+                str(output),
+            ]
+        )
+        == 0
+    )
+    assert output.exists()